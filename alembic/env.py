@@ -0,0 +1,63 @@
+# alembic/env.py
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.db.base import Base
+# Registrar todos los modelos en Base.metadata para --autogenerate
+from app.models import inventory, inventory_movement, product, refresh_token, user  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # El índice FULLTEXT solo existe en MySQL; en otros motores no es una diferencia
+    if type_ == "index" and obj.dialect_kwargs.get("mysql_prefix") == "FULLTEXT":
+        return context.get_context().dialect.name == "mysql"
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Generar el SQL de las migraciones sin conectar a la BD (--sql)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=_is_sqlite(settings.DATABASE_URL),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplicar las migraciones sobre la BD de DATABASE_URL"""
+    connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite no admite ALTER de columnas: se recrea la tabla
+            render_as_batch=_is_sqlite(settings.DATABASE_URL),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,69 @@
+"""esquema inicial
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 07:49:30.275730
+
+Tablas e índices que creaba Base.metadata.create_all al importar app.main
+antes de pasar a Alembic. En una BD ya creada así, `alembic stamp 0001` y
+después `alembic upgrade head` para aplicar el resto.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=True),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'products',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('sku', sa.String(length=100), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_products_id', 'products', ['id'])
+    op.create_index('ix_products_name', 'products', ['name'])
+    op.create_index('ix_products_sku', 'products', ['sku'], unique=True)
+
+    op.create_table(
+        'inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_inventory_id', 'inventory', ['id'])
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_table('inventory')
+    op.drop_table('products')
+    op.drop_table('users')
@@ -0,0 +1,36 @@
+"""una fila de inventario por producto
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 08:05:00.000000
+
+Índice único en inventory.product_id, base del upsert nativo. Antes nada
+impedía dos filas del mismo producto; la app leía la primera (id menor),
+así que se conserva esa y se borran las demás antes de crear el índice.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    # Tabla derivada: MySQL no admite una subconsulta sobre la tabla del DELETE
+    op.execute(sa.text(
+        "DELETE FROM inventory WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM inventory GROUP BY product_id) AS keep)"
+    ))
+    op.create_index('ix_inventory_product_id', 'inventory', ['product_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_index('ix_inventory_product_id', table_name='inventory')
@@ -0,0 +1,35 @@
+"""umbral de stock bajo por producto
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 08:40:00.000000
+
+Columna inventory.low_stock_threshold (NULL = umbral por defecto) e índices
+sobre cantidad y umbral para recargar el conjunto de stock bajo.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    op.add_column('inventory', sa.Column('low_stock_threshold', sa.Integer(), nullable=True))
+    op.create_index('ix_inventory_quantity', 'inventory', ['quantity'])
+    op.create_index('ix_inventory_low_stock_threshold', 'inventory', ['low_stock_threshold'])
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_index('ix_inventory_low_stock_threshold', table_name='inventory')
+    op.drop_index('ix_inventory_quantity', table_name='inventory')
+    with op.batch_alter_table('inventory') as batch_op:
+        batch_op.drop_column('low_stock_threshold')
@@ -0,0 +1,55 @@
+"""libro de movimientos y fotos de inventario
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:10:00.000000
+
+Tablas inventory_movements (solo se añaden filas) e inventory_snapshots
+para responder "cantidad en el instante t" con foto + movimientos.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    op.create_table(
+        'inventory_movements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=True),
+        sa.Column('quantity_after', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_inventory_movements_id', 'inventory_movements', ['id'])
+    op.create_index('ix_inventory_movements_created_at', 'inventory_movements', ['created_at'])
+    op.create_index('ix_inventory_movements_product_created', 'inventory_movements', ['product_id', 'created_at'])
+
+    op.create_table(
+        'inventory_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_inventory_snapshots_id', 'inventory_snapshots', ['id'])
+    op.create_index('ix_inventory_snapshots_at_product', 'inventory_snapshots', ['snapshot_at', 'product_id'])
+    op.create_index('ix_inventory_snapshots_product_at', 'inventory_snapshots', ['product_id', 'snapshot_at'])
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_table('inventory_snapshots')
+    op.drop_table('inventory_movements')
@@ -0,0 +1,41 @@
+"""versión y fecha de modificación de productos
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 10:30:00.000000
+
+products.version (bloqueo optimista y ETag) y products.updated_at, más
+índices sobre updated_at de productos e inventario para el GET condicional
+de los listados.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    # SQLite no admite ADD COLUMN con un valor por defecto no constante: se recrea la tabla
+    recreate = 'always' if op.get_bind().dialect.name == 'sqlite' else 'auto'
+    with op.batch_alter_table('products', recreate=recreate) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+    op.create_index('ix_products_updated_at', 'products', ['updated_at'])
+    op.create_index('ix_inventory_updated_at', 'inventory', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_index('ix_inventory_updated_at', table_name='inventory')
+    op.drop_index('ix_products_updated_at', table_name='products')
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,30 @@
+"""índice FULLTEXT para la búsqueda de productos
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 11:00:00.000000
+
+Solo MySQL: en otros motores la búsqueda usa el índice en memoria.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_products_fulltext', 'products', ['name', 'description'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_products_fulltext', table_name='products')
@@ -0,0 +1,45 @@
+"""refresh tokens
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 14:30:00.000000
+
+Refresh tokens emitidos, para rotarlos y detectar la reutilización.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=36), nullable=False),
+        sa.Column('family', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'])
+    op.create_index('ix_refresh_tokens_jti', 'refresh_tokens', ['jti'], unique=True)
+    op.create_index('ix_refresh_tokens_family', 'refresh_tokens', ['family'])
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'])
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,31 @@
+"""versión de las filas de inventario
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 18:20:00.000000
+
+Contador de cambios por fila de inventario para el ETag del listado:
+updated_at solo tiene resolución de segundos.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Aplicar la migración."""
+    op.add_column('inventory', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Revertir la migración."""
+    with op.batch_alter_table('inventory') as batch_op:
+        batch_op.drop_column('version')
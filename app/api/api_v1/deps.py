@@ -1,11 +1,12 @@
 # app/api/deps.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.db.session import get_db
+from typing import Annotated, Optional
+from app.db.session import SessionLocal, get_async_db
 from app.core.security import verify_token
-from app.crud.crud_user import get_user, get_user_by_id
+from app.crud.crud_user import get_user_cached
 from app.models.user import User
 
 # IMPORTANTE: La URL debe coincidir con tu endpoint de login
@@ -16,17 +17,31 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 
 def get_db_safe():
-    """Dependencia segura para la base de datos"""
-    db = next(get_db())
+    """
+    Sesión de base de datos de la petición.
+
+    La sesión no toma conexión del pool hasta la primera consulta, así que
+    los endpoints que responden sin tocar la BD no ocupan ninguna. Se declara
+    con scope="function": se cierra (y devuelve la conexión) en cuanto
+    termina el endpoint, antes de serializar y enviar la respuesta.
+    """
+    db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
+# Parámetro de sesión de los endpoints: `db: DbSession`. Declarar la
+# dependencia en un solo sitio evita que algún endpoint olvide scope="function"
+# y retenga la conexión hasta enviar la respuesta.
+DbSession = Annotated[Session, Depends(get_db_safe, scope="function")]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db, scope="function")]
+
+
 def get_current_user(
-    token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db_safe)
+    db: DbSession,
+    token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Obtiene el usuario actual a partir del token JWT.
@@ -41,8 +56,8 @@ def get_current_user(
     Raises:
         HTTPException: Si el token es inválido o el usuario no existe
     """
-    # Verificar el token
-    payload = verify_token(token)
+    # Verificar el token: solo los de acceso (no los de refresh ni de reset)
+    payload = verify_token(token, expected_type="access")
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,7 +82,8 @@ def get_current_user(
             detail="Formato de ID de usuario inválido en el token",
         )
     
-    user = get_user(db, user_id)
+    # Con la copia cacheada la mayoría de peticiones no consultan la tabla users
+    user = get_user_cached(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,8 +141,8 @@ def get_current_superuser(
 
 # Dependencias opcionales (para endpoints que pueden ser públicos o privados)
 async def optional_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db_safe)
+    db: DbSession,
+    token: Optional[str] = Depends(oauth2_scheme)
 ) -> Optional[User]:
     """
     Dependencia opcional para obtener usuario actual.
@@ -136,7 +152,7 @@ async def optional_current_user(
         return None
     
     try:
-        return await get_current_user(token, db)
+        return get_current_user(db=db, token=token)
     except HTTPException:
         return None
 
@@ -1,12 +1,12 @@
 # app/api/api_v1/endpoints/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from app.api.api_v1.deps import get_db_safe, get_current_active_user
-from app.crud.crud_user import get_user_by_email, create_user, get_user_by_id, authenticate_user
+from app.api.api_v1.deps import DbSession, get_current_active_user
+from app.crud.crud_user import get_user_by_email, create_user, get_user_by_id, get_user_cached, authenticate_user
+from app.crud.crud_refresh_token import RefreshTokenError, issue_refresh_token, revoke_refresh_family, rotate_refresh_token
 from app.schemas.user import UserCreate, UserOut
 from app.schemas.token import Token
 from app.core.security import verify_password, create_access_token, verify_token
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db_safe)):
+def register(user_in: UserCreate, db: DbSession):
     """
     Registrar un nuevo usuario
     """
@@ -32,8 +32,8 @@ def register(user_in: UserCreate, db: Session = Depends(get_db_safe)):
 
 @router.post("/login", response_model=Token)
 def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db_safe)
+    db: DbSession,
+    form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Dict[str, Any]:
     """
     Iniciar sesión y obtener token de acceso
@@ -71,6 +71,9 @@ def login_for_access_token(
     return {
         "access_token": access_token, 
         "token_type": "bearer",
+        # Con el refresh token el cliente renueva el acceso sin volver a
+        # enviar la contraseña (y sin pagar bcrypt otra vez)
+        "refresh_token": issue_refresh_token(db, user.id),
         "user_id": user.id,
         "email": user.email,
         "is_superuser": user.is_superuser,
@@ -80,15 +83,15 @@ def login_for_access_token(
 
 @router.post("/token", response_model=Token)
 def login_oauth2_compatible(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db_safe)
+    db: DbSession,
+    form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Dict[str, Any]:
     """
     Endpoint compatible con OAuth2 para obtener token
     
     Usa el mismo endpoint que /login pero con nombre estándar OAuth2
     """
-    return login_for_access_token(form_data, db)
+    return login_for_access_token(db=db, form_data=form_data)
 
 
 @router.get("/me", response_model=UserOut)
@@ -104,28 +107,27 @@ def get_current_user_info(
 @router.post("/refresh")
 def refresh_token(
     token: str,
-    db: Session = Depends(get_db_safe)
+    db: DbSession
 ):
     """
-    Refrescar token de acceso (implementación básica)
+    Refrescar token de acceso
+
+    Solo acepta el refresh token que devuelve /login: se consume y se
+    devuelve uno nuevo junto al access token (rotación). Presentar otra vez
+    un refresh token ya usado revoca toda su familia: el cliente tendrá que
+    volver a iniciar sesión.
     """
-    payload = verify_token(token)
-    if not payload:
+    try:
+        user_id, new_refresh_token = rotate_refresh_token(db, token)
+    except RefreshTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido o expirado",
+            detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token no contiene user_id",
-        )
-    
     try:
-        user = get_user_by_id(db, int(user_id))
+        user = get_user_cached(db, int(user_id))
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -160,6 +162,7 @@ def refresh_token(
     return {
         "access_token": new_access_token, 
         "token_type": "bearer",
+        "refresh_token": new_refresh_token,
         "user_id": user.id,
         "email": user.email,
         "is_superuser": user.is_superuser
@@ -169,12 +172,12 @@ def refresh_token(
 @router.post("/validate-token")
 def validate_token(
     token: str,
-    db: Session = Depends(get_db_safe)
+    db: DbSession
 ):
     """
-    Validar si un token es válido y obtener información del usuario
+    Validar si un access token es válido y obtener información del usuario
     """
-    payload = verify_token(token)
+    payload = verify_token(token, expected_type="access")
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -209,19 +212,26 @@ def validate_token(
         "is_superuser": user.is_superuser,
         "is_active": user.is_active,
         "exp": payload.get("exp"),
-        "token_type": payload.get("type", "access")
+        "token_type": payload["type"]
     }
 
 
 @router.post("/logout")
-def logout():
+def logout(
+    db: DbSession,
+    refresh_token: Optional[str] = None
+):
     """
     Cerrar sesión (en el cliente)
     
     Nota: Para JWT stateless, la invalidación se hace en el cliente
-    eliminando el token. Para invalidación en servidor necesitarías
-    una lista negra de tokens.
+    eliminando el token. Si se envía el refresh token, su familia se revoca
+    en el servidor y ya no sirve para renovar el acceso.
     """
+    if refresh_token:
+        payload = verify_token(refresh_token)
+        if payload and payload.get("type") == "refresh" and payload.get("fam"):
+            revoke_refresh_family(db, payload["fam"])
     return {"message": "Sesión cerrada exitosamente. Elimina el token en el cliente."}
 
 
@@ -0,0 +1,73 @@
+# app/api/api_v1/endpoints/imports.py
+import csv
+import io
+import json
+from typing import Any, Iterator, Optional, Tuple
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+
+from app.api.api_v1.deps import DbSession
+from app.crud.crud_product import import_products
+from app.schemas.product import ProductImportReport
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+def _csv_rows(stream) -> Iterator[Tuple[int, Any]]:
+    """Filas de un CSV con cabecera; las celdas vacías se tratan como nulas"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # reader.line_num cuenta la cabecera, igual que un editor de hojas
+        yield reader.line_num, {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def _ndjson_rows(stream) -> Iterator[Tuple[int, Any]]:
+    """Un objeto JSON por línea; las líneas vacías se ignoran"""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"JSON inválido: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, ValueError("Se esperaba un objeto JSON")
+            continue
+        yield line_number, row
+
+
+def _detect_format(upload: UploadFile, format: Optional[str]) -> str:
+    if format:
+        return format
+    filename = (upload.filename or "").lower()
+    if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in (upload.content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+@router.post("/products", response_model=ProductImportReport)
+def import_products_endpoint(
+    db: DbSession,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+):
+    """
+    Importar productos desde un CSV o NDJSON (público)
+
+    Columnas: name, sku, price, description y, opcionalmente, quantity para
+    el stock inicial. El formato se deduce de la extensión si no se indica.
+    Las filas con errores no se importan y se devuelven en el informe.
+    """
+    file_format = _detect_format(file, format)
+    if file_format not in ("csv", "ndjson"):
+        raise HTTPException(400, "Formato no soportado (usa csv o ndjson)")
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    rows = _csv_rows(stream) if file_format == "csv" else _ndjson_rows(stream)
+    try:
+        return import_products(db, rows)
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise HTTPException(400, f"No se pudo leer el archivo: {e}")
+    finally:
+        stream.detach()
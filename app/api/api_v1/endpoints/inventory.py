@@ -1,46 +1,242 @@
 # app/api/api_v1/endpoints/inventory.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
+from typing import List, Optional, Union
+from datetime import datetime
 
-from app.api.api_v1.deps import get_db_safe  # Solo importamos get_db_safe
-from app.crud.crud_inventory import get_inventory_by_product, create_or_update_inventory, adjust_inventory
+from app.api.api_v1.deps import DbSession
+from app.core.config import settings
+from app.core.fast_json import raw_json_response, rows_json, schema_columns
+from app.core.http_cache import check_conditional, make_etag
+from app.core.pagination import build_page, decode_cursor, parse_id_list
+from app.crud.crud_inventory import get_inventory_by_product, get_inventory_by_products, get_inventory_fingerprint, get_all_inventory, get_inventory_after, get_inventory_rows, get_inventory_rows_after, create_or_update_inventory, adjust_inventory, adjust_inventory_locked, adjust_inventory_batch, bulk_upsert_inventory, get_low_stock, get_low_stock_items, set_low_stock_threshold
 from app.crud.crud_product import get_product
 from app.models.inventory import Inventory
-from app.schemas.inventory import InventoryOut, InventoryBase, InventoryUpdate
+from app.crud.inventory_buffer import inventory_buffer
+from app.crud.inventory_ledger import create_inventory_snapshot, get_stock_at, get_stock_levels_at
+from app.schemas.inventory import InventoryOut, InventoryPage, InventoryBatch, InventoryBase, InventoryUpdate, InventoryAdjustResponse, InventoryBatchAdjust, InventoryBulkUpsert, InventoryBulkResponse, InventoryThresholdUpdate, LowStockItem, StockLevel, InventorySnapshotResponse
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
+# Columnas de InventoryOut para el listado rápido (fast_json_lists)
+_INVENTORY_COLUMNS = schema_columns(InventoryOut, Inventory)
 
-@router.get("/{product_id}", response_model=InventoryOut)
-def get_inventory(product_id: int, db: Session = Depends(get_db_safe)):
-    """Obtener inventario de un producto (público)"""
-    inv = get_inventory_by_product(db, product_id)
+
+def _requested_ids(raw: str) -> List[int]:
+    """Ids de `product_ids=1,2,3`; 400 si la lista no es válida o es demasiado larga"""
+    try:
+        return parse_id_list(raw, settings.batch_max_ids)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+def _list_not_modified(request: Request, response: Response, list_version, last_modified):
+    """Respuesta 304 si el cliente ya tiene esta versión del listado, si no None"""
+    etag = make_etag("inventory-list", list_version, last_modified, request.url.query)
+    return check_conditional(request, response, etag, last_modified)
+
+
+def _after_id(cursor: str) -> Optional[int]:
+    """Id del cursor; None para la primera página (cursor vacío)"""
+    try:
+        return decode_cursor(cursor, 1)[0] if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _page_key(inv) -> tuple:
+    return (inv.id,)
+
+
+def _inventory_not_modified(request: Request, response: Response, inv):
+    """404 si no existe; si no, la respuesta 304 o None como en _list_not_modified"""
     if not inv:
         raise HTTPException(404, "Inventario no encontrado")
+    etag = make_etag("inventory", inv.id, inv.quantity, inv.low_stock_threshold, inv.updated_at)
+    return check_conditional(request, response, etag, inv.updated_at)
+
+
+@router.post("/adjust/batch", response_model=List[InventoryAdjustResponse])
+def adjust_batch(batch: InventoryBatchAdjust, db: DbSession):
+    """Ajustar inventario de varios productos en una sola transacción (público)"""
+    return adjust_inventory_batch(db, [(item.product_id, item.quantity) for item in batch.items])
+
+
+@router.get("/low-stock", response_model=List[LowStockItem])
+def list_low_stock(db: DbSession, threshold: Optional[int] = None):
+    """
+    Listar productos con stock bajo (público)
+
+    Por defecto cada producto se compara con su propio umbral y el resultado
+    sale del conjunto en memoria. Con `threshold` se consulta la base de
+    datos con ese umbral único.
+    """
+    if threshold is not None:
+        return [
+            {"product_id": inv.product_id, "quantity": inv.quantity, "threshold": threshold}
+            for inv in get_low_stock(db, threshold)
+        ]
+    return [
+        {"product_id": product_id, "quantity": quantity, "threshold": item_threshold}
+        for product_id, quantity, item_threshold in get_low_stock_items(db)
+    ]
+
+
+@router.get("/as-of", response_model=List[StockLevel])
+def stock_levels_as_of(at: datetime, db: DbSession):
+    """Cantidades de todo el catálogo en el instante `at` (UTC) según el libro (público)"""
+    levels = get_stock_levels_at(db, at)
+    return [{"product_id": pid, "quantity": qty} for pid, qty in sorted(levels.items())]
+
+
+@router.post("/snapshots", response_model=InventorySnapshotResponse)
+def create_snapshot(db: DbSession):
+    """Escribir una foto del inventario actual en el libro (público)"""
+    snapshot_at, count = create_inventory_snapshot(db)
+    return InventorySnapshotResponse(snapshot_at=snapshot_at, count=count)
+
+
+@router.get("/{product_id}", response_model=InventoryOut)
+def get_inventory(product_id: int, request: Request, response: Response, db: DbSession):
+    """Obtener inventario de un producto (público, soporta ETag / If-Modified-Since)"""
+    inv = get_inventory_by_product(db, product_id)
+    not_modified = _inventory_not_modified(request, response, inv)
+    if not_modified:
+        return not_modified
     return inv
 
 
 @router.post("/", response_model=InventoryOut)
-def create_or_update(inv_in: InventoryBase, db: Session = Depends(get_db_safe)):
+def create_or_update(inv_in: InventoryBase, db: DbSession):
     """Crear o actualizar inventario (público)"""
-    product = get_product(db, inv_in.product_id)
-    if not product:
+    try:
+        return create_or_update_inventory(db, inv_in.product_id, inv_in.quantity)
+    except ValueError:
         raise HTTPException(404, "Producto no encontrado")
-    return create_or_update_inventory(db, inv_in.product_id, inv_in.quantity)
+
+
+@router.post("/bulk", response_model=InventoryBulkResponse)
+def bulk_upsert(bulk: InventoryBulkUpsert, db: DbSession):
+    """Fijar la cantidad de muchos productos en una sola transacción (público)"""
+    try:
+        count = bulk_upsert_inventory(db, [(item.product_id, item.quantity) for item in bulk.items])
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+    return InventoryBulkResponse(success=True, count=count)
 
 
 @router.patch("/{product_id}", response_model=InventoryOut)
-def adjust(product_id: int, delta: InventoryUpdate, db: Session = Depends(get_db_safe)):
-    """Ajustar inventario (público)"""
-    product = get_product(db, product_id)
-    if not product:
+def adjust(product_id: int, delta: InventoryUpdate, db: DbSession, wait: bool = False):
+    """
+    Ajustar inventario (público)
+
+    Con el modo de acumulación activo (inventory_coalesce_enabled) el ajuste
+    se encola y se responde 202; con wait=true se fuerza la escritura y se
+    devuelve la cantidad resultante. El producto se comprueba (con la caché
+    de productos) antes de encolar.
+    """
+    if settings.inventory_coalesce_enabled:
+        if not get_product(db, product_id):
+            raise HTTPException(404, "Producto no encontrado")
+        inventory_buffer.add(product_id, delta.quantity)
+        if not wait:
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"product_id": product_id, "adjustment": delta.quantity, "pending": True},
+            )
+        inv = inventory_buffer.flush_and_read(db, product_id)
+        if not inv:
+            raise HTTPException(404, "Producto no encontrado")
+        return inv
+
+    try:
+        return adjust_inventory(db, product_id, delta.quantity)
+    except ValueError:
+        raise HTTPException(404, "Producto no encontrado")
+
+
+@router.get("/{product_id}/as-of", response_model=StockLevel)
+def product_stock_as_of(product_id: int, at: datetime, db: DbSession):
+    """Cantidad de un producto en el instante `at` (UTC) según el libro (público)"""
+    quantity = get_stock_at(db, product_id, at)
+    if quantity is None:
+        raise HTTPException(404, "Sin historial para ese producto en esa fecha")
+    return StockLevel(product_id=product_id, quantity=quantity)
+
+
+@router.put("/{product_id}/threshold", response_model=InventoryOut)
+def update_threshold(product_id: int, threshold_in: InventoryThresholdUpdate, db: DbSession):
+    """Fijar el umbral de stock bajo de un producto (público)"""
+    inv = set_low_stock_threshold(db, product_id, threshold_in.low_stock_threshold)
+    if not inv:
+        raise HTTPException(404, "Inventario no encontrado")
+    return inv
+
+
+@router.post("/{product_id}/adjust", response_model=InventoryAdjustResponse)
+def adjust_with_detail(product_id: int, delta: InventoryUpdate, db: DbSession):
+    """Ajustar inventario devolviendo la cantidad previa y la nueva (público)"""
+    try:
+        previous_quantity, inv = adjust_inventory_locked(db, product_id, delta.quantity)
+    except ValueError:
         raise HTTPException(404, "Producto no encontrado")
-    return adjust_inventory(db, product_id, delta.quantity)
+    return InventoryAdjustResponse(
+        success=True,
+        message="Inventario ajustado",
+        previous_quantity=previous_quantity,
+        new_quantity=inv.quantity,
+        adjustment=inv.quantity - previous_quantity,
+        product_id=product_id,
+    )
 
 
 # Endpoint adicional para listar todo el inventario
-@router.get("/", response_model=List[InventoryOut])
-def list_all_inventory(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_safe)):
-    """Listar todo el inventario (público)"""
-    return db.query(Inventory).offset(skip).limit(limit).all()
\ No newline at end of file
+@router.get("/", response_model=Union[List[InventoryOut], InventoryBatch, InventoryPage])
+def list_all_inventory(
+    request: Request,
+    response: Response,
+    db: DbSession,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    product_ids: Optional[str] = None,
+):
+    """
+    Listar todo el inventario (público)
+
+    Sin `cursor` se pagina con skip/limit (modo legado). Con `cursor` (vacío
+    para la primera página) se pagina por id y la respuesta incluye `next_cursor`.
+
+    Con `product_ids=1,2,3` devuelve el inventario de esos productos en una
+    sola consulta, en el orden pedido, y en `missing` los que no tienen.
+
+    Soporta GET condicional: el ETag sale de filas + suma de versiones +
+    id máximo + max(updated_at), así que un 304 se decide sin cargar filas.
+
+    Con fast_json_lists activo los listados se leen como tuplas de columnas
+    y se serializan directamente a bytes (mismo JSON).
+    """
+    if product_ids is not None:
+        items, missing = get_inventory_by_products(db, _requested_ids(product_ids))
+        return {"items": items, "missing": missing}
+
+    not_modified = _list_not_modified(request, response, *get_inventory_fingerprint(db))
+    if not_modified:
+        return not_modified
+
+    fast = settings.fast_json_lists
+    if cursor is None:
+        if fast:
+            rows = get_inventory_rows(db, _INVENTORY_COLUMNS, skip=skip, limit=limit)
+            return raw_json_response(rows_json(rows), response)
+        return get_all_inventory(db, skip=skip, limit=limit)
+
+    after_id = _after_id(cursor)
+    if fast:
+        rows = get_inventory_rows_after(db, _INVENTORY_COLUMNS, after_id=after_id, limit=limit + 1)
+    else:
+        rows = get_inventory_after(db, after_id=after_id, limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=_page_key)
+    if fast:
+        return raw_json_response({"items": rows_json(items), "next_cursor": next_cursor}, response)
+    return {"items": items, "next_cursor": next_cursor}
\ No newline at end of file
@@ -0,0 +1,76 @@
+# app/api/api_v1/endpoints/inventory_async.py
+"""
+Endpoints `async def` de inventario para el modo asíncrono (db_async_enabled).
+
+Se registran antes que los síncronos y atienden las lecturas y ajustes más
+frecuentes; el resto sigue en inventory.py, de donde se toman también
+las validaciones y el GET condicional para que ambos modos respondan igual.
+"""
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional, Union
+
+from app.api.api_v1.deps import AsyncDbSession
+from app.api.api_v1.endpoints.inventory import _after_id, _inventory_not_modified, _list_not_modified, _page_key, _requested_ids
+from app.core.config import settings
+from app.core.pagination import build_page
+from app.crud.crud_inventory_async import adjust_inventory, create_or_update_inventory, get_all_inventory, get_inventory_after, get_inventory_by_product, get_inventory_by_products, get_inventory_fingerprint
+from app.schemas.inventory import InventoryBase, InventoryBatch, InventoryOut, InventoryPage, InventoryUpdate
+
+router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+@router.get("/{product_id:int}", response_model=InventoryOut)
+async def get_inventory(product_id: int, request: Request, response: Response, db: AsyncDbSession):
+    """Obtener inventario de un producto (público, soporta ETag / If-Modified-Since)"""
+    inv = await get_inventory_by_product(db, product_id)
+    not_modified = _inventory_not_modified(request, response, inv)
+    if not_modified:
+        return not_modified
+    return inv
+
+
+@router.post("/", response_model=InventoryOut)
+async def create_or_update(inv_in: InventoryBase, db: AsyncDbSession):
+    """Crear o actualizar inventario (público)"""
+    try:
+        return await create_or_update_inventory(db, inv_in.product_id, inv_in.quantity)
+    except ValueError:
+        raise HTTPException(404, "Producto no encontrado")
+
+
+if not settings.inventory_coalesce_enabled:
+    # Con acumulación activa el ajuste lo atiende la versión síncrona (buffer en memoria)
+    @router.patch("/{product_id:int}", response_model=InventoryOut)
+    async def adjust(product_id: int, delta: InventoryUpdate, db: AsyncDbSession):
+        """Ajustar inventario (público)"""
+        try:
+            return await adjust_inventory(db, product_id, delta.quantity)
+        except ValueError:
+            raise HTTPException(404, "Producto no encontrado")
+
+
+@router.get("/", response_model=Union[List[InventoryOut], InventoryBatch, InventoryPage])
+async def list_all_inventory(
+    request: Request,
+    response: Response,
+    db: AsyncDbSession,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    product_ids: Optional[str] = None,
+):
+    """Listar todo el inventario (público); mismos parámetros que la versión síncrona"""
+    if product_ids is not None:
+        items, missing = await get_inventory_by_products(db, _requested_ids(product_ids))
+        return {"items": items, "missing": missing}
+
+    not_modified = _list_not_modified(request, response, *await get_inventory_fingerprint(db))
+    if not_modified:
+        return not_modified
+
+    if cursor is None:
+        return await get_all_inventory(db, skip=skip, limit=limit)
+
+    rows = await get_inventory_after(db, after_id=_after_id(cursor), limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=_page_key)
+    return {"items": items, "next_cursor": next_cursor}
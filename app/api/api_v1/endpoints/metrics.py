@@ -0,0 +1,56 @@
+# app/api/api_v1/endpoints/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import PrometheusText, request_metrics
+from app.core.security import password_hasher
+from app.db.session import pool_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+# /metrics en la raíz, donde Prometheus lo busca por defecto
+prometheus_router = APIRouter(tags=["metrics"])
+
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    """
+    Estado de los pools de conexiones (público)
+
+    Conexiones prestadas y en overflow en este momento, más los contadores
+    acumulados desde el arranque: checkouts, timeouts e histograma del
+    tiempo de espera al pedir una conexión (segundos, acumulado por cubeta).
+    """
+    return pool_stats()
+
+
+def _pool_samples(pools: dict, key: str):
+    return [({"pool": name}, stats[key]) for name, stats in pools.items()]
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """
+    Métricas en formato de texto de Prometheus (público)
+
+    Latencia, respuestas por código y peticiones en curso por plantilla de
+    ruta; estado de los pools de conexiones y cola de bcrypt.
+    """
+    out = PrometheusText()
+    out.histogram("http_request_duration_seconds", "Duración de las peticiones HTTP por ruta", request_metrics.durations())
+    out.counter("http_responses_total", "Respuestas HTTP por ruta y código de estado", request_metrics.responses())
+    out.gauge("http_requests_in_flight", "Peticiones HTTP en curso", [({}, request_metrics.in_flight)])
+
+    pools = pool_stats()
+    out.gauge("db_pool_size", "Tamaño configurado del pool", _pool_samples(pools, "size"))
+    out.gauge("db_pool_checked_out", "Conexiones prestadas", _pool_samples(pools, "checked_out"))
+    out.gauge("db_pool_checked_in", "Conexiones libres en el pool", _pool_samples(pools, "checked_in"))
+    out.gauge("db_pool_overflow", "Conexiones por encima de pool_size (negativo: huecos sin abrir)", _pool_samples(pools, "overflow"))
+    out.counter("db_pool_checkouts_total", "Conexiones pedidas al pool", _pool_samples(pools, "checkouts"))
+    out.counter("db_pool_timeouts_total", "Esperas de conexión agotadas", _pool_samples(pools, "timeouts"))
+    out.histogram("db_pool_wait_seconds", "Espera al pedir una conexión", _pool_samples(pools, "wait_seconds"))
+
+    out.gauge("password_hash_queue_depth", "Operaciones bcrypt en curso o en cola", [({}, password_hasher.pending())])
+    out.gauge("password_hash_capacity", "Operaciones bcrypt admitidas a la vez (hilos + cola)", [({}, password_hasher.capacity)])
+    out.counter("password_hash_rejected_total", "Operaciones bcrypt rechazadas por cola llena", [({}, password_hasher.rejected)])
+    return PlainTextResponse(out.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,52 +1,186 @@
 # app/api/api_v1/endpoints/products.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional, Union
 
-from app.api.api_v1.deps import get_db_safe  # Solo importamos get_db_safe
+from app.api.api_v1.deps import DbSession
 # Quitamos: get_current_active_user, get_current_superuser
-from app.schemas.product import ProductCreate, ProductOut
-from app.crud.crud_product import get_products, create_product, get_product, get_product_by_sku, update_product, delete_product
+from app.core.config import settings
+from app.core.fast_json import raw_json_response, rows_json, schema_columns
+from app.core.http_cache import check_conditional, make_etag
+from app.core.pagination import build_page, decode_cursor, parse_id_list
+from app.schemas.product import ProductCreate, ProductOut, ProductPage, ProductBatch, ProductBatchRequest, ProductSearchPage
+from app.models.product import Product
+from app.crud.crud_product import product_cache, get_products, get_products_after, get_product_rows, get_product_rows_after, get_products_by_ids, get_products_fingerprint, create_product, get_product, get_product_by_sku, update_product, delete_product, search_products
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Columnas de ProductOut para el listado rápido (fast_json_lists)
+_PRODUCT_COLUMNS = schema_columns(ProductOut, Product)
 
-@router.post("/", response_model=ProductOut)
-def create_new_product(product_in: ProductCreate, db: Session = Depends(get_db_safe)):
-    """Crear nuevo producto (ahora es público)"""
-    existing = get_product_by_sku(db, product_in.sku)
+
+def _requested_ids(raw: str) -> List[int]:
+    """Ids de `ids=1,2,3`; 400 si la lista no es válida o es demasiado larga"""
+    try:
+        return parse_id_list(raw, settings.batch_max_ids)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+def _check_batch_size(ids: List[int]) -> None:
+    if len(ids) > settings.batch_max_ids:
+        raise HTTPException(400, f"Máximo {settings.batch_max_ids} ids por consulta")
+
+
+def _check_new_sku(existing: Optional[Product]) -> None:
     if existing:
         raise HTTPException(400, "Producto con ese SKU ya existe")
+
+
+def _list_not_modified(request: Request, response: Response, list_version, last_modified):
+    """Respuesta 304 si el cliente ya tiene esta versión del listado, si no None"""
+    etag = make_etag("products", list_version, last_modified, request.url.query)
+    return check_conditional(request, response, etag, last_modified)
+
+
+def _after_key(cursor: str) -> Optional[List]:
+    """Clave (name, id) del cursor; None para la primera página (cursor vacío)"""
+    try:
+        return decode_cursor(cursor, 2) if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _page_key(product) -> tuple:
+    return (product.name, product.id)
+
+
+def _product_not_modified(request: Request, response: Response, product):
+    """404 si no existe; si no, la respuesta 304 o None como en _list_not_modified"""
+    if not product:
+        raise HTTPException(404, "Producto no encontrado")
+    etag = make_etag("product", product.id, product.version)
+    return check_conditional(request, response, etag, product.updated_at)
+
+
+@router.post("/", response_model=ProductOut)
+def create_new_product(product_in: ProductCreate, db: DbSession):
+    """Crear nuevo producto (ahora es público)"""
+    _check_new_sku(get_product_by_sku(db, product_in.sku))
     return create_product(db, product_in)
 
 
-@router.get("/", response_model=List[ProductOut])
-def list_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_safe)):
-    """Listar productos (ahora es público)"""
-    return get_products(db, skip=skip, limit=limit)
+@router.get("/", response_model=Union[List[ProductOut], ProductBatch, ProductPage])
+def list_products(
+    request: Request,
+    response: Response,
+    db: DbSession,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+):
+    """
+    Listar productos (ahora es público)
+
+    Sin `cursor` se pagina con skip/limit (modo legado). Con `cursor` (vacío
+    para la primera página) se pagina por (name, id) y la respuesta incluye
+    `next_cursor`, que mantiene el coste constante en páginas profundas.
+
+    Con `ids=1,2,3` devuelve esos productos en una sola consulta, en el
+    orden pedido, y en `missing` los ids que no existen (para listas largas,
+    POST /products/batch).
+
+    Soporta GET condicional: el ETag sale de filas + suma de versiones +
+    id máximo + max(updated_at), así que un 304 se decide sin cargar filas.
+
+    Con fast_json_lists activo los listados se leen como tuplas de columnas
+    y se serializan directamente a bytes (mismo JSON).
+    """
+    if ids is not None:
+        items, missing = get_products_by_ids(db, _requested_ids(ids))
+        return {"items": items, "missing": missing}
+
+    not_modified = _list_not_modified(request, response, *get_products_fingerprint(db))
+    if not_modified:
+        return not_modified
+
+    fast = settings.fast_json_lists
+    if cursor is None:
+        if fast:
+            rows = get_product_rows(db, _PRODUCT_COLUMNS, skip=skip, limit=limit)
+            return raw_json_response(rows_json(rows), response)
+        return get_products(db, skip=skip, limit=limit)
+
+    after = _after_key(cursor)
+    if fast:
+        rows = get_product_rows_after(db, _PRODUCT_COLUMNS, after=after, limit=limit + 1)
+    else:
+        rows = get_products_after(db, after=after, limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=_page_key)
+    if fast:
+        return raw_json_response({"items": rows_json(items), "next_cursor": next_cursor}, response)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/batch", response_model=ProductBatch)
+def get_products_batch(batch: ProductBatchRequest, db: DbSession):
+    """Obtener varios productos por id en una sola consulta (público)"""
+    _check_batch_size(batch.ids)
+    items, missing = get_products_by_ids(db, batch.ids)
+    return {"items": items, "missing": missing}
+
+
+@router.get("/search", response_model=ProductSearchPage)
+def search_products_endpoint(
+    db: DbSession,
+    q: str = Query(..., min_length=1, max_length=100),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Buscar productos (público)
+
+    Coincide por prefijo de SKU y de nombre y por palabras del nombre o la
+    descripción (la última palabra como prefijo, para autocompletar). Los
+    resultados se ordenan por relevancia: SKU exacto, prefijo de SKU,
+    prefijo de nombre, palabras en el nombre y palabras en la descripción.
+    """
+    items, total = search_products(db, q, skip=skip, limit=limit)
+    return {"items": items, "total": total}
+
+
+@router.get("/cache/stats")
+def product_cache_stats():
+    """Contadores de la caché de productos: aciertos, fallos, expulsiones (público)"""
+    return product_cache.stats()
 
 
 @router.get("/{product_id}", response_model=ProductOut)
-def get_product_by_id(product_id: int, db: Session = Depends(get_db_safe)):
-    """Obtener producto por ID (ahora es público)"""
+def get_product_by_id(product_id: int, request: Request, response: Response, db: DbSession):
+    """Obtener producto por ID (ahora es público, soporta ETag / If-None-Match)"""
     product = get_product(db, product_id)
-    if not product:
-        raise HTTPException(404, "Producto no encontrado")
+    not_modified = _product_not_modified(request, response, product)
+    if not_modified:
+        return not_modified
     return product
 
 
 @router.put("/{product_id}", response_model=ProductOut)
-def update_product_endpoint(product_id: int, product_in: ProductCreate, db: Session = Depends(get_db_safe)):
+def update_product_endpoint(product_id: int, product_in: ProductCreate, db: DbSession):
     """Actualizar producto (ahora es público)"""
     product = get_product(db, product_id)
     if not product:
         raise HTTPException(404, "Producto no encontrado")
     data = product_in.dict()
-    return update_product(db, product, data)
+    try:
+        return update_product(db, product, data)
+    except StaleDataError:
+        raise HTTPException(409, "El producto fue modificado por otra petición, vuelve a intentarlo")
 
 
 @router.delete("/{product_id}")
-def delete_product_endpoint(product_id: int, db: Session = Depends(get_db_safe)):
+def delete_product_endpoint(product_id: int, db: DbSession):
     """Eliminar producto (ahora es público)"""
     product = get_product(db, product_id)
     if not product:
@@ -0,0 +1,70 @@
+# app/api/api_v1/endpoints/products_async.py
+"""
+Endpoints `async def` de productos para el modo asíncrono (db_async_enabled).
+
+Se registran antes que los síncronos y atienden las mismas rutas de
+lectura y alta; el resto sigue en products.py, de donde se toman también
+las validaciones y el GET condicional para que ambos modos respondan igual.
+"""
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional, Union
+
+from app.api.api_v1.deps import AsyncDbSession
+from app.api.api_v1.endpoints.products import _after_key, _check_batch_size, _check_new_sku, _list_not_modified, _page_key, _product_not_modified, _requested_ids
+from app.core.pagination import build_page
+from app.crud.crud_product_async import create_product, get_product, get_product_by_sku, get_products, get_products_after, get_products_by_ids, get_products_fingerprint
+from app.schemas.product import ProductBatch, ProductBatchRequest, ProductCreate, ProductOut, ProductPage
+
+router = APIRouter(prefix="/products", tags=["products"])
+
+
+@router.post("/", response_model=ProductOut)
+async def create_new_product(product_in: ProductCreate, db: AsyncDbSession):
+    """Crear nuevo producto (público)"""
+    _check_new_sku(await get_product_by_sku(db, product_in.sku))
+    return await create_product(db, product_in)
+
+
+@router.get("/", response_model=Union[List[ProductOut], ProductBatch, ProductPage])
+async def list_products(
+    request: Request,
+    response: Response,
+    db: AsyncDbSession,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+):
+    """Listar productos (público); mismos parámetros que la versión síncrona"""
+    if ids is not None:
+        items, missing = await get_products_by_ids(db, _requested_ids(ids))
+        return {"items": items, "missing": missing}
+
+    not_modified = _list_not_modified(request, response, *await get_products_fingerprint(db))
+    if not_modified:
+        return not_modified
+
+    if cursor is None:
+        return await get_products(db, skip=skip, limit=limit)
+
+    rows = await get_products_after(db, after=_after_key(cursor), limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=_page_key)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/batch", response_model=ProductBatch)
+async def get_products_batch(batch: ProductBatchRequest, db: AsyncDbSession):
+    """Obtener varios productos por id en una sola consulta (público)"""
+    _check_batch_size(batch.ids)
+    items, missing = await get_products_by_ids(db, batch.ids)
+    return {"items": items, "missing": missing}
+
+
+@router.get("/{product_id:int}", response_model=ProductOut)
+async def get_product_by_id(product_id: int, request: Request, response: Response, db: AsyncDbSession):
+    """Obtener producto por ID (público, soporta ETag / If-None-Match)"""
+    product = await get_product(db, product_id)
+    not_modified = _product_not_modified(request, response, product)
+    if not_modified:
+        return not_modified
+    return product
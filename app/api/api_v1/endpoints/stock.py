@@ -0,0 +1,31 @@
+# app/api/api_v1/endpoints/stock.py
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.api_v1.deps import DbSession
+from app.core.pagination import build_page, decode_cursor
+from app.crud.crud_inventory import get_stock_after
+from app.schemas.inventory import StockPage
+
+router = APIRouter(prefix="/stock", tags=["stock"])
+
+
+@router.get("/", response_model=StockPage)
+def list_stock(
+    db: DbSession,
+    cursor: str = "",
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Productos con su cantidad en inventario (público)
+
+    Se pagina por id de producto: `cursor` vacío para la primera página y
+    luego el `next_cursor` de la respuesta. Cada página es una sola
+    consulta con JOIN, sin cargas perezosas por fila.
+    """
+    try:
+        after_id = decode_cursor(cursor, 1)[0] if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+    rows = get_stock_after(db, after_id=after_id, limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=lambda row: (row.id,))
+    return {"items": items, "next_cursor": next_cursor}
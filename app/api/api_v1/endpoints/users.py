@@ -1,23 +1,42 @@
 # app/api/api_v1/endpoints/users.py (ejemplo)
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional, Union
 
-from app.api.api_v1.deps import get_db_safe  # Solo esto
-from app.schemas.user import UserCreate, UserOut
-from app.crud.crud_user import get_user_by_email, get_users, create_user, get_user
+from app.api.api_v1.deps import DbSession
+from app.core.pagination import build_page, decode_cursor
+from app.schemas.user import UserCreate, UserOut, UserPage
+from app.crud.crud_user import get_user_by_email, get_users, get_users_after, create_user, get_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/", response_model=UserOut)
-def create_user_endpoint(user_in: UserCreate, db: Session = Depends(get_db_safe)):
+def create_user_endpoint(user_in: UserCreate, db: DbSession):
     """Crear usuario (público)"""
     existing = get_user_by_email(db, user_in.email)
     if existing:
         raise HTTPException(400, "Email ya registrado")
     return create_user(db, user_in)
 
-@router.get("/", response_model=List[UserOut])
-def list_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_safe)):
-    """Listar usuarios (público)"""
-    return get_users(db, skip=skip, limit=limit)
\ No newline at end of file
+@router.get("/", response_model=Union[List[UserOut], UserPage])
+def list_users(
+    db: DbSession,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """
+    Listar usuarios (público)
+
+    Sin `cursor` se pagina con skip/limit (modo legado); con `cursor` (vacío
+    para la primera página) se pagina por id y se devuelve `next_cursor`.
+    """
+    if cursor is None:
+        return get_users(db, skip=skip, limit=limit)
+
+    try:
+        after_id = decode_cursor(cursor, 1)[0] if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+    rows = get_users_after(db, after_id=after_id, limit=limit + 1)
+    items, next_cursor = build_page(rows, limit, key=lambda u: (u.id,))
+    return {"items": items, "next_cursor": next_cursor}
\ No newline at end of file
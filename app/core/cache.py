@@ -0,0 +1,202 @@
+# app/core/cache.py
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Marca de "no está en caché" (None es un valor cacheable: "no existe")
+MISSING = object()
+
+
+class SQLiteInvalidationChannel:
+    """
+    Canal de invalidación entre procesos sobre una tabla SQLite compartida.
+
+    Cada proceso publica las claves que invalida y lee periódicamente las
+    publicadas por los demás. Sirve para varios workers en la misma máquina
+    sin depender de un servicio externo.
+    """
+
+    # Las invalidaciones más antiguas que esto se purgan
+    retention_seconds = 3600
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_invalidations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._last_id: Dict[str, int] = {}
+
+    def _current_max_id(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidations").fetchone()
+        return row[0]
+
+    def publish(self, namespace: str, keys: Iterable[str]) -> None:
+        now = time.time()
+        rows = [(namespace, key, now) for key in keys]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO cache_invalidations (namespace, key, created_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < ?", (now - self.retention_seconds,)
+            )
+            self._conn.execute("COMMIT")
+
+    def poll(self, namespace: str) -> List[str]:
+        """Claves publicadas desde la última llamada (la primera solo marca el punto de partida)"""
+        with self._lock:
+            last_id = self._last_id.get(namespace)
+            if last_id is None:
+                self._last_id[namespace] = self._current_max_id()
+                return []
+            rows = self._conn.execute(
+                "SELECT id, key FROM cache_invalidations WHERE namespace = ? AND id > ? ORDER BY id",
+                (namespace, last_id),
+            ).fetchall()
+            if rows:
+                self._last_id[namespace] = rows[-1][0]
+            return [key for _, key in rows]
+
+
+class LRUTTLCache:
+    """
+    Caché en proceso acotada por tamaño (LRU) y por antigüedad (TTL).
+
+    Con `maxsize` <= 0 queda desactivada. Si se le da un canal de
+    invalidación, las invalidaciones se publican a otros procesos y las de
+    ellos se aplican aquí como mucho cada `poll_seconds`.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 10000,
+        ttl_seconds: float = 30,
+        channel: Optional[SQLiteInvalidationChannel] = None,
+        poll_seconds: float = 0.5,
+    ):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def sync_due(self) -> bool:
+        """Si toca leer el canal de invalidación (no lo lee)"""
+        return self.channel is not None and time.monotonic() - self._last_poll >= self.poll_seconds
+
+    def sync(self) -> None:
+        """
+        Aplicar las invalidaciones publicadas por otros procesos, como mucho
+        una vez cada `poll_seconds`. Lee el canal SQLite: puede bloquear.
+        """
+        if not self.sync_due():
+            return
+        self._last_poll = time.monotonic()
+        keys = self.channel.poll(self.namespace)
+        if keys:
+            with self._lock:
+                for key in keys:
+                    if self._data.pop(key, None) is not None:
+                        self.invalidations += 1
+
+    def get(self, key: Hashable, sync: bool = True) -> Any:
+        """
+        Valor cacheado o MISSING.
+
+        Con sync=False no se lee el canal de invalidación; quien llama debe
+        hacer sync() por su cuenta (p. ej. el código async, desde un hilo).
+        """
+        if not self.enabled:
+            return MISSING
+        if sync:
+            self.sync()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: str) -> None:
+        """Borrar claves aquí y avisar al resto de procesos"""
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+        if self.channel is not None:
+            self.channel.publish(self.namespace, keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._data)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def _build_invalidation_channel() -> Optional[SQLiteInvalidationChannel]:
+    from app.core.config import settings
+
+    if not settings.cache_invalidation_db:
+        return None
+    return SQLiteInvalidationChannel(settings.cache_invalidation_db)
+
+
+invalidation_channel = _build_invalidation_channel()
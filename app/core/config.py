@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
 class Settings(BaseSettings):
     # === DATABASE ===
@@ -8,10 +9,76 @@ class Settings(BaseSettings):
         "@adsodigital.sbs:3306/inventory_db"
     )
 
+    # Pool de conexiones (no aplica a SQLite en memoria)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Segundos que se espera una conexión libre antes de fallar
+    db_pool_timeout: float = 30
+    # Reciclar conexiones con más de estos segundos (-1 = nunca)
+    db_pool_recycle: int = 3600
+    # Pre-ping al sacar una conexión: always, idle (solo si lleva más de
+    # db_pool_pre_ping_idle_seconds sin usarse) o never
+    db_pool_pre_ping: str = "idle"
+    db_pool_pre_ping_idle_seconds: float = 30
+    # Modo asíncrono opcional: motor async (aiomysql / aiosqlite) y endpoints
+    # `async def` para las lecturas y ajustes más frecuentes
+    db_async_enabled: bool = False
+    # Conexiones que se abren al arrancar para calentar el pool (0 = ninguna)
+    db_pool_warmup_connections: int = 1
+    # El esquema lo gestiona Alembic (alembic upgrade head); esto solo crea
+    # las tablas que falten al arrancar, útil en desarrollo
+    db_create_all_on_startup: bool = False
+
     # === JWT CONFIG ===
     secret_key: str = "tu_secret_key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    refresh_token_expire_days: int = 7
+    # bcrypt corre en un pool propio: hilos, operaciones en espera como
+    # máximo y Retry-After (segundos) del 503 cuando la cola está llena
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 16
+    password_hash_retry_after_seconds: int = 1
+
+    # === INVENTORY ===
+    # Acumular los ajustes por producto y escribirlos como un único UPDATE neto
+    inventory_coalesce_enabled: bool = False
+    inventory_coalesce_interval_ms: int = 50
+    inventory_coalesce_max_ops: int = 1000
+    # Umbral de stock bajo para productos sin umbral propio
+    low_stock_default_threshold: int = 10
+    # Cada cuánto se recarga desde la BD el conjunto de stock bajo en memoria
+    low_stock_refresh_seconds: int = 300
+    # Cada cuántos minutos se escribe una foto del inventario (0 = desactivado)
+    inventory_snapshot_interval_minutes: int = 60
+    # Fotos que se conservan tras cada una; lo anterior a la más antigua se
+    # borra del libro (0 = no compactar)
+    inventory_ledger_keep_snapshots: int = 48
+
+    # === SEARCH ===
+    # auto: FULLTEXT en MySQL, índice en memoria en el resto; o fulltext / memory
+    product_search_backend: str = "auto"
+    product_search_refresh_seconds: int = 600
+
+    # === API ===
+    # Máximo de ids aceptados por una consulta múltiple (?ids=, /batch)
+    batch_max_ids: int = 500
+    # Listados serializados desde tuplas de columnas directamente a bytes,
+    # sin instancias ORM ni validación de modelos por fila
+    fast_json_lists: bool = False
+    # Métricas por ruta en /metrics (formato Prometheus)
+    metrics_enabled: bool = True
+
+    # === CACHE ===
+    # Caché de productos (product_cache_size = 0 la desactiva)
+    product_cache_size: int = 10000
+    product_cache_ttl_seconds: float = 30
+    # Caché del usuario autenticado (user_cache_size = 0 la desactiva)
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: float = 60
+    # Archivo SQLite compartido para invalidar cachés entre workers (opcional)
+    cache_invalidation_db: Optional[str] = None
+    cache_invalidation_poll_seconds: float = 0.5
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,40 @@
+# app/core/fast_json.py
+from typing import Iterable, List, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import null
+
+# Cabeceras de la respuesta inyectada (ETag, caché) que se copian a la respuesta cruda
+_FORWARDED_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+def schema_columns(schema: Type[BaseModel], model) -> List:
+    """
+    Columnas del modelo ORM con los nombres y el orden de los campos del
+    esquema de salida; los campos sin columna salen como NULL.
+    """
+    return [
+        getattr(model, name).label(name) if hasattr(model, name) else null().label(name)
+        for name in schema.model_fields
+    ]
+
+
+def rows_json(rows: Iterable) -> List[dict]:
+    """Filas de columnas como dicts listos para serializar"""
+    return [row._asdict() for row in rows]
+
+
+def raw_json_response(content, response: Optional[Response] = None) -> Response:
+    """
+    Serializar `content` (dicts, listas, tipos simples) directamente a bytes
+    con pydantic-core, sin validar modelos ni pasar por jsonable_encoder.
+
+    `response` es la respuesta inyectada en el endpoint: se copian sus
+    cabeceras de caché (p. ej. las que puso check_conditional).
+    """
+    headers = {}
+    if response is not None:
+        headers = {name: response.headers[name] for name in _FORWARDED_HEADERS if name in response.headers}
+    return Response(content=to_json(content), media_type="application/json", headers=headers)
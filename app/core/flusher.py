@@ -0,0 +1,68 @@
+# app/core/flusher.py
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlusher(ABC):
+    """
+    Hilo en segundo plano que llama a flush() cada cierto intervalo.
+
+    Las subclases implementan flush(). El hilo se arranca bajo demanda con
+    start(), se puede despertar antes de tiempo con request_flush() y stop()
+    hace un último flush para no perder lo acumulado al apagar (salvo que
+    la subclase ponga flush_on_stop = False).
+    """
+
+    flush_on_stop = True
+
+    def __init__(self, interval_seconds: float, name: str):
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @abstractmethod
+    def flush(self) -> int:
+        """Escribir lo acumulado; devuelve el número de elementos escritos"""
+
+    def start(self) -> None:
+        """Arrancar el hilo si no está corriendo"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def request_flush(self) -> None:
+        """Despertar el hilo para que haga flush sin esperar al intervalo"""
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Detener el hilo y hacer un último flush"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.flush_on_stop:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.interval_seconds)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error en flush de %s", self.name)
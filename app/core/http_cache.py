@@ -0,0 +1,62 @@
+# app/core/http_cache.py
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag débil a partir de los valores que identifican la versión del recurso"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Las fechas de la BD llegan sin zona; se guardan en UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        weak = etag[2:] if etag.startswith("W/") else etag
+        return "*" in candidates or any(
+            (tag[2:] if tag.startswith("W/") else tag) == weak for tag in candidates
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def check_conditional(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Resolver un GET condicional.
+
+    Si el cliente ya tiene esta versión devuelve una respuesta 304 sin
+    cuerpo; si no, añade ETag/Last-Modified a `response` y devuelve None.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,119 @@
+# app/core/metrics.py
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Límites por defecto (segundos) para histogramas de latencia
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Histograma acumulativo por cubetas, seguro entre hilos.
+
+    Cada observación cuenta en la primera cubeta cuyo límite no supera;
+    snapshot() devuelve los conteos acumulados (le <= límite), como
+    Prometheus.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": running + counts[-1], "sum": total}
+
+
+class RequestMetrics:
+    """
+    Métricas HTTP por ruta: histograma de duración y contador de respuestas
+    por (método, plantilla de ruta) y peticiones en curso.
+
+    Lo alimenta MetricsMiddleware desde el bucle de eventos, así que los
+    contadores no necesitan lock; cada histograma tiene el suyo.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._responses: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        histogram = self._durations.get((method, route))
+        if histogram is None:
+            histogram = self._durations.setdefault((method, route), Histogram(self.buckets))
+        histogram.observe(seconds)
+        key = (method, route, status)
+        self._responses[key] = self._responses.get(key, 0) + 1
+
+    def durations(self) -> List[Tuple[Dict[str, str], Dict[str, Any]]]:
+        return [
+            ({"method": method, "route": route}, histogram.snapshot())
+            for (method, route), histogram in sorted(self._durations.items())
+        ]
+
+    def responses(self) -> List[Tuple[Dict[str, str], int]]:
+        return [
+            ({"method": method, "route": route, "status": str(status)}, count)
+            for (method, route, status), count in sorted(self._responses.items())
+        ]
+
+
+request_metrics = RequestMetrics()
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusText:
+    """Constructor del formato de texto de Prometheus (versión 0.0.4)"""
+
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def _header(self, name: str, kind: str, help_text: str) -> None:
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> None:
+        self._header(name, "gauge", help_text)
+        self._lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in samples)
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> None:
+        self._header(name, "counter", help_text)
+        self._lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in samples)
+
+    def histogram(self, name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], Dict[str, Any]]]) -> None:
+        """`samples`: pares (etiquetas, Histogram.snapshot())"""
+        self._header(name, "histogram", help_text)
+        for labels, snapshot in samples:
+            for bound, count in snapshot["buckets"].items():
+                self._lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
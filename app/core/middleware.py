@@ -0,0 +1,97 @@
+# app/core/middleware.py
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RequestMetrics, request_metrics
+
+REQUEST_ID_HEADER = "x-request-id"
+# Un id entrante más largo que esto se descarta y se genera uno nuevo
+_MAX_REQUEST_ID_LENGTH = 128
+
+
+def _incoming_request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1").strip()
+            if 0 < len(request_id) <= _MAX_REQUEST_ID_LENGTH and request_id.isprintable():
+                return request_id
+            break
+    return uuid.uuid4().hex
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI puro: id de petición y tiempo de proceso.
+
+    Reutiliza el X-Request-ID del cliente (o genera uno), lo deja en
+    request.state.request_id y lo devuelve en la respuesta junto a
+    Server-Timing con la duración hasta el inicio de la respuesta. No crea
+    tareas ni streams por petición, a diferencia de @app.middleware("http").
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope)
+        scope.setdefault("state", {})["request_id"] = request_id
+        start = time.perf_counter()
+
+        async def send_with_context(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("Server-Timing", f"app;dur={(time.perf_counter() - start) * 1000:.2f}")
+            await send(message)
+
+        await self.app(scope, receive, send_with_context)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro: duración, código de estado y peticiones en curso
+    por ruta, en app.core.metrics.request_metrics.
+
+    La ruta se etiqueta con su plantilla (/api/v1/products/{product_id}),
+    que el router deja en scope["route"]; las peticiones sin ruta van a
+    "unmatched" para no crear una serie por URL.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        metrics = self.metrics
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+                time.perf_counter() - start,
+            )
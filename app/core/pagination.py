@@ -0,0 +1,61 @@
+# app/core/pagination.py
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codificar la clave del último elemento de una página como cursor opaco"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decodificar un cursor generado por encode_cursor.
+
+    Raises:
+        ValueError: Si el cursor está mal formado o no tiene `size` valores
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor inválido")
+    # Solo claves escalares (ids y nombres); bool es subclase de int
+    if any(isinstance(value, bool) or not isinstance(value, (int, str)) for value in values):
+        raise ValueError("Cursor inválido")
+    return values
+
+
+def parse_id_list(raw: str, max_items: int) -> List[int]:
+    """
+    Convertir "1,2,3" en [1, 2, 3].
+
+    Raises:
+        ValueError: Si algún valor no es un entero positivo o hay más de `max_items`
+    """
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("Lista de ids inválida")
+    if not ids or any(value <= 0 for value in ids):
+        raise ValueError("Lista de ids inválida")
+    if len(ids) > max_items:
+        raise ValueError(f"Máximo {max_items} ids por consulta")
+    return ids
+
+
+def build_page(rows: list, limit: int, key: Callable[[Any], Sequence[Any]]) -> Tuple[list, Optional[str]]:
+    """
+    Recortar una página y calcular el cursor siguiente.
+
+    `rows` debe traer hasta limit + 1 elementos: el sobrante solo indica que
+    hay más páginas.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
@@ -1,26 +1,90 @@
 # app/core/security.py
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TypeVar
+import threading
 import jwt
 from jwt import PyJWTError
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """La cola de hashing de contraseñas está llena; reintentar más tarde"""
+
+
+class PasswordHasher:
+    """
+    Pool de hilos propio y acotado para bcrypt.
+
+    Con el backend `bcrypt` (extensión C, libera el GIL) `workers` hilos
+    hashean en paralelo sin ocupar el threadpool de Starlette con trabajo de
+    CPU. Como mucho `workers + queue_size` operaciones pueden estar en curso
+    o en espera; el resto falla al momento con PasswordHasherBusy.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    def pending(self) -> int:
+        """Operaciones en curso o esperando turno"""
+        return self._in_flight
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Ejecutar fn(*args) en el pool y esperar el resultado.
+
+        Raises:
+            PasswordHasherBusy: Si ya hay `capacity` operaciones en curso o en cola
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica si una contraseña en texto plano coincide con el hash almacenado.
+
+    Raises:
+        PasswordHasherBusy: Si el pool de bcrypt está saturado
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Genera hash de una contraseña usando bcrypt.
+
+    Raises:
+        PasswordHasherBusy: Si el pool de bcrypt está saturado
     """
-    return pwd_context.hash(password)
+    return password_hasher.run(pwd_context.hash, password)
 
 
 def create_access_token(
@@ -65,14 +129,18 @@ def create_access_token(
 
 def create_refresh_token(
     subject: str,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    jti: Optional[str] = None,
+    family: Optional[str] = None
 ) -> str:
     """
     Crea un token JWT de refresh.
     
     Args:
         subject: Identificador del usuario
-        expires_delta: Tiempo de expiración (por defecto 7 días)
+        expires_delta: Tiempo de expiración (por defecto refresh_token_expire_days)
+        jti: Identificador único del token, para seguirlo en el servidor
+        family: Familia de rotación a la que pertenece
     
     Returns:
         Token JWT de refresh
@@ -88,6 +156,10 @@ def create_refresh_token(
         "iat": datetime.utcnow(),
         "type": "refresh"
     }
+    if jti:
+        to_encode["jti"] = jti
+    if family:
+        to_encode["fam"] = family
     
     encoded_jwt = jwt.encode(
         to_encode,
@@ -97,12 +169,14 @@ def create_refresh_token(
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[Dict[str, Any]]:
+def verify_token(token: str, expected_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Verifica y decodifica un token JWT.
     
     Args:
         token: Token JWT a verificar
+        expected_type: Si se indica, el claim "type" debe coincidir
+            ("access", "refresh"...); un refresh token no sirve como bearer
     
     Returns:
         Payload decodificado o None si el token es inválido
@@ -113,9 +187,11 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
             settings.secret_key,
             algorithms=[settings.algorithm]
         )
-        return payload
     except PyJWTError:
         return None
+    if expected_type is not None and payload.get("type") != expected_type:
+        return None
+    return payload
 
 
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
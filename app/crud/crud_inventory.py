@@ -1,8 +1,70 @@
 # app/crud/crud_inventory.py
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import Session
+from app.crud.inventory_ledger import record_movements
+from app.crud.low_stock import low_stock_index
 from app.models.inventory import Inventory
 from app.models.product import Product
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+inventory_table = Inventory.__table__
+
+# Filas por sentencia en las operaciones masivas
+UPSERT_CHUNK_SIZE = 1000
+
+
+def _clamped_quantity(delta):
+    """Expresión SQL que suma `delta` a la cantidad sin bajar de cero"""
+    new_quantity = inventory_table.c.quantity + delta
+    return case((new_quantity < 0, 0), else_=new_quantity)
+
+
+def _ensure_product(db: Session, product_id: int) -> None:
+    """Lanza ValueError si el producto no existe"""
+    exists = db.execute(select(Product.id).where(Product.id == product_id)).first()
+    if not exists:
+        raise ValueError(f"Producto con ID {product_id} no existe")
+
+
+def _ensure_products(db: Session, product_ids) -> None:
+    """Lanza ValueError con los IDs que no existen (una consulta IN por bloque)"""
+    product_ids = list(product_ids)
+    missing = set(product_ids)
+    for start in range(0, len(product_ids), UPSERT_CHUNK_SIZE):
+        chunk = product_ids[start:start + UPSERT_CHUNK_SIZE]
+        missing.difference_update(
+            db.execute(select(Product.id).where(Product.id.in_(chunk))).scalars()
+        )
+    if missing:
+        raise ValueError(f"Productos inexistentes: {sorted(missing)}")
+
+
+def _upsert_inventory(db: Session, rows: List[Dict[str, int]], quantity_on_conflict=None):
+    """
+    INSERT nativo con resolución de conflicto sobre inventory.product_id.
+
+    Usa ON DUPLICATE KEY UPDATE en MySQL y ON CONFLICT en SQLite/PostgreSQL.
+    Si no se indica `quantity_on_conflict`, la fila existente toma la
+    cantidad insertada.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(inventory_table).values(rows)
+        quantity = stmt.inserted.quantity if quantity_on_conflict is None else quantity_on_conflict
+        stmt = stmt.on_duplicate_key_update(quantity=quantity, updated_at=func.now(), version=inventory_table.c.version + 1)
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_module = sqlite if dialect == "sqlite" else postgresql
+        stmt = dialect_module.insert(inventory_table).values(rows)
+        quantity = stmt.excluded.quantity if quantity_on_conflict is None else quantity_on_conflict
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[inventory_table.c.product_id],
+            set_={"quantity": quantity, "updated_at": func.now(), "version": inventory_table.c.version + 1},
+        )
+    else:
+        raise NotImplementedError(f"Upsert de inventario no soportado para {dialect}")
+    return db.execute(stmt)
 
 
 def get_inventory_by_product(db: Session, product_id: int) -> Optional[Inventory]:
@@ -10,6 +72,44 @@ def get_inventory_by_product(db: Session, product_id: int) -> Optional[Inventory
     return db.query(Inventory).filter(Inventory.product_id == product_id).first()
 
 
+def get_inventory_by_products(db: Session, product_ids: List[int]) -> Tuple[List[Inventory], List[int]]:
+    """
+    Inventario de varios productos con una sola consulta IN.
+
+    Devuelve las filas en el orden pedido (sin repetidos) y los ids de
+    producto que no tienen inventario.
+    """
+    ordered = list(dict.fromkeys(product_ids))
+    found = {
+        inv.product_id: inv
+        for inv in db.query(Inventory).filter(Inventory.product_id.in_(ordered))
+    } if ordered else {}
+    items = [found[product_id] for product_id in ordered if product_id in found]
+    missing = [product_id for product_id in ordered if product_id not in found]
+    return items, missing
+
+
+def inventory_fingerprint_query():
+    """
+    Filas, suma de versiones, id máximo y última modificación del inventario.
+
+    Los tres primeros cambian con cada alta, baja o UPDATE aunque caigan en
+    el mismo segundo, que es la resolución de updated_at.
+    """
+    return select(
+        func.count(),
+        func.coalesce(func.sum(Inventory.version), 0),
+        func.max(Inventory.id),
+        func.max(Inventory.updated_at),
+    ).select_from(Inventory)
+
+
+def get_inventory_fingerprint(db: Session) -> Tuple[Tuple[int, int, Optional[int]], Optional[datetime]]:
+    """Versión del listado de inventario y su última modificación, sin cargar filas"""
+    count, versions, max_id, last_modified = db.execute(inventory_fingerprint_query()).one()
+    return (count, versions, max_id), last_modified
+
+
 def get_inventory_by_id(db: Session, inventory_id: int) -> Optional[Inventory]:
     """Obtener inventario por su ID"""
     return db.query(Inventory).filter(Inventory.id == inventory_id).first()
@@ -20,49 +120,276 @@ def get_all_inventory(db: Session, skip: int = 0, limit: int = 100) -> List[Inve
     return db.query(Inventory).offset(skip).limit(limit).all()
 
 
+def get_inventory_after(db: Session, after_id: Optional[int] = None, limit: int = 100) -> List[Inventory]:
+    """Página de inventario ordenada por id, a partir de `after_id`"""
+    query = db.query(Inventory)
+    if after_id is not None:
+        query = query.filter(Inventory.id > after_id)
+    return query.order_by(Inventory.id).limit(limit).all()
+
+
+def get_inventory_rows(db: Session, columns: List, skip: int = 0, limit: int = 100) -> List[Any]:
+    """Como get_all_inventory, pero solo las columnas pedidas (tuplas, sin entidades ORM)"""
+    return db.execute(select(*columns).offset(skip).limit(limit)).all()
+
+
+def get_inventory_rows_after(db: Session, columns: List, after_id: Optional[int] = None, limit: int = 100) -> List[Any]:
+    """Como get_inventory_after, pero solo las columnas pedidas"""
+    query = select(*columns)
+    if after_id is not None:
+        query = query.where(Inventory.id > after_id)
+    return db.execute(query.order_by(Inventory.id).limit(limit)).all()
+
+
 def create_or_update_inventory(db: Session, product_id: int, quantity: int) -> Inventory:
-    """Crear o actualizar inventario para un producto"""
-    # Verificar que el producto existe
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise ValueError(f"Producto con ID {product_id} no existe")
-    
-    inv = get_inventory_by_product(db, product_id)
-    if inv:
-        inv.quantity = quantity
-        db.add(inv)
-        db.commit()
-        db.refresh(inv)
-        return inv
-    else:
-        inv = Inventory(product_id=product_id, quantity=quantity)
-        db.add(inv)
-        db.commit()
-        db.refresh(inv)
-        return inv
+    """
+    Crear o actualizar inventario para un producto con un upsert nativo.
+
+    Raises:
+        ValueError: Si el producto no existe
+    """
+    _ensure_product(db, product_id)
+    _upsert_inventory(db, [{"product_id": product_id, "quantity": quantity}])
+
+    inv = db.execute(
+        select(Inventory).where(Inventory.product_id == product_id)
+    ).scalars().first()
+    record_movements(db, [(product_id, "set", None, inv.quantity)])
+    db.expunge(inv)
+    db.commit()
+    low_stock_index.update(product_id, inv.quantity, inv.low_stock_threshold)
+    return inv
+
+
+def bulk_upsert_inventory(db: Session, items: List[Tuple[int, int]], chunk_size: int = UPSERT_CHUNK_SIZE) -> int:
+    """
+    Fijar la cantidad de muchos productos en una sola transacción.
+
+    Si un product_id aparece varias veces gana la última cantidad. Las filas
+    se escriben con un upsert multi-VALUES por bloque de `chunk_size`.
+
+    Returns:
+        Número de productos escritos
+
+    Raises:
+        ValueError: Si algún producto no existe (no se escribe nada)
+    """
+    quantities = dict(items)
+    _ensure_products(db, quantities)
+
+    rows = [{"product_id": pid, "quantity": qty} for pid, qty in quantities.items()]
+    for start in range(0, len(rows), chunk_size):
+        _upsert_inventory(db, rows[start:start + chunk_size])
+    record_movements(db, ((pid, "set", None, qty) for pid, qty in quantities.items()))
+    db.commit()
+    low_stock_index.invalidate()
+    return len(rows)
 
 
 def adjust_inventory(db: Session, product_id: int, delta: int) -> Inventory:
-    """Ajustar inventario (sumar/restar cantidad)"""
-    # Verificar que el producto existe
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise ValueError(f"Producto con ID {product_id} no existe")
-    
-    inv = get_inventory_by_product(db, product_id)
+    """
+    Ajustar inventario (sumar/restar cantidad) sin perder actualizaciones.
+
+    El ajuste se hace en el servidor con un único UPDATE que nunca deja la
+    cantidad por debajo de cero, así que ajustes concurrentes sobre el mismo
+    producto no se pisan. Solo si el producto aún no tiene fila de inventario
+    se verifica que exista y se inserta.
+
+    Raises:
+        ValueError: Si el producto no existe
+    """
+    result = db.execute(
+        update(inventory_table)
+        .where(inventory_table.c.product_id == product_id)
+        .values(quantity=_clamped_quantity(delta))
+    )
+    if result.rowcount == 0:
+        # Primera fila del producto; si otra petición la crea a la vez,
+        # el conflicto sobre product_id aplica el delta sobre la suya.
+        _ensure_product(db, product_id)
+        _upsert_inventory(
+            db,
+            [{"product_id": product_id, "quantity": max(delta, 0)}],
+            quantity_on_conflict=_clamped_quantity(delta),
+        )
+
+    # La fila sigue bloqueada por el UPDATE: lo leído es exactamente nuestro resultado.
+    # Se desasocia antes del commit para que no expire y no haga falta un refresh.
+    inv = db.execute(
+        select(Inventory).where(Inventory.product_id == product_id)
+    ).scalars().first()
+    record_movements(db, [(product_id, "adjust", delta, inv.quantity)])
+    db.expunge(inv)
+    db.commit()
+    low_stock_index.update(product_id, inv.quantity, inv.low_stock_threshold)
+    return inv
+
+
+def adjust_inventory_locked(db: Session, product_id: int, delta: int) -> Tuple[int, Inventory]:
+    """
+    Ajustar inventario bloqueando la fila (SELECT ... FOR UPDATE).
+
+    Útil cuando además del resultado hace falta la cantidad previa,
+    por ejemplo para construir un InventoryAdjustResponse.
+
+    Returns:
+        Tupla (cantidad previa, inventario actualizado)
+
+    Raises:
+        ValueError: Si el producto no existe
+    """
+    inv = db.execute(
+        select(Inventory).where(Inventory.product_id == product_id).with_for_update()
+    ).scalars().first()
     if not inv:
+        _ensure_product(db, product_id)
         inv = Inventory(product_id=product_id, quantity=0)
         db.add(inv)
-        db.commit()
-        db.refresh(inv)
 
-    inv.quantity += delta
-    if inv.quantity < 0:
-        inv.quantity = 0
-    db.add(inv)
-    db.commit()
+    previous_quantity = inv.quantity or 0
+    inv.quantity = max(previous_quantity + delta, 0)
+    db.flush()
     db.refresh(inv)
-    return inv
+    record_movements(db, [(product_id, "adjust", delta, inv.quantity)])
+    db.expunge(inv)
+    db.commit()
+    low_stock_index.update(product_id, inv.quantity, inv.low_stock_threshold)
+    return previous_quantity, inv
+
+
+def _lock_inventory_rows(db: Session, product_ids) -> List[Any]:
+    """Filas (product_id, quantity, low_stock_threshold) bloqueadas en orden de product_id"""
+    return db.execute(
+        select(
+            inventory_table.c.product_id,
+            inventory_table.c.quantity,
+            inventory_table.c.low_stock_threshold,
+        )
+        .where(inventory_table.c.product_id.in_(list(product_ids)))
+        .order_by(inventory_table.c.product_id)
+        .with_for_update()
+    ).all()
+
+
+def adjust_inventory_batch(db: Session, adjustments: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Aplicar muchos ajustes de inventario en una sola transacción.
+
+    Los productos se validan con una única consulta IN y las filas afectadas
+    se bloquean (en orden de product_id, para evitar interbloqueos entre
+    lotes concurrentes). Los productos sin fila la reciben antes con un
+    upsert a cantidad 0, así dos lotes que crean la misma fila no chocan
+    con el índice único. Las cantidades nuevas se calculan en memoria,
+    respetando el orden de los ajustes, y se escriben con un executemany.
+
+    Args:
+        adjustments: Lista de pares (product_id, delta)
+
+    Returns:
+        Un resultado por ajuste con los campos de InventoryAdjustResponse;
+        los productos inexistentes se reportan con success=False
+    """
+    product_ids = {product_id for product_id, _ in adjustments}
+    valid_ids = set(
+        db.execute(select(Product.id).where(Product.id.in_(product_ids))).scalars()
+    )
+    locked = _lock_inventory_rows(db, valid_ids)
+    new_ids = sorted(valid_ids.difference(product_id for product_id, _, _ in locked))
+    if new_ids:
+        # SELECT ... FOR UPDATE no bloquea filas que aún no existen: si otro
+        # lote las crea a la vez, el upsert conserva su cantidad
+        _upsert_inventory(
+            db,
+            [{"product_id": pid, "quantity": 0} for pid in new_ids],
+            quantity_on_conflict=inventory_table.c.quantity,
+        )
+        locked += _lock_inventory_rows(db, new_ids)
+    current = {product_id: quantity for product_id, quantity, _ in locked}
+    thresholds = {product_id: threshold for product_id, _, threshold in locked}
+
+    results = []
+    for product_id, delta in adjustments:
+        if product_id not in valid_ids:
+            results.append({
+                "success": False,
+                "message": "Producto no encontrado",
+                "previous_quantity": 0,
+                "new_quantity": 0,
+                "adjustment": 0,
+                "product_id": product_id,
+            })
+            continue
+        previous_quantity = current.get(product_id, 0)
+        new_quantity = max(previous_quantity + delta, 0)
+        current[product_id] = new_quantity
+        results.append({
+            "success": True,
+            "message": "Inventario ajustado",
+            "previous_quantity": previous_quantity,
+            "new_quantity": new_quantity,
+            "adjustment": new_quantity - previous_quantity,
+            "product_id": product_id,
+        })
+
+    if current:
+        db.execute(
+            update(inventory_table)
+            .where(inventory_table.c.product_id == bindparam("b_product_id"))
+            .values(quantity=bindparam("b_quantity")),
+            [{"b_product_id": pid, "b_quantity": qty} for pid, qty in current.items()],
+        )
+    record_movements(db, (
+        (product_id, "adjust", delta, result["new_quantity"])
+        for (product_id, delta), result in zip(adjustments, results) if result["success"]
+    ))
+    db.commit()
+    for product_id, quantity in current.items():
+        low_stock_index.update(product_id, quantity, thresholds.get(product_id))
+    return results
+
+
+def apply_inventory_deltas(db: Session, deltas: Dict[int, int]) -> Dict[int, int]:
+    """
+    Aplicar deltas netos por producto en una sola transacción.
+
+    Pensado para el buffer de ajustes acumulados: cada producto recibe un
+    único UPDATE (limitado a cero) dentro de un executemany. Los productos
+    inexistentes se descartan.
+
+    Returns:
+        Los deltas efectivamente aplicados, por product_id
+    """
+    valid_ids = set(
+        db.execute(select(Product.id).where(Product.id.in_(list(deltas)))).scalars()
+    )
+    applied = {pid: delta for pid, delta in deltas.items() if pid in valid_ids}
+    if not applied:
+        return applied
+
+    # Asegurar que existe la fila sin tocar las cantidades ya guardadas
+    _upsert_inventory(
+        db,
+        [{"product_id": pid, "quantity": 0} for pid in sorted(applied)],
+        quantity_on_conflict=inventory_table.c.quantity,
+    )
+    db.execute(
+        update(inventory_table)
+        .where(inventory_table.c.product_id == bindparam("b_product_id"))
+        .values(quantity=_clamped_quantity(bindparam("b_delta"))),
+        [{"b_product_id": pid, "b_delta": delta} for pid, delta in sorted(applied.items())],
+    )
+    rows = db.execute(
+        select(
+            inventory_table.c.product_id,
+            inventory_table.c.quantity,
+            inventory_table.c.low_stock_threshold,
+        ).where(inventory_table.c.product_id.in_(list(applied)))
+    ).all()
+    record_movements(db, ((product_id, "adjust", applied[product_id], quantity) for product_id, quantity, _ in rows))
+    db.commit()
+    for product_id, quantity, threshold in rows:
+        low_stock_index.update(product_id, quantity, threshold)
+    return applied
 
 
 def delete_inventory(db: Session, product_id: int) -> bool:
@@ -70,7 +397,9 @@ def delete_inventory(db: Session, product_id: int) -> bool:
     inv = get_inventory_by_product(db, product_id)
     if inv:
         db.delete(inv)
+        record_movements(db, [(product_id, "delete", None, 0)])
         db.commit()
+        low_stock_index.remove(product_id)
         return True
     return False
 
@@ -80,6 +409,62 @@ def get_inventory_count(db: Session) -> int:
     return db.query(Inventory).count()
 
 
+def catalog_stock_query():
+    """
+    SELECT de productos con su cantidad en inventario (0 si no tienen fila).
+
+    Devuelve tuplas de columnas, sin cargar entidades ORM.
+    """
+    return (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.description,
+            Product.price,
+            func.coalesce(Inventory.quantity, 0).label("quantity"),
+        )
+        .outerjoin(Inventory, Inventory.product_id == Product.id)
+        .order_by(Product.id)
+    )
+
+
+def get_stock_after(db: Session, after_id: Optional[int] = None, limit: int = 100) -> List[Any]:
+    """
+    Página de productos con su cantidad, ordenada por id de producto.
+
+    Una sola consulta con JOIN sea cual sea el tamaño de la página: no se
+    toca la relación perezosa Inventory.product.
+    """
+    query = catalog_stock_query()
+    if after_id is not None:
+        query = query.where(Product.id > after_id)
+    return db.execute(query.limit(limit)).all()
+
+
 def get_low_stock(db: Session, threshold: int = 10) -> List[Inventory]:
     """Obtener productos con stock bajo"""
-    return db.query(Inventory).filter(Inventory.quantity <= threshold).all()
\ No newline at end of file
+    return db.query(Inventory).filter(Inventory.quantity <= threshold).all()
+
+
+def get_low_stock_items(db: Session) -> List[Tuple[int, int, int]]:
+    """
+    Productos por debajo de su propio umbral, como (product_id, quantity, threshold).
+
+    Se sirven desde el conjunto en memoria que mantienen las escrituras,
+    sin recorrer la tabla.
+    """
+    return low_stock_index.items(db)
+
+
+def set_low_stock_threshold(db: Session, product_id: int, threshold: Optional[int]) -> Optional[Inventory]:
+    """Fijar (o quitar, con None) el umbral de stock bajo de un producto"""
+    inv = get_inventory_by_product(db, product_id)
+    if not inv:
+        return None
+    inv.low_stock_threshold = threshold
+    db.add(inv)
+    db.commit()
+    db.refresh(inv)
+    low_stock_index.update(product_id, inv.quantity, inv.low_stock_threshold)
+    return inv
@@ -0,0 +1,76 @@
+# app/crud/crud_inventory_async.py
+"""
+Variantes asíncronas (AsyncSession) de crud_inventory.
+
+Las lecturas se escriben con select(); las escrituras reutilizan la
+función síncrona con run_sync, así el UPDATE con tope en cero, el índice
+de stock bajo y el libro de movimientos se comportan igual en ambos modos.
+Fuera de la transacción solo se toca el índice de stock bajo en memoria,
+que no bloquea, así que no hace falta pasar nada al threadpool.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.crud import crud_inventory
+from app.models.inventory import Inventory
+
+
+async def get_inventory_by_product(db: AsyncSession, product_id: int) -> Optional[Inventory]:
+    """Obtener inventario por ID de producto"""
+    result = await db.execute(select(Inventory).where(Inventory.product_id == product_id))
+    return result.scalars().first()
+
+
+async def get_inventory_by_products(db: AsyncSession, product_ids: List[int]) -> Tuple[List[Inventory], List[int]]:
+    """Inventario de varios productos con una sola consulta IN, en el orden pedido"""
+    ordered = list(dict.fromkeys(product_ids))
+    found = {}
+    if ordered:
+        result = await db.execute(select(Inventory).where(Inventory.product_id.in_(ordered)))
+        found = {inv.product_id: inv for inv in result.scalars()}
+    items = [found[product_id] for product_id in ordered if product_id in found]
+    missing = [product_id for product_id in ordered if product_id not in found]
+    return items, missing
+
+
+async def get_inventory_fingerprint(db: AsyncSession) -> Tuple[Tuple[int, int, Optional[int]], Optional[datetime]]:
+    """Versión del listado de inventario y su última modificación, sin cargar filas"""
+    result = await db.execute(crud_inventory.inventory_fingerprint_query())
+    count, versions, max_id, last_modified = result.one()
+    return (count, versions, max_id), last_modified
+
+
+async def get_all_inventory(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Inventory]:
+    """Obtener todos los registros de inventario"""
+    result = await db.execute(select(Inventory).offset(skip).limit(limit))
+    return list(result.scalars())
+
+
+async def get_inventory_after(db: AsyncSession, after_id: Optional[int] = None, limit: int = 100) -> List[Inventory]:
+    """Página de inventario ordenada por id, a partir de `after_id`"""
+    query = select(Inventory)
+    if after_id is not None:
+        query = query.where(Inventory.id > after_id)
+    result = await db.execute(query.order_by(Inventory.id).limit(limit))
+    return list(result.scalars())
+
+
+async def create_or_update_inventory(db: AsyncSession, product_id: int, quantity: int) -> Inventory:
+    """
+    Crear o actualizar inventario para un producto (ver crud_inventory).
+
+    Raises:
+        ValueError: Si el producto no existe
+    """
+    return await db.run_sync(crud_inventory.create_or_update_inventory, product_id, quantity)
+
+
+async def adjust_inventory(db: AsyncSession, product_id: int, delta: int) -> Inventory:
+    """
+    Ajustar inventario sumando `delta` sin bajar de cero (ver crud_inventory).
+
+    Raises:
+        ValueError: Si el producto no existe
+    """
+    return await db.run_sync(crud_inventory.adjust_inventory, product_id, delta)
@@ -1,22 +1,200 @@
 # app/crud/crud_product.py
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.cache import MISSING, LRUTTLCache, invalidation_channel
+from app.core.config import settings
+from app.crud.inventory_ledger import record_movements
+from app.crud.low_stock import low_stock_index
+from app.crud.product_search import product_search_index, search_product_ids
+from app.models.inventory import Inventory
 from app.models.product import Product
-from app.schemas.product import ProductCreate
+from app.schemas.product import ProductCreate, ProductImportRow
+
+# Filas por bloque en la importación masiva
+IMPORT_CHUNK_SIZE = 1000
+# Columnas que se aceptan en cada fila importada
+_IMPORT_FIELDS = frozenset(ProductImportRow.model_fields)
+
+# Caché de lectura de productos por id y por SKU. Guarda las columnas (o
+# None si el producto no existe), nunca instancias ORM ligadas a una sesión.
+product_cache = LRUTTLCache(
+    "products",
+    maxsize=settings.product_cache_size,
+    ttl_seconds=settings.product_cache_ttl_seconds,
+    channel=invalidation_channel,
+    poll_seconds=settings.cache_invalidation_poll_seconds,
+)
+
+_PRODUCT_COLUMNS = [attr.key for attr in Product.__mapper__.column_attrs]
+
+
+def _id_key(product_id: int) -> str:
+    return f"id:{product_id}"
+
+
+def _sku_key(sku: str) -> str:
+    return f"sku:{sku}"
+
+
+def _cache_product(key: str, product: Optional[Product]) -> None:
+    if product is None:
+        product_cache.set(key, None)
+        return
+    data = {column: getattr(product, column) for column in _PRODUCT_COLUMNS}
+    product_cache.set(_id_key(product.id), data)
+    product_cache.set(_sku_key(product.sku), data)
+
+
+def _product_from_cache(db: Session, data: Optional[Dict[str, Any]]) -> Optional[Product]:
+    """Reconstruir el producto cacheado como instancia persistente de `db`, sin SQL"""
+    if data is None:
+        return None
+    product = Product(**data)
+    make_transient_to_detached(product)
+    return db.merge(product, load=False)
 
 
 def get_product(db: Session, product_id: int):
-    return db.query(Product).filter(Product.id == product_id).first()
+    key = _id_key(product_id)
+    cached = product_cache.get(key)
+    if cached is not MISSING:
+        return _product_from_cache(db, cached)
+    product = db.query(Product).filter(Product.id == product_id).first()
+    _cache_product(key, product)
+    return product
 
 
 def get_product_by_sku(db: Session, sku: str):
-    return db.query(Product).filter(Product.sku == sku).first()
+    key = _sku_key(sku)
+    cached = product_cache.get(key)
+    if cached is not MISSING:
+        return _product_from_cache(db, cached)
+    product = db.query(Product).filter(Product.sku == sku).first()
+    _cache_product(key, product)
+    return product
 
 
 def get_products(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Product).offset(skip).limit(limit).all()
 
 
-def create_product(db: Session, product_in: ProductCreate):
+def products_fingerprint_query():
+    """
+    Productos, suma de versiones, id máximo y última modificación.
+
+    La versión sube con cada UPDATE (bloqueo optimista), así que los tres
+    primeros cambian con cada alta, baja o modificación aunque caigan en el
+    mismo segundo, que es la resolución de updated_at.
+    """
+    return select(
+        func.count(),
+        func.coalesce(func.sum(Product.version), 0),
+        func.max(Product.id),
+        func.max(Product.updated_at),
+    ).select_from(Product)
+
+
+def get_products_fingerprint(db: Session) -> Tuple[Tuple[int, int, Optional[int]], Optional[datetime]]:
+    """Versión del listado de productos y su última modificación, sin cargar filas"""
+    count, versions, max_id, last_modified = db.execute(products_fingerprint_query()).one()
+    return (count, versions, max_id), last_modified
+
+
+def _after_name_id(after: Tuple[str, int]):
+    # Comparación de filas: el índice (name, id) se recorre desde la clave,
+    # mientras que el OR equivalente lo escanea entero
+    name, product_id = after
+    return tuple_(Product.name, Product.id) > tuple_(name, product_id)
+
+
+def get_products_after(db: Session, after: Optional[Tuple[str, int]] = None, limit: int = 100):
+    """Página de productos ordenada por (name, id), a partir de la clave `after`"""
+    query = db.query(Product)
+    if after is not None:
+        query = query.filter(_after_name_id(after))
+    return query.order_by(Product.name, Product.id).limit(limit).all()
+
+
+def get_product_rows(db: Session, columns: List, skip: int = 0, limit: int = 100):
+    """Como get_products, pero solo las columnas pedidas (tuplas, sin entidades ORM)"""
+    return db.execute(select(*columns).offset(skip).limit(limit)).all()
+
+
+def get_product_rows_after(db: Session, columns: List, after: Optional[Tuple[str, int]] = None, limit: int = 100):
+    """Como get_products_after, pero solo las columnas pedidas"""
+    query = select(*columns)
+    if after is not None:
+        query = query.where(_after_name_id(after))
+    return db.execute(query.order_by(Product.name, Product.id).limit(limit)).all()
+
+
+def _split_cached_ids(product_ids: Iterable[int], sync: bool = True) -> Tuple[List[int], Dict[int, Dict[str, Any]], List[int]]:
+    """
+    Repartir los ids pedidos entre la caché y la BD (común a la versión async).
+
+    Returns:
+        Tupla (ids en orden sin repetidos, columnas cacheadas por id, ids a consultar)
+    """
+    ordered = list(dict.fromkeys(product_ids))
+    cached: Dict[int, Dict[str, Any]] = {}
+    pending = []
+    for product_id in ordered:
+        data = product_cache.get(_id_key(product_id), sync=sync)
+        if data is MISSING:
+            pending.append(product_id)
+        elif data is not None:
+            cached[product_id] = data
+    return ordered, cached, pending
+
+
+def _join_by_ids(
+    ordered: List[int], found: Dict[int, Product], pending: List[int], loaded: Iterable[Product]
+) -> Tuple[List[Product], List[int]]:
+    """Cachear lo consultado (también los ids que no existen) y devolver (productos, ids que faltan)"""
+    for product in loaded:
+        found[product.id] = product
+        _cache_product(_id_key(product.id), product)
+    for product_id in pending:
+        if product_id not in found:
+            _cache_product(_id_key(product_id), None)
+    items = [found[product_id] for product_id in ordered if product_id in found]
+    missing = [product_id for product_id in ordered if product_id not in found]
+    return items, missing
+
+
+def get_products_by_ids(db: Session, product_ids: Iterable[int]) -> Tuple[List[Product], List[int]]:
+    """
+    Obtener varios productos por id con una sola consulta IN.
+
+    Los que están en la caché no se consultan. Devuelve los productos en el
+    orden pedido (sin repetidos) y la lista de ids que no existen.
+    """
+    ordered, cached, pending = _split_cached_ids(product_ids)
+    found = {product_id: _product_from_cache(db, data) for product_id, data in cached.items()}
+    loaded = db.query(Product).filter(Product.id.in_(pending)).all() if pending else []
+    return _join_by_ids(ordered, found, pending, loaded)
+
+
+def product_written(product: Product, *old_skus: str) -> None:
+    """
+    Efectos de un alta o cambio ya confirmado: invalidar la caché (se publica
+    a los demás procesos) y actualizar el índice de búsqueda.
+
+    Puede bloquear (escritura del canal SQLite, índice en plena recarga):
+    desde código async se ejecuta en un hilo.
+    """
+    skus = dict.fromkeys((*old_skus, product.sku))
+    product_cache.invalidate(_id_key(product.id), *(_sku_key(sku) for sku in skus))
+    product_search_index.add(product.id, product.sku, product.name, product.description)
+
+
+def _insert_product(db: Session, product_in: ProductCreate) -> Product:
+    """Alta en la BD, sin efectos sobre caché ni índice (ver product_written)"""
     product = Product(name=product_in.name, sku=product_in.sku, price=product_in.price, description=product_in.description)
     db.add(product)
     db.commit()
@@ -24,15 +202,188 @@ def create_product(db: Session, product_in: ProductCreate):
     return product
 
 
+def create_product(db: Session, product_in: ProductCreate):
+    product = _insert_product(db, product_in)
+    product_written(product)
+    return product
+
+
 def update_product(db: Session, product: Product, data: dict):
+    old_sku = product.sku
     for field, value in data.items():
         setattr(product, field, value)
     db.add(product)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        # La versión leída (posiblemente de la caché) ya no es la actual
+        db.rollback()
+        product_cache.invalidate(_id_key(product.id), _sku_key(old_sku))
+        raise
     db.refresh(product)
+    product_written(product, old_sku)
     return product
 
 
 def delete_product(db: Session, product: Product):
+    product_id = product.id
+    keys = (_id_key(product_id), _sku_key(product.sku))
     db.delete(product)
     db.commit()
+    product_cache.invalidate(*keys)
+    product_search_index.remove(product_id)
+
+
+def search_products(db: Session, q: str, skip: int = 0, limit: int = 20) -> Tuple[List[Product], int]:
+    """
+    Buscar productos por prefijo de SKU/nombre y por palabras de la descripción.
+
+    Returns:
+        Tupla (página de productos ordenada por relevancia, total de coincidencias)
+    """
+    ids = search_product_ids(db, q)
+    page_ids = ids[skip:skip + limit]
+    if not page_ids:
+        return [], len(ids)
+    by_id = {p.id: p for p in db.query(Product).filter(Product.id.in_(page_ids))}
+    return [by_id[pid] for pid in page_ids if pid in by_id], len(ids)
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _insert_import_chunk(
+    db: Session, chunk: List[Tuple[int, ProductImportRow]], errors: List[Dict[str, Any]]
+) -> Tuple[List[ProductImportRow], Dict[str, int]]:
+    """INSERT y commit de los productos nuevos del bloque y su stock; devuelve las filas creadas y sus ids por SKU"""
+    skus = [row.sku for _, row in chunk]
+    existing = set(db.execute(select(Product.sku).where(Product.sku.in_(skus))).scalars())
+    new_rows = []
+    for row_number, row in chunk:
+        if row.sku in existing:
+            errors.append({"row": row_number, "sku": row.sku, "error": "Producto con ese SKU ya existe"})
+        else:
+            new_rows.append(row)
+    if not new_rows:
+        return [], {}
+
+    db.execute(
+        insert(Product.__table__),
+        [
+            {"name": row.name, "sku": row.sku, "price": row.price, "description": row.description}
+            for row in new_rows
+        ],
+    )
+    ids = dict(db.execute(
+        select(Product.sku, Product.id).where(Product.sku.in_([row.sku for row in new_rows]))
+    ).all())
+    stock = [{"product_id": ids[row.sku], "quantity": row.quantity} for row in new_rows if row.quantity is not None]
+    if stock:
+        db.execute(insert(Inventory.__table__), stock)
+        record_movements(db, ((item["product_id"], "set", None, item["quantity"]) for item in stock))
+    db.commit()
+    return new_rows, ids
+
+
+def _import_chunk(db: Session, chunk: List[Tuple[int, ProductImportRow]], errors: List[Dict[str, Any]]) -> int:
+    """
+    Insertar un bloque ya validado; devuelve cuántos productos se crearon.
+
+    Si otra escritura crea alguno de los SKU entre la comprobación y el
+    INSERT, el bloque se deshace y se reintenta una vez (esos SKU salen
+    entonces como ya existentes); si vuelve a fallar, todas sus filas se
+    reportan como error.
+    """
+    for _ in range(2):
+        chunk_errors: List[Dict[str, Any]] = []
+        try:
+            new_rows, ids = _insert_import_chunk(db, chunk, chunk_errors)
+        except IntegrityError:
+            db.rollback()
+            continue
+        errors.extend(chunk_errors)
+        break
+    else:
+        errors.extend(
+            {"row": row_number, "sku": row.sku, "error": "Conflicto con otra escritura; vuelve a importar la fila"}
+            for row_number, row in chunk
+        )
+        return 0
+
+    # Cachés e índices tras el commit, como en create_product.
+    # Los SKU nuevos pueden estar cacheados como "no existe"
+    product_cache.invalidate(*(_sku_key(row.sku) for row in new_rows))
+    for row in new_rows:
+        product_search_index.add(ids[row.sku], row.sku, row.name, row.description)
+    if any(row.quantity is not None for row in new_rows):
+        low_stock_index.invalidate()
+    return len(new_rows)
+
+
+def _import_row(raw: Dict[Any, Any]) -> ProductImportRow:
+    """
+    Validar una fila leída del archivo.
+
+    Las columnas que no son campos se ignoran, incluida la clave None que
+    csv.DictReader usa para las celdas sobrantes de una fila.
+    """
+    return ProductImportRow(**{key: value for key, value in raw.items() if key in _IMPORT_FIELDS})
+
+
+def _raw_sku(raw: Dict[Any, Any]) -> Optional[str]:
+    # El informe declara el SKU como texto: un 123 de NDJSON sale como "123"
+    sku = raw.get("sku")
+    return None if sku is None else str(sku)
+
+
+def import_products(db: Session, rows: Iterable[Tuple[int, Any]], chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Importar productos (y su stock inicial) de forma masiva.
+
+    Las filas se validan contra ProductImportRow y se procesan por bloques:
+    una consulta IN detecta los SKU ya existentes y los productos se
+    insertan con un executemany, con un commit por bloque.
+
+    Args:
+        rows: Pares (número de fila, dict con los datos o Exception si la
+            fila no se pudo leer)
+
+    Returns:
+        Informe con el total de filas, los productos creados y un error por fila rechazada
+    """
+    errors: List[Dict[str, Any]] = []
+    seen_skus = set()
+    chunk: List[Tuple[int, ProductImportRow]] = []
+    total = 0
+    created = 0
+
+    for row_number, raw in rows:
+        total += 1
+        if isinstance(raw, Exception):
+            errors.append({"row": row_number, "sku": None, "error": str(raw)})
+            continue
+        try:
+            row = _import_row(raw)
+        except ValidationError as e:
+            errors.append({"row": row_number, "sku": _raw_sku(raw), "error": _validation_message(e)})
+            continue
+        except TypeError as e:
+            errors.append({"row": row_number, "sku": _raw_sku(raw), "error": str(e)})
+            continue
+        if row.sku in seen_skus:
+            errors.append({"row": row_number, "sku": row.sku, "error": "SKU duplicado en el archivo"})
+            continue
+        seen_skus.add(row.sku)
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            created += _import_chunk(db, chunk, errors)
+            chunk = []
+
+    if chunk:
+        created += _import_chunk(db, chunk, errors)
+    errors.sort(key=lambda error: error["row"])
+    return {"total": total, "created": created, "errors": errors}
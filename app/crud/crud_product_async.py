@@ -0,0 +1,99 @@
+# app/crud/crud_product_async.py
+"""
+Variantes asíncronas (AsyncSession) de crud_product.
+
+Las lecturas se escriben con select() y comparten la caché de productos
+con el modo síncrono; el canal de invalidación entre procesos se lee en el
+threadpool. Las escrituras reutilizan la parte de BD de
+crud_product con run_sync sobre la misma conexión asíncrona; la
+invalidación de caché y el índice de búsqueda, que pueden bloquear,
+corren después en el threadpool.
+"""
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.cache import MISSING
+from app.crud import crud_product
+from app.crud.crud_product import _after_name_id, _cache_product, _id_key, _join_by_ids, _sku_key, _split_cached_ids, product_cache
+from app.models.product import Product
+from app.schemas.product import ProductCreate
+
+
+def _product_from_cache(data: Optional[Dict[str, Any]]) -> Optional[Product]:
+    """Reconstruir el producto cacheado como instancia desasociada (solo lectura)"""
+    if data is None:
+        return None
+    product = Product(**data)
+    make_transient_to_detached(product)
+    return product
+
+
+async def _sync_cache() -> None:
+    """
+    Aplicar las invalidaciones de otros procesos antes de leer la caché.
+
+    Leer el canal es una consulta SQLite bloqueante: se hace en el
+    threadpool y solo cuando toca (cada poll_seconds), no en el event loop.
+    """
+    if product_cache.sync_due():
+        await run_in_threadpool(product_cache.sync)
+
+
+async def _get_cached(db: AsyncSession, key: str, condition) -> Optional[Product]:
+    await _sync_cache()
+    cached = product_cache.get(key, sync=False)
+    if cached is not MISSING:
+        return _product_from_cache(cached)
+    product = (await db.execute(select(Product).where(condition))).scalars().first()
+    _cache_product(key, product)
+    return product
+
+
+async def get_product(db: AsyncSession, product_id: int) -> Optional[Product]:
+    return await _get_cached(db, _id_key(product_id), Product.id == product_id)
+
+
+async def get_product_by_sku(db: AsyncSession, sku: str) -> Optional[Product]:
+    return await _get_cached(db, _sku_key(sku), Product.sku == sku)
+
+
+async def get_products(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Product]:
+    result = await db.execute(select(Product).offset(skip).limit(limit))
+    return list(result.scalars())
+
+
+async def get_products_fingerprint(db: AsyncSession) -> Tuple[Tuple[int, int, Optional[int]], Optional[datetime]]:
+    """Versión del listado de productos y su última modificación, sin cargar filas"""
+    result = await db.execute(crud_product.products_fingerprint_query())
+    count, versions, max_id, last_modified = result.one()
+    return (count, versions, max_id), last_modified
+
+
+async def get_products_after(db: AsyncSession, after: Optional[Tuple[str, int]] = None, limit: int = 100) -> List[Product]:
+    """Página de productos ordenada por (name, id), a partir de la clave `after`"""
+    query = select(Product)
+    if after is not None:
+        query = query.where(_after_name_id(after))
+    result = await db.execute(query.order_by(Product.name, Product.id).limit(limit))
+    return list(result.scalars())
+
+
+async def get_products_by_ids(db: AsyncSession, product_ids: Iterable[int]) -> Tuple[List[Product], List[int]]:
+    """Varios productos por id con una sola consulta IN (ver crud_product.get_products_by_ids)"""
+    await _sync_cache()
+    ordered, cached, pending = _split_cached_ids(product_ids, sync=False)
+    found = {product_id: _product_from_cache(data) for product_id, data in cached.items()}
+    loaded = []
+    if pending:
+        loaded = list((await db.execute(select(Product).where(Product.id.in_(pending)))).scalars())
+    return _join_by_ids(ordered, found, pending, loaded)
+
+
+async def create_product(db: AsyncSession, product_in: ProductCreate) -> Product:
+    product = await db.run_sync(crud_product._insert_product, product_in)
+    # Caché (publicación en SQLite) e índice de búsqueda fuera del event loop
+    await run_in_threadpool(crud_product.product_written, product)
+    return product
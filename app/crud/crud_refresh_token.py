@@ -0,0 +1,90 @@
+# app/crud/crud_refresh_token.py
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_refresh_token, verify_token
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshTokenError(Exception):
+    """Refresh token inválido, caducado, revocado o reutilizado"""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def issue_refresh_token(db: Session, user_id: int, family: Optional[str] = None) -> str:
+    """
+    Emitir un refresh token y registrarlo. Sin `family` empieza una familia
+    nueva (un login); con ella continúa una rotación.
+    """
+    jti = str(uuid.uuid4())
+    family = family or str(uuid.uuid4())
+    expires_delta = timedelta(days=settings.refresh_token_expire_days)
+    db.add(RefreshToken(
+        jti=jti,
+        family=family,
+        user_id=user_id,
+        expires_at=_utcnow() + expires_delta,
+    ))
+    db.commit()
+    return create_refresh_token(str(user_id), expires_delta=expires_delta, jti=jti, family=family)
+
+
+def revoke_refresh_family(db: Session, family: str) -> int:
+    """Revocar todos los tokens de una familia (logout o reutilización detectada)"""
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family == family, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[int, str]:
+    """
+    Consumir un refresh token y emitir el siguiente de su familia.
+
+    El consumo es un único UPDATE condicionado a que el token no esté usado
+    ni revocado, así que de dos peticiones simultáneas con el mismo token
+    solo una gana. Si el token ya se había usado se trata como robado y se
+    revoca toda la familia.
+
+    Returns:
+        Tupla (user_id, nuevo refresh token)
+
+    Raises:
+        RefreshTokenError: Si el token no es válido o ya se usó
+    """
+    payload = verify_token(token, expected_type="refresh")
+    if not payload or "jti" not in payload:
+        raise RefreshTokenError("Refresh token inválido o expirado")
+    jti = payload["jti"]
+
+    consumed = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > _utcnow(),
+        )
+        .values(used_at=_utcnow())
+    ).rowcount
+    if not consumed:
+        db.rollback()
+        stored = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
+        if stored is not None and stored.used_at is not None:
+            revoke_refresh_family(db, stored.family)
+            raise RefreshTokenError("Refresh token reutilizado; sesión revocada")
+        raise RefreshTokenError("Refresh token inválido o expirado")
+
+    stored = db.query(RefreshToken).filter(RefreshToken.jti == jti).one()
+    return stored.user_id, issue_refresh_token(db, stored.user_id, family=stored.family)
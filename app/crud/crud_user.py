@@ -1,9 +1,30 @@
 # app/crud/crud_user.py
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.cache import MISSING, LRUTTLCache, invalidation_channel
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 
+# Caché del usuario autenticado por id, para no ir a la tabla users en cada
+# petición con token. Se invalida en cada escritura sobre el usuario.
+user_cache = LRUTTLCache(
+    "users",
+    maxsize=settings.user_cache_size,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    channel=invalidation_channel,
+    poll_seconds=settings.cache_invalidation_poll_seconds,
+)
+
+_USER_COLUMNS = [attr.key for attr in User.__mapper__.column_attrs]
+
+def _user_key(user_id: int):
+    return f"id:{user_id}"
+
+def invalidate_user_cache(user_id: int):
+    """Olvidar la copia cacheada de un usuario (también en otros workers)"""
+    user_cache.invalidate(_user_key(user_id))
+
 def get_user_by_email(db: Session, email: str):
     """Obtener usuario por email"""
     return db.query(User).filter(User.email == email).first()
@@ -16,10 +37,34 @@ def get_user(db: Session, user_id: int):
     """Obtener usuario por ID"""
     return db.query(User).filter(User.id == user_id).first()
 
+def get_user_cached(db: Session, user_id: int):
+    """
+    Obtener usuario por ID pasando por la caché.
+
+    Con acierto no hay SQL: la copia se incorpora a la sesión sin cargarla
+    de nuevo. Los usuarios inexistentes no se cachean.
+    """
+    cached = user_cache.get(_user_key(user_id))
+    if cached is not MISSING:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    user = get_user(db, user_id)
+    if user:
+        user_cache.set(_user_key(user_id), {column: getattr(user, column) for column in _USER_COLUMNS})
+    return user
+
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     """Obtener lista de usuarios con paginación"""
     return db.query(User).offset(skip).limit(limit).all()
 
+def get_users_after(db: Session, after_id: int = None, limit: int = 100):
+    """Obtener página de usuarios ordenada por id, a partir de `after_id`"""
+    query = db.query(User)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    return query.order_by(User.id).limit(limit).all()
+
 def create_user(db: Session, user_in: UserCreate, is_superuser: bool = False):
     """Crear nuevo usuario"""
     # Verificar si el email ya existe
@@ -76,6 +121,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
     
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
     db.refresh(user)
     return user
 
@@ -89,6 +135,8 @@ def delete_user(db: Session, user_id: int):
     user.is_active = False
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
+    db.refresh(user)
     return user
 
 def authenticate_user(db: Session, email: str, password: str):
@@ -112,6 +160,7 @@ def change_user_password(db: Session, user_id: int, old_password: str, new_passw
     user.hashed_password = get_password_hash(new_password)
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
     return True, "Contraseña cambiada exitosamente"
 
 def activate_user(db: Session, user_id: int):
@@ -122,6 +171,8 @@ def activate_user(db: Session, user_id: int):
     user.is_active = True
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
+    db.refresh(user)
     return user
 
 def deactivate_user(db: Session, user_id: int):
@@ -132,6 +183,8 @@ def deactivate_user(db: Session, user_id: int):
     user.is_active = False
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
+    db.refresh(user)
     return user
 
 def promote_to_superuser(db: Session, user_id: int):
@@ -142,6 +195,8 @@ def promote_to_superuser(db: Session, user_id: int):
     user.is_superuser = True
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
+    db.refresh(user)
     return user
 
 def demote_from_superuser(db: Session, user_id: int):
@@ -152,6 +207,8 @@ def demote_from_superuser(db: Session, user_id: int):
     user.is_superuser = False
     db.add(user)
     db.commit()
+    invalidate_user_cache(user_id)
+    db.refresh(user)
     return user
 
 def get_user_by_id(db: Session, user_id: int):
@@ -0,0 +1,106 @@
+# app/crud/inventory_buffer.py
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.flusher import PeriodicFlusher
+from app.crud.crud_inventory import apply_inventory_deltas, get_inventory_by_product
+from app.db.session import SessionLocal
+from app.models.inventory import Inventory
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryDeltaBuffer(PeriodicFlusher):
+    """
+    Buffer en proceso que acumula ajustes de inventario por producto.
+
+    En lugar de un UPDATE + commit por petición, los deltas de cada
+    product_id se suman en memoria y se escriben como un único UPDATE neto
+    cada `interval_ms` milisegundos o al llegar a `max_ops` ajustes.
+
+    Como se aplica el delta neto, el límite en cero se evalúa sobre la suma
+    y no ajuste a ajuste (p. ej. +5 y -10 sobre 0 dejan 0, no 0 y luego 5).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_ms: int = 50,
+        max_ops: int = 1000,
+    ):
+        super().__init__(interval_ms / 1000, name="inventory-delta-buffer")
+        self.session_factory = session_factory
+        self.max_ops = max_ops
+        self._deltas: Dict[int, int] = defaultdict(int)
+        self._ops = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(self, product_id: int, delta: int) -> None:
+        """Acumular un ajuste; se escribirá en el próximo flush"""
+        self.start()
+        with self._lock:
+            self._deltas[product_id] += delta
+            self._ops += 1
+            full = self._ops >= self.max_ops
+        if full:
+            self.request_flush()
+
+    def pending(self) -> int:
+        """Número de ajustes acumulados sin escribir"""
+        with self._lock:
+            return self._ops
+
+    def flush(self) -> int:
+        """
+        Escribir los deltas acumulados.
+
+        Los flush se serializan: cuando flush() retorna, todo ajuste añadido
+        antes de la llamada ya está en la base de datos.
+
+        Returns:
+            Número de productos escritos
+        """
+        with self._flush_lock:
+            with self._lock:
+                deltas = {pid: delta for pid, delta in self._deltas.items() if delta}
+                ops = self._ops
+                self._deltas = defaultdict(int)
+                self._ops = 0
+            if not deltas:
+                return 0
+
+            db = self.session_factory()
+            try:
+                applied = apply_inventory_deltas(db, deltas)
+            except Exception:
+                db.rollback()
+                # Devolver los deltas al buffer para reintentarlos
+                with self._lock:
+                    for pid, delta in deltas.items():
+                        self._deltas[pid] += delta
+                    self._ops += ops
+                raise
+            finally:
+                db.close()
+
+        dropped = set(deltas) - set(applied)
+        if dropped:
+            logger.warning("Ajustes descartados para productos inexistentes: %s", sorted(dropped))
+        return len(applied)
+
+    def flush_and_read(self, db: Session, product_id: int) -> Optional[Inventory]:
+        """Forzar un flush y leer la cantidad resultante del producto"""
+        self.flush()
+        return get_inventory_by_product(db, product_id)
+
+
+inventory_buffer = InventoryDeltaBuffer(
+    interval_ms=settings.inventory_coalesce_interval_ms,
+    max_ops=settings.inventory_coalesce_max_ops,
+)
@@ -0,0 +1,182 @@
+# app/crud/inventory_ledger.py
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.flusher import PeriodicFlusher
+from app.db.session import SessionLocal
+from app.models.inventory import Inventory
+from app.models.inventory_movement import InventoryMovement, InventorySnapshot
+
+movements_table = InventoryMovement.__table__
+snapshots_table = InventorySnapshot.__table__
+
+
+# (product_id, tipo, delta, cantidad resultante)
+Movement = Tuple[int, str, Optional[int], int]
+
+
+def record_movements(db: Session, movements: Iterable[Movement]) -> None:
+    """
+    Añadir movimientos al libro dentro de la transacción en curso de `db`.
+
+    Se llama antes del commit del cambio de inventario: el movimiento se
+    confirma (o se pierde) junto con él y, como la fila de inventario sigue
+    bloqueada, el id de los movimientos de un producto sigue el orden real
+    de sus cambios. Todos se escriben con un único executemany.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"product_id": product_id, "kind": kind, "delta": delta, "quantity_after": quantity_after, "created_at": now}
+        for product_id, kind, delta, quantity_after in movements
+    ]
+    if rows:
+        db.execute(insert(movements_table), rows)
+
+
+def _as_utc(at: datetime) -> datetime:
+    """Los instantes se guardan en UTC sin zona: convertir los que traen zona"""
+    if at.tzinfo is not None:
+        return at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at
+
+
+class SnapshotScheduler(PeriodicFlusher):
+    """
+    Escribe una foto del inventario cada `interval_minutes` y después
+    compacta el libro conservando las `keep_snapshots` fotos más recientes
+    (0 = no compactar).
+    """
+
+    flush_on_stop = False
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_minutes: int = 0,
+        keep_snapshots: int = 0,
+    ):
+        super().__init__(interval_minutes * 60, name="inventory-snapshot-scheduler")
+        self.session_factory = session_factory
+        self.keep_snapshots = keep_snapshots
+
+    def flush(self) -> int:
+        db = self.session_factory()
+        try:
+            _, count = create_inventory_snapshot(db)
+            if self.keep_snapshots > 0:
+                compact_inventory_ledger(db, self.keep_snapshots)
+            return count
+        finally:
+            db.close()
+
+
+snapshot_scheduler = SnapshotScheduler(
+    interval_minutes=settings.inventory_snapshot_interval_minutes,
+    keep_snapshots=settings.inventory_ledger_keep_snapshots,
+)
+
+
+def create_inventory_snapshot(db: Session) -> Tuple[datetime, int]:
+    """
+    Copiar la cantidad actual de todos los productos a inventory_snapshots.
+
+    Returns:
+        Tupla (momento de la foto, número de filas)
+    """
+    snapshot_at = datetime.utcnow()
+    result = db.execute(
+        insert(snapshots_table).from_select(
+            ["snapshot_at", "product_id", "quantity"],
+            select(literal(snapshot_at, type_=snapshots_table.c.snapshot_at.type), Inventory.product_id, Inventory.quantity),
+        )
+    )
+    db.commit()
+    return snapshot_at, result.rowcount
+
+
+def get_stock_at(db: Session, product_id: int, at: datetime) -> Optional[int]:
+    """
+    Cantidad de un producto en el instante `at` (UTC si no trae zona).
+
+    Cada movimiento guarda la cantidad resultante, así que basta con el
+    último movimiento anterior a `at` (el de mayor id: los ids siguen el
+    orden de los cambios); si no lo hay se usa la última foto.
+    Devuelve None si no hay historial para ese instante.
+    """
+    at = _as_utc(at)
+    quantity = db.execute(
+        select(InventoryMovement.quantity_after)
+        .where(InventoryMovement.product_id == product_id, InventoryMovement.created_at <= at)
+        .order_by(InventoryMovement.id.desc())
+        .limit(1)
+    ).scalar()
+    if quantity is not None:
+        return quantity
+    return db.execute(
+        select(InventorySnapshot.quantity)
+        .where(InventorySnapshot.product_id == product_id, InventorySnapshot.snapshot_at <= at)
+        .order_by(InventorySnapshot.snapshot_at.desc())
+        .limit(1)
+    ).scalar()
+
+
+def get_stock_levels_at(db: Session, at: datetime) -> Dict[int, int]:
+    """
+    Cantidad de todos los productos en el instante `at` (UTC si no trae zona).
+
+    Se parte de la última foto anterior a `at` y se aplica solo la cola de
+    movimientos entre la foto y `at`, no el historial completo.
+    """
+    at = _as_utc(at)
+    snapshot_at = db.execute(
+        select(func.max(InventorySnapshot.snapshot_at)).where(InventorySnapshot.snapshot_at <= at)
+    ).scalar()
+
+    levels: Dict[int, int] = {}
+    movements = select(InventoryMovement.product_id, InventoryMovement.quantity_after).where(
+        InventoryMovement.created_at <= at
+    )
+    if snapshot_at is not None:
+        levels.update(
+            db.execute(
+                select(InventorySnapshot.product_id, InventorySnapshot.quantity)
+                .where(InventorySnapshot.snapshot_at == snapshot_at)
+            ).all()
+        )
+        movements = movements.where(InventoryMovement.created_at > snapshot_at)
+
+    for product_id, quantity_after in db.execute(
+        movements.order_by(InventoryMovement.id)
+    ):
+        levels[product_id] = quantity_after
+    return levels
+
+
+def compact_inventory_ledger(db: Session, keep_snapshots: int = 2) -> int:
+    """
+    Borrar fotos y movimientos anteriores a las `keep_snapshots` fotos más recientes.
+
+    Las consultas "stock a fecha" siguen funcionando para cualquier instante
+    posterior a la foto más antigua conservada.
+
+    Returns:
+        Número de movimientos borrados
+    """
+    kept = db.execute(
+        select(InventorySnapshot.snapshot_at)
+        .group_by(InventorySnapshot.snapshot_at)
+        .order_by(InventorySnapshot.snapshot_at.desc())
+        .limit(keep_snapshots)
+    ).scalars().all()
+    if len(kept) < keep_snapshots:
+        return 0
+
+    oldest_kept = kept[-1]
+    db.execute(delete(snapshots_table).where(snapshots_table.c.snapshot_at < oldest_kept))
+    result = db.execute(delete(movements_table).where(movements_table.c.created_at <= oldest_kept))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,93 @@
+# app/crud/low_stock.py
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.inventory import Inventory
+
+
+class LowStockIndex:
+    """
+    Conjunto en proceso de productos con stock bajo.
+
+    Se carga una vez desde la base de datos (usando el índice sobre
+    quantity) y después se mantiene de forma incremental con cada escritura
+    de crud_inventory, así que consultarlo cuesta O(resultado).
+
+    Cada producto usa su propio umbral (Inventory.low_stock_threshold) o el
+    umbral por defecto. Para no divergir de lo que escriben otros procesos,
+    el conjunto se recarga cada `refresh_seconds`.
+    """
+
+    def __init__(self, default_threshold: int = 10, refresh_seconds: float = 300):
+        self.default_threshold = default_threshold
+        self.refresh_seconds = refresh_seconds
+        # product_id -> (quantity, threshold)
+        self._items: Dict[int, Tuple[int, int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _threshold(self, threshold: Optional[int]) -> int:
+        return self.default_threshold if threshold is None else threshold
+
+    def update(self, product_id: int, quantity: int, threshold: Optional[int] = None) -> None:
+        """Registrar la cantidad actual de un producto tras una escritura"""
+        threshold = self._threshold(threshold)
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if quantity <= threshold:
+                self._items[product_id] = (quantity, threshold)
+            else:
+                self._items.pop(product_id, None)
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            self._items.pop(product_id, None)
+
+    def invalidate(self) -> None:
+        """Forzar una recarga completa en la próxima consulta"""
+        with self._lock:
+            self._loaded_at = None
+            self._items = {}
+
+    def reload(self, db: Session) -> None:
+        """Cargar el conjunto desde la base de datos"""
+        max_threshold = db.execute(select(func.max(Inventory.low_stock_threshold))).scalar()
+        upper = max(self.default_threshold, max_threshold or 0)
+        rows = db.execute(
+            select(Inventory.product_id, Inventory.quantity, Inventory.low_stock_threshold)
+            .where(Inventory.quantity <= upper)
+        ).all()
+
+        items = {}
+        for product_id, quantity, threshold in rows:
+            threshold = self._threshold(threshold)
+            if quantity <= threshold:
+                items[product_id] = (quantity, threshold)
+        with self._lock:
+            self._items = items
+            self._loaded_at = time.monotonic()
+
+    def items(self, db: Session) -> List[Tuple[int, int, int]]:
+        """
+        Productos con stock bajo como (product_id, quantity, threshold),
+        ordenados de menor a mayor cantidad.
+        """
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            self.reload(db)
+        with self._lock:
+            items = [(pid, qty, threshold) for pid, (qty, threshold) in self._items.items()]
+        items.sort(key=lambda item: (item[1], item[0]))
+        return items
+
+
+low_stock_index = LowStockIndex(
+    default_threshold=settings.low_stock_default_threshold,
+    refresh_seconds=settings.low_stock_refresh_seconds,
+)
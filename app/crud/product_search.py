@@ -0,0 +1,287 @@
+# app/crud/product_search.py
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+
+# Máximo de candidatos que aporta cada fuente (prefijo de SKU, de nombre,
+# tokens) antes de ordenar; acota el coste de búsquedas muy genéricas.
+MAX_CANDIDATES = 1000
+# Máximo de palabras del vocabulario que se expanden para el último término
+MAX_PREFIX_EXPANSION = 200
+
+SCORE_SKU_EXACT = 100
+SCORE_SKU_PREFIX = 50
+SCORE_NAME_PREFIX = 40
+SCORE_NAME_TOKENS = 20
+SCORE_DESCRIPTION_TOKENS = 10
+
+_TOKEN_RE = re.compile(r"\w+")
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Minúsculas y sin tildes, para comparar 'Cafe' con 'café'"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _prefix_range(sorted_keys: List[Tuple[str, int]], prefix: str, cap: int) -> List[Tuple[str, int]]:
+    start = bisect.bisect_left(sorted_keys, (prefix, -1))
+    found = []
+    for key in sorted_keys[start:start + cap]:
+        if not key[0].startswith(prefix):
+            break
+        found.append(key)
+    return found
+
+
+def _starts_words(name_key: str, word_starts: List[str]) -> bool:
+    """True si cada término (precedido de espacio) empieza alguna palabra del nombre"""
+    padded = " " + _NON_WORD_RE.sub(" ", name_key)
+    return all(word_start in padded for word_start in word_starts)
+
+
+def _rank(scores: Dict[int, int], names: Dict[int, str]) -> List[int]:
+    return sorted(scores, key=lambda pid: (-scores[pid], names.get(pid, ""), pid))
+
+
+class ProductSearchIndex:
+    """
+    Índice de búsqueda en proceso sobre SKU, nombre y descripción.
+
+    - Prefijo de SKU y de nombre: listas ordenadas + bisect, O(log n + k).
+    - Palabras de nombre y descripción: índice invertido token -> ids; el
+      último término de la consulta se trata como prefijo (type-ahead).
+
+    Se carga desde la base de datos en la primera búsqueda y después se
+    mantiene con add/remove desde crud_product. Se recarga cada
+    `refresh_seconds` para recoger cambios hechos por otros procesos.
+    """
+
+    def __init__(self, refresh_seconds: float = 600):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # product_id -> (sku, nombre, tokens del nombre, tokens de la descripción)
+        self._docs: Dict[int, Tuple[str, str, Set[str], Set[str]]] = {}
+        self._skus: List[Tuple[str, int]] = []
+        self._names: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self, db: Session) -> None:
+        """(Re)construir el índice completo desde la base de datos"""
+        rows = db.execute(
+            select(Product.id, Product.sku, Product.name, Product.description)
+            .execution_options(yield_per=10000)
+        )
+        with self._lock:
+            self._reset()
+            for product_id, sku, name, description in rows:
+                self._add(product_id, sku, name, description, bulk=True)
+            self._skus.sort()
+            self._names.sort()
+            self._vocabulary = sorted(self._postings)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, product_id: int, sku: str, name: str, description: Optional[str], bulk: bool = False) -> None:
+        sku_key, name_key = normalize(sku), normalize(name)
+        name_tokens, description_tokens = set(tokenize(name)), set(tokenize(description))
+        self._docs[product_id] = (sku_key, name_key, name_tokens, description_tokens)
+        for token in name_tokens | description_tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                if not bulk:
+                    bisect.insort(self._vocabulary, token)
+            postings.add(product_id)
+        if bulk:
+            self._skus.append((sku_key, product_id))
+            self._names.append((name_key, product_id))
+        else:
+            bisect.insort(self._skus, (sku_key, product_id))
+            bisect.insort(self._names, (name_key, product_id))
+
+    def add(self, product_id: int, sku: str, name: str, description: Optional[str]) -> None:
+        """Añadir o reemplazar un producto (no hace nada si el índice no está cargado)"""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._remove(product_id)
+            self._add(product_id, sku, name, description)
+
+    def _remove(self, product_id: int) -> None:
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        sku_key, name_key, name_tokens, description_tokens = doc
+        for sorted_keys, key in ((self._skus, sku_key), (self._names, name_key)):
+            position = bisect.bisect_left(sorted_keys, (key, product_id))
+            if position < len(sorted_keys) and sorted_keys[position] == (key, product_id):
+                del sorted_keys[position]
+        # Los tokens sin productos se quedan en el vocabulario; no molestan
+        for token in name_tokens | description_tokens:
+            self._postings.get(token, set()).discard(product_id)
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            if self.loaded:
+                self._remove(product_id)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            self.load(db)
+
+    def _token_matches(self, terms: List[str], cap: int) -> Set[int]:
+        """
+        Productos que contienen todos los términos (el último como prefijo).
+
+        Se recorre el conjunto más pequeño comprobando pertenencia en los
+        demás y se corta al llegar a `cap` coincidencias, así que el coste no
+        depende de lo frecuentes que sean las palabras.
+        """
+        *exact_terms, last = terms
+        exact_sets = [self._postings.get(term, set()) for term in exact_terms]
+        start = bisect.bisect_left(self._vocabulary, last)
+        prefix_sets = []
+        for token in self._vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(last):
+                break
+            prefix_sets.append(self._postings[token])
+        # Ninguna palabra empieza por el último término: nada puede coincidir
+        if not prefix_sets:
+            return set()
+
+        if exact_sets:
+            exact_sets.sort(key=len)
+            smallest, others = exact_sets[0], exact_sets[1:]
+            candidates: Iterable[int] = smallest
+        else:
+            others = []
+            candidates = (pid for postings in prefix_sets for pid in postings)
+            prefix_sets = []
+
+        result: Set[int] = set()
+        for product_id in candidates:
+            if product_id in result:
+                continue
+            if all(product_id in other for other in others) and (
+                not prefix_sets or any(product_id in postings for postings in prefix_sets)
+            ):
+                result.add(product_id)
+                if len(result) >= cap:
+                    break
+        return result
+
+    def search(self, db: Session, q: str) -> List[int]:
+        """Ids de productos que coinciden con `q`, ordenados por relevancia"""
+        self._ensure_loaded(db)
+        query, terms = normalize(q).strip(), tokenize(q)
+        if not query:
+            return []
+
+        with self._lock:
+            scores: Dict[int, int] = {}
+            for sku_key, product_id in _prefix_range(self._skus, query, MAX_CANDIDATES):
+                scores[product_id] = SCORE_SKU_EXACT if sku_key == query else SCORE_SKU_PREFIX
+            for _, product_id in _prefix_range(self._names, query, MAX_CANDIDATES):
+                scores[product_id] = max(scores.get(product_id, 0), SCORE_NAME_PREFIX)
+            if terms:
+                word_starts = [" " + term for term in terms]
+                for product_id in self._token_matches(terms, MAX_CANDIDATES):
+                    if product_id in scores:
+                        continue
+                    score = SCORE_DESCRIPTION_TOKENS
+                    if _starts_words(self._docs[product_id][1], word_starts):
+                        score = SCORE_NAME_TOKENS
+                    scores[product_id] = score
+            names = {product_id: self._docs[product_id][1] for product_id in scores}
+        return _rank(scores, names)
+
+
+def _boolean_query(terms: Iterable[str]) -> str:
+    """'caf verde' -> '+caf* +verde*' para MATCH ... IN BOOLEAN MODE"""
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def search_fulltext(db: Session, q: str) -> List[int]:
+    """
+    Búsqueda con el índice FULLTEXT de MySQL.
+
+    Cada fuente usa su índice (LIKE 'q%' sobre sku y name, MATCH sobre
+    name+description) y el ranking se combina igual que en memoria.
+    """
+    query = q.strip()
+    if not query:
+        return []
+    scores: Dict[int, int] = {}
+    names: Dict[int, str] = {}
+
+    for product_id, sku, name in db.execute(
+        select(Product.id, Product.sku, Product.name)
+        .where(Product.sku.startswith(query, autoescape=True))
+        .limit(MAX_CANDIDATES)
+    ):
+        scores[product_id] = SCORE_SKU_EXACT if sku.lower() == query.lower() else SCORE_SKU_PREFIX
+        names[product_id] = normalize(name)
+    for product_id, name in db.execute(
+        select(Product.id, Product.name)
+        .where(Product.name.startswith(query, autoescape=True))
+        .limit(MAX_CANDIDATES)
+    ):
+        scores[product_id] = max(scores.get(product_id, 0), SCORE_NAME_PREFIX)
+        names[product_id] = normalize(name)
+
+    terms = tokenize(q)
+    if terms:
+        word_starts = [" " + term for term in terms]
+        relevance = match(Product.name, Product.description, against=_boolean_query(terms)).in_boolean_mode()
+        for product_id, name in db.execute(
+            select(Product.id, Product.name)
+            .where(relevance)
+            .order_by(relevance.desc())
+            .limit(MAX_CANDIDATES)
+        ):
+            score = SCORE_DESCRIPTION_TOKENS
+            if _starts_words(normalize(name), word_starts):
+                score = SCORE_NAME_TOKENS
+            scores[product_id] = max(scores.get(product_id, 0), score)
+            names[product_id] = normalize(name)
+    return _rank(scores, names)
+
+
+product_search_index = ProductSearchIndex(refresh_seconds=settings.product_search_refresh_seconds)
+
+
+def search_product_ids(db: Session, q: str) -> List[int]:
+    """Ids que coinciden con `q` por relevancia, con el backend configurado"""
+    backend = settings.product_search_backend
+    if backend == "auto":
+        backend = "fulltext" if db.get_bind().dialect.name == "mysql" else "memory"
+    if backend == "fulltext":
+        return search_fulltext(db, q)
+    return product_search_index.search(db, q)
@@ -0,0 +1,101 @@
+# app/db/pool.py
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Histogram
+
+# Límites (segundos) del histograma de espera al pedir una conexión
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Contadores de un pool: esperas al pedir conexión y timeouts"""
+
+    def __init__(self):
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        self.wait_seconds.observe(waited)
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+
+class _InstrumentedPoolMixin:
+    """Mide cuánto tarda cada connect() del pool y cuenta los timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start, timed_out=False)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() sustituye el pool: se conservan los contadores
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeout": self.timeout(),
+            "checkouts": self.metrics.checkouts,
+            "timeouts": self.metrics.timeouts,
+            "wait_seconds": self.metrics.wait_seconds.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def ping_idle_connections(engine, idle_seconds: float) -> None:
+    """
+    Hacer pre-ping solo a las conexiones que llevan más de `idle_seconds`
+    devueltas al pool.
+
+    Las que acaban de usarse se entregan sin ida y vuelta extra; si el ping
+    falla, el pool descarta la conexión y abre otra.
+    """
+    @event.listens_for(engine, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+        finally:
+            cursor.close()
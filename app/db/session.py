@@ -1,19 +1,147 @@
+import logging
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, ping_idle_connections
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
+# Driver asíncrono equivalente a cada driver síncrono soportado
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+def _engine_options(url: str, poolclass) -> dict:
+    """
+    Opciones de pool según Settings.
+
+    SQLite en memoria usa su propio pool de una conexión y no admite tamaño
+    ni timeout, así que ahí se deja el de por defecto.
+    """
+    if settings.db_pool_pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(f"db_pool_pre_ping debe ser uno de {PRE_PING_STRATEGIES}")
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def _configure_pre_ping(sync_engine) -> None:
+    if settings.db_pool_pre_ping == "idle":
+        ping_idle_connections(sync_engine, settings.db_pool_pre_ping_idle_seconds)
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, InstrumentedQueuePool))
+_configure_pre_ping(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """
+    Convertir la URL síncrona en la de su driver asíncrono
+    (mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite).
+
+    Raises:
+        ValueError: Si el motor no tiene driver asíncrono configurado
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"Sin driver asíncrono para {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async_enabled:
+    ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **_engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool)
+    )
+    _configure_pre_ping(async_engine.sync_engine)
+    # Sin expire_on_commit: tras el commit los objetos se serializan sin volver a la BD
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def pool_stats() -> dict:
+    """Estado y contadores de los pools de conexiones activos"""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.pool if async_engine else None)):
+        if pool is not None and hasattr(pool, "stats"):
+            stats[name] = pool.stats()
+    return stats
+
+
+def _warmup_count(pool, connections: int) -> int:
+    # Nunca más conexiones de las que el pool conserva
+    size = getattr(pool, "size", None)
+    size = size() if callable(size) else 1
+    return max(0, min(connections, size))
+
+
+def warm_pool(connections: int) -> int:
+    """
+    Abrir `connections` conexiones del motor síncrono y devolverlas al pool,
+    para que las primeras peticiones no paguen el connect.
+
+    Un fallo se registra y no se propaga: el arranque no depende de que la
+    BD responda. Devuelve las conexiones abiertas.
+    """
+    opened = []
+    try:
+        for _ in range(_warmup_count(engine.pool, connections)):
+            opened.append(engine.connect())
+    except SQLAlchemyError:
+        logger.warning("No se pudo calentar el pool de conexiones", exc_info=True)
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+async def warm_async_pool(connections: int) -> int:
+    """Como warm_pool, para el motor asíncrono (si está activo)"""
+    if async_engine is None:
+        return 0
+    opened = []
+    try:
+        for _ in range(_warmup_count(async_engine.pool, connections)):
+            opened.append(await async_engine.connect())
+    except SQLAlchemyError:
+        logger.warning("No se pudo calentar el pool de conexiones asíncrono", exc_info=True)
+    finally:
+        for conn in opened:
+            await conn.close()
+    return len(opened)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
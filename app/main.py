@@ -1,12 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.db.base import Base
-from app.db.session import engine
-from app.api.api_v1.endpoints import auth, users, products, inventory
+from app.db.session import async_engine, engine, warm_async_pool, warm_pool
+from app.api.api_v1.endpoints import auth, users, products, inventory, stock, export, imports, metrics, products_async, inventory_async
+from app.crud.inventory_buffer import inventory_buffer
+from app.crud.inventory_ledger import snapshot_scheduler
+from app.core.config import settings
+from app.core.middleware import MetricsMiddleware, RequestContextMiddleware
+from app.core.security import PasswordHasherBusy
 import os
 
-app = FastAPI(title="Inventory API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranque y parada de la aplicación.
+
+    Importar el módulo no toca la BD: el esquema lo crea Alembic
+    (`alembic upgrade head`) y aquí solo se calienta el pool y se arrancan
+    los procesos periódicos.
+    """
+    if settings.db_create_all_on_startup:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    await run_in_threadpool(warm_pool, settings.db_pool_warmup_connections)
+    await warm_async_pool(settings.db_pool_warmup_connections)
+    if settings.inventory_snapshot_interval_minutes > 0:
+        snapshot_scheduler.start()
+    yield
+    # Escribir los ajustes de inventario pendientes antes de apagar
+    inventory_buffer.stop()
+    snapshot_scheduler.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+app = FastAPI(title="Inventory API", lifespan=lifespan)
 
 # Configuración CORS MEJORADA
 origins = [
@@ -16,14 +49,18 @@ origins = [
     "https://frontinventory.adsodigital.sbs",    # Tu dominio en producción
 ]
 
-# Si estás en desarrollo, permite también el puerto actual
+# En desarrollo se acepta además cualquier puerto de localhost
+origin_regex = None
 if os.getenv("ENVIRONMENT") == "development":
-    origins.append("http://localhost:*")
-    origins.append("http://127.0.0.1:*")
+    origin_regex = r"http://(localhost|127\.0\.0\.1)(:\d+)?"
 
+# Middleware ASGI puro: CORS responde los preflight sin pasar por el router.
+# El último añadido es el más externo: RequestContextMiddleware envuelve todo,
+# incluidas las respuestas a preflight.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    allow_origin_regex=origin_regex,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=[
@@ -32,6 +69,7 @@ app.add_middleware(
         "Accept",
         "Origin",
         "X-Requested-With",
+        "X-Request-ID",
         "Access-Control-Allow-Headers",
         "Access-Control-Request-Method",
         "Access-Control-Request-Headers",
@@ -39,47 +77,36 @@ app.add_middleware(
     expose_headers=["*"],
     max_age=600,  # 10 minutos para cache de preflight
 )
+app.add_middleware(RequestContextMiddleware)
+if settings.metrics_enabled:
+    # El más externo: la duración incluye CORS y el resto de middleware
+    app.add_middleware(MetricsMiddleware)
 
-# IMPORTANTE: Para depuración, agrega middleware personalizado
-@app.middleware("http")
-async def add_cors_debug_headers(request: Request, call_next):
-    response = await call_next(request)
-    
-    # Agregar headers CORS explícitos para debug
-    origin = request.headers.get("origin")
-    if origin and origin in origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-    
-    # Debug en consola
-    if request.method == "OPTIONS":
-        print(f"🔧 Preflight request from: {origin}")
-    
-    return response
-
-# crea tablas si no existen (útil en dev)
-Base.metadata.create_all(bind=engine)
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Login/registro en plena avalancha: 503 inmediato en lugar de encolar sin límite"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servicio de autenticación saturado, vuelve a intentarlo"},
+        headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+    )
 
 @app.get("/")
 def root():
     return {"message": "Inventory API - FastAPI"}
 
-# Endpoint para probar CORS
-@app.options("/{full_path:path}")
-async def options_handler(full_path: str, request: Request):
-    """Manejador explícito para OPTIONS requests"""
-    return JSONResponse(
-        content={"message": "CORS preflight"},
-        headers={
-            "Access-Control-Allow-Origin": request.headers.get("origin", "*"),
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "Authorization, Content-Type, Accept, Origin, X-Requested-With",
-            "Access-Control-Max-Age": "600",
-        }
-    )
-
 # registrar routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
+if settings.db_async_enabled:
+    # Las versiones async van primero: atienden las rutas que comparten con las síncronas
+    app.include_router(products_async.router, prefix="/api/v1")
+    app.include_router(inventory_async.router, prefix="/api/v1")
 app.include_router(products.router, prefix="/api/v1")
-app.include_router(inventory.router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(inventory.router, prefix="/api/v1")
+app.include_router(stock.router, prefix="/api/v1")
+app.include_router(export.router, prefix="/api/v1")
+app.include_router(imports.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
+if settings.metrics_enabled:
+    app.include_router(metrics.prometheus_router)
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/inventory.py
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy import func
 from app.db.base import Base
@@ -9,8 +9,14 @@ class Inventory(Base):
     __tablename__ = "inventory"
 
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    quantity = Column(Integer, nullable=False, default=0)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, unique=True, index=True)
+    quantity = Column(Integer, nullable=False, default=0, index=True)
+    # Umbral de stock bajo propio del producto (NULL = umbral por defecto)
+    low_stock_threshold = Column(Integer, nullable=True, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+    # Contador de cambios de la fila: cualquier UPDATE (ORM o Core) lo
+    # incrementa. updated_at solo tiene resolución de segundos y no basta
+    # para el ETag del listado.
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1)
 
     product = relationship("Product", backref="inventory_items")
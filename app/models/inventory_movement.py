@@ -0,0 +1,36 @@
+# app/models/inventory_movement.py
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base import Base
+
+
+class InventoryMovement(Base):
+    """Movimiento del libro de inventario (solo se añaden filas)"""
+    __tablename__ = "inventory_movements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Sin FK: el historial se conserva aunque se borre el producto
+    product_id = Column(Integer, nullable=False)
+    kind = Column(String(20), nullable=False)  # adjust | set | delete
+    delta = Column(Integer, nullable=True)
+    quantity_after = Column(Integer, nullable=False)
+    # Momento del cambio (UTC); el orden entre movimientos lo da el id
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_inventory_movements_product_created", "product_id", "created_at"),
+    )
+
+
+class InventorySnapshot(Base):
+    """Foto de la cantidad de cada producto en un instante"""
+    __tablename__ = "inventory_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_at = Column(DateTime(timezone=True), nullable=False)
+    product_id = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_inventory_snapshots_at_product", "snapshot_at", "product_id"),
+        Index("ix_inventory_snapshots_product_at", "product_id", "snapshot_at"),
+    )
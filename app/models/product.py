@@ -1,5 +1,5 @@
 # app/models/product.py
-from sqlalchemy import Column, Integer, String, Float, Text
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Index, func
 from app.db.base import Base
 
 
@@ -11,3 +11,13 @@ class Product(Base):
     description = Column(Text, nullable=True)
     sku = Column(String(100), unique=True, index=True, nullable=False)
     price = Column(Float, nullable=False, default=0.0)
+    # Se incrementa en cada UPDATE (bloqueo optimista); base del ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Búsqueda por palabras; solo MySQL (en otros motores se usa el índice en memoria)
+        Index("ix_products_fulltext", "name", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
@@ -0,0 +1,21 @@
+# app/models/refresh_token.py
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, func
+from app.db.base import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh token emitido. Cada uso lo rota por uno nuevo de la misma
+    familia; si uno ya usado vuelve a presentarse, se revoca la familia.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(36), unique=True, index=True, nullable=False)
+    # Todos los tokens que descienden del mismo login comparten familia
+    family = Column(String(36), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked = Column(Boolean(), nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
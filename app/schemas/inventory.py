@@ -1,6 +1,6 @@
 # app/schemas/inventory.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -13,6 +13,24 @@ class InventoryUpdate(BaseModel):
     quantity: int = Field(..., description="Cantidad a ajustar (positiva para agregar, negativa para restar)")
 
 
+class InventoryAdjustItem(InventoryUpdate):
+    product_id: int = Field(..., gt=0, description="ID del producto")
+
+
+class InventoryBatchAdjust(BaseModel):
+    """Esquema para ajustar varios productos en una sola petición"""
+    items: List[InventoryAdjustItem] = Field(..., min_length=1, description="Ajustes a aplicar, en orden")
+
+
+class InventoryBulkUpsert(BaseModel):
+    """Esquema para fijar la cantidad de muchos productos a la vez"""
+    items: List[InventoryBase] = Field(..., min_length=1, description="Pares producto/cantidad")
+
+
+class InventoryThresholdUpdate(BaseModel):
+    low_stock_threshold: Optional[int] = Field(None, ge=0, description="Umbral de stock bajo (null = umbral por defecto)")
+
+
 class InventoryCreate(InventoryBase):
     """Esquema para crear inventario"""
     pass
@@ -20,6 +38,7 @@ class InventoryCreate(InventoryBase):
 
 class InventoryOut(InventoryBase):
     id: int
+    low_stock_threshold: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -27,6 +46,44 @@ class InventoryOut(InventoryBase):
         orm_mode = True
 
 
+class InventoryPage(BaseModel):
+    """Página de inventario con cursor para pedir la siguiente"""
+    items: List[InventoryOut]
+    next_cursor: Optional[str] = None
+
+
+class InventoryBatch(BaseModel):
+    """Inventario en el orden pedido y los productos sin inventario"""
+    items: List[InventoryOut]
+    missing: List[int]
+
+
+class StockItem(BaseModel):
+    """Producto con su cantidad en inventario (0 si no tiene fila)"""
+    id: int
+    sku: str
+    name: str
+    description: Optional[str] = None
+    price: float
+    quantity: int
+
+    class Config:
+        orm_mode = True
+
+
+class StockPage(BaseModel):
+    """Página de la vista de stock con cursor para pedir la siguiente"""
+    items: List[StockItem]
+    next_cursor: Optional[str] = None
+
+
+class LowStockItem(BaseModel):
+    """Producto por debajo de su umbral de stock"""
+    product_id: int
+    quantity: int
+    threshold: int
+
+
 class InventoryResponse(BaseModel):
     """Respuesta estándar para operaciones de inventario"""
     success: bool
@@ -48,4 +105,21 @@ class InventoryAdjustResponse(BaseModel):
     previous_quantity: int
     new_quantity: int
     adjustment: int
-    product_id: int
\ No newline at end of file
+    product_id: int
+
+class InventoryBulkResponse(BaseModel):
+    """Respuesta para operaciones masivas de inventario"""
+    success: bool
+    count: int
+
+
+class StockLevel(BaseModel):
+    """Cantidad de un producto en un instante dado"""
+    product_id: int
+    quantity: int
+
+
+class InventorySnapshotResponse(BaseModel):
+    """Resultado de escribir una foto del inventario"""
+    snapshot_at: datetime
+    count: int
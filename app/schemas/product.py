@@ -1,6 +1,6 @@
 # app/schemas/product.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 class ProductBase(BaseModel):
@@ -14,8 +14,49 @@ class ProductCreate(ProductBase):
     pass
 
 
+class ProductImportRow(ProductCreate):
+    """Fila de importación: producto y, opcionalmente, su stock inicial"""
+    quantity: Optional[int] = Field(None, ge=0)
+
+
 class ProductOut(ProductBase):
     id: int
 
     class Config:
         orm_mode = True
+
+
+class ProductPage(BaseModel):
+    """Página de productos con cursor para pedir la siguiente"""
+    items: List[ProductOut]
+    next_cursor: Optional[str] = None
+
+
+class ProductBatchRequest(BaseModel):
+    """Ids de productos a obtener en una sola consulta"""
+    ids: List[int] = Field(..., min_length=1)
+
+
+class ProductBatch(BaseModel):
+    """Productos en el orden pedido y los ids que no existen"""
+    items: List[ProductOut]
+    missing: List[int]
+
+
+class ProductSearchPage(BaseModel):
+    """Resultados de búsqueda ordenados por relevancia"""
+    items: List[ProductOut]
+    total: int
+
+
+class ProductImportError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+
+class ProductImportReport(BaseModel):
+    """Resultado de una importación masiva"""
+    total: int
+    created: int
+    errors: List[ProductImportError]
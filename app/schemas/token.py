@@ -1,7 +1,9 @@
 # app/schemas/token.py
 from pydantic import BaseModel
+from typing import Optional
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
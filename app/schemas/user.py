@@ -106,6 +106,11 @@ class UsersListResponse(BaseModel):
     count: int
     users: list[UserOut]
 
+class UserPage(BaseModel):
+    """Página de usuarios con cursor para pedir la siguiente"""
+    items: list[UserOut]
+    next_cursor: Optional[str] = None
+
 class UserLoginResponse(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,40 @@
+# benchmarks/compare.py
+"""
+Comparar dos resultados de benchmarks.run escenario a escenario.
+
+    python -m benchmarks.compare benchmarks/results/antes.json benchmarks/results/despues.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+METRICS = ("req_per_s", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args()
+    before = json.loads(args.before.read_text())["results"]
+    after = json.loads(args.after.read_text())["results"]
+
+    print(f"{'escenario':32} " + " ".join(f"{metric:>22}" for metric in METRICS))
+    for name in sorted(before.keys() & after.keys()):
+        cells = [
+            f"{before[name][metric]:>8.1f} → {after[name][metric]:>8.1f} {_change(before[name][metric], after[name][metric])}"
+            for metric in METRICS
+        ]
+        print(f"{name:32} " + " ".join(cells))
+    for name in sorted(before.keys() ^ after.keys()):
+        print(f"{name:32} solo en {'antes' if name in before else 'después'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# benchmarks/run.py
+"""
+Banco de pruebas de los endpoints: latencia (p50/p95/p99) y req/s por
+escenario, con la app en proceso a través de un cliente ASGI.
+
+    python -m benchmarks.run --products 100000 --concurrency 16 --requests 500
+
+Los ajustes de la app se cambian con sus variables de entorno
+(FAST_JSON_LISTS=true, INVENTORY_COALESCE_ENABLED=true...); --async-db
+activa el modo asíncrono. --mix lanza varios escenarios a la vez (carga
+mixta), p. ej. --mix auth.login,inventory.get para ver cuánto frena bcrypt
+a las lecturas. El resultado se guarda en JSON para comparar
+ejecuciones con benchmarks.compare.
+"""
+import argparse
+import asyncio
+import fnmatch
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from benchmarks.scenarios import API, SCENARIOS, Context, Scenario, new_shared
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD, default_database_url, seed, upgrade_schema
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(scenario: Scenario, latencies: List[float], statuses: Counter, failures: int, elapsed: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    completed = len(values)
+    return {
+        "router": scenario.router,
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": completed,
+        # Respuestas 4xx/5xx y excepciones del cliente
+        "errors": failures + sum(count for status, count in statuses.items() if status >= 400),
+        "status": {str(status): count for status, count in sorted(statuses.items())},
+        "req_per_s": round(completed / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / completed * 1000, 3) if completed else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+async def run_scenario(
+    client, scenario: Scenario, shared: Dict[str, Any], requests: int, concurrency: int, warmup: int, seed_value: int,
+    pending: Optional[Set[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Lanzar `requests` peticiones del escenario con `concurrency` workers.
+
+    En carga mixta `pending` son los escenarios del grupo que aún no han
+    lanzado sus peticiones: se sigue midiendo hasta que se vacía, para que
+    los escenarios rápidos no terminen antes y dejen solos a los lentos.
+    """
+    pending = pending if pending is not None else set()
+    total = min(requests, scenario.max_requests or requests)
+    workers = max(1, min(concurrency, total))
+    contexts = [Context(shared, random.Random(seed_value + i)) for i in range(workers)]
+    if scenario.setup is not None:
+        await asyncio.gather(*(scenario.setup(client, ctx) for ctx in contexts))
+
+    async def send(ctx: Context):
+        kwargs = scenario.build(ctx)
+        response = await client.request(scenario.method, kwargs.pop("url"), **kwargs)
+        if scenario.on_response is not None:
+            scenario.on_response(ctx, response)
+        return response
+
+    # Calentamiento: cachés, pool y rutas de código, sin medir
+    for _ in range(min(warmup, total)):
+        await send(contexts[0])
+
+    remaining = total
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    failures = 0
+
+    async def worker(ctx: Context) -> None:
+        nonlocal remaining, failures
+        while remaining > 0 or pending:
+            remaining -= 1
+            if remaining <= 0:
+                pending.discard(scenario.name)
+            start = time.perf_counter()
+            try:
+                response = await send(ctx)
+            except Exception:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(ctx) for ctx in contexts))
+    return summarize(scenario, latencies, statuses, failures, time.perf_counter() - start)
+
+
+def select_mix(group: str) -> List[Scenario]:
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    names = [name.strip() for name in group.split(",") if name.strip()]
+    unknown = [name for name in names if name not in by_name]
+    if unknown or len(names) < 2:
+        raise SystemExit(f"--mix necesita al menos dos escenarios conocidos: {group}")
+    return [by_name[name] for name in names]
+
+
+async def run_mix(client, scenarios: List[Scenario], shared: Dict[str, Any], args) -> Dict[str, Dict[str, Any]]:
+    """Lanzar los escenarios del grupo a la vez, cada uno con sus workers"""
+    pending = {scenario.name for scenario in scenarios}
+    results = await asyncio.gather(*(
+        run_scenario(client, scenario, shared, args.requests, args.concurrency, args.warmup, args.seed + i * 1000, pending)
+        for i, scenario in enumerate(scenarios)
+    ))
+    label = "+".join(scenario.name for scenario in scenarios)
+    return {f"{scenario.name}[mix {label}]": result for scenario, result in zip(scenarios, results)}
+
+
+def select_scenarios(patterns: Optional[List[str]], skip: Optional[List[str]], skip_tags: Optional[List[str]] = None) -> List[Scenario]:
+    selected = [s for s in SCENARIOS if not patterns or any(fnmatch.fnmatch(s.name, p) for p in patterns)]
+    selected = [s for s in selected if not skip or not any(fnmatch.fnmatch(s.name, p) for p in skip)]
+    return [s for s in selected if not skip_tags or not set(skip_tags) & set(s.tags)]
+
+
+def _print_result(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"{name:32} {result['req_per_s']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms"
+        + (f"  errores {result['errors']}" if result["errors"] else "")
+    )
+
+
+async def run_all(args, scenarios: List[Scenario], mixes: List[List[Scenario]]) -> Dict[str, Any]:
+    import httpx
+    from app.main import app
+
+    shared = new_shared(args.products, run_id=f"{int(time.time())}")
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            login = await client.post(f"{API}/auth/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            login.raise_for_status()
+            shared["access_token"] = login.json()["access_token"]
+            for scenario in scenarios:
+                result = await run_scenario(client, scenario, shared, args.requests, args.concurrency, args.warmup, args.seed)
+                results[scenario.name] = result
+                _print_result(scenario.name, result)
+            for mix in mixes:
+                for name, result in (await run_mix(client, mix, shared, args)).items():
+                    results[name] = result
+                    _print_result(name, result)
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10_000, help="tamaño del catálogo (p. ej. 10000, 100000, 1000000)")
+    parser.add_argument("--database-url", help="BD de pruebas (por defecto un SQLite por tamaño en benchmarks/.data)")
+    parser.add_argument("--reseed", action="store_true", help="volver a sembrar aunque la BD ya exista")
+    parser.add_argument("--concurrency", type=int, default=8, help="peticiones simultáneas por escenario")
+    parser.add_argument("--requests", type=int, default=200, help="peticiones medidas por escenario")
+    parser.add_argument("--warmup", type=int, default=10, help="peticiones sin medir antes de cada escenario")
+    parser.add_argument("--scenario", action="append", help="solo estos escenarios (patrón glob, repetible): products.*")
+    parser.add_argument("--skip", action="append", help="omitir estos escenarios (patrón glob, repetible)")
+    parser.add_argument("--skip-tag", action="append", help="omitir los escenarios con esta etiqueta: bcrypt, write, deep")
+    parser.add_argument("--mix", action="append", help="escenarios separados por comas que se lanzan a la vez (repetible): auth.login,inventory.get")
+    parser.add_argument("--async-db", action="store_true", help="activar el motor y los endpoints asíncronos")
+    parser.add_argument("--startup", action="store_true", help="medir también el arranque en frío")
+    parser.add_argument("--seed", type=int, default=42, help="semilla de las peticiones aleatorias")
+    parser.add_argument("--output", help="fichero JSON de resultados (por defecto en benchmarks/results)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    url = args.database_url or default_database_url(args.products)
+    is_new_sqlite = url.startswith("sqlite:///") and not Path(url[len("sqlite:///"):]).exists()
+    if args.reseed or is_new_sqlite:
+        print(f"Sembrando {args.products} productos en {url}...")
+        seed(url, args.products)
+    else:
+        # Una BD sembrada con una versión anterior del esquema
+        upgrade_schema(url)
+
+    # La app lee su configuración al importarse
+    os.environ["DATABASE_URL"] = url
+    if args.async_db:
+        os.environ["DB_ASYNC_ENABLED"] = "true"
+
+    # Con --mix y sin --scenario solo se ejecutan los grupos mixtos
+    scenarios = select_scenarios(args.scenario, args.skip, args.skip_tag) if args.scenario or not args.mix else []
+    mixes = [select_mix(group) for group in args.mix or []]
+    results = asyncio.run(run_all(args, scenarios, mixes))
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "database": url.split(":", 1)[0],
+            "products": args.products,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mix": args.mix or [],
+            "async_db": args.async_db,
+            "settings": {k: v for k, v in sorted(os.environ.items()) if k.isupper() and k.lower() in _setting_names()},
+        },
+        "results": results,
+    }
+    if args.startup:
+        from benchmarks.startup import measure
+        report["startup"] = measure(url)
+        print(f"arranque: {report['startup']}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{args.products}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False) + "\n")
+    print(f"Resultados en {output}")
+
+
+def _setting_names() -> set:
+    from app.core.config import Settings
+    return {name.lower() for name in Settings.model_fields} - {"database_url", "secret_key"}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# benchmarks/scenarios.py
+"""
+Escenarios del banco de pruebas: una o más peticiones por endpoint de cada
+router de app/api/api_v1/endpoints, más la raíz.
+
+Cada escenario construye sus peticiones a partir de un Context por worker;
+el nombre empieza por el router (products.list_cursor, auth.login...).
+"""
+import itertools
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD
+
+API = "/api/v1"
+
+
+class Context:
+    """Estado de un worker: datos compartidos de la ejecución y los propios"""
+
+    def __init__(self, shared: Dict[str, Any], rng: random.Random):
+        self.shared = shared
+        self.rng = rng
+        self.state: Dict[str, Any] = {}
+
+    def product_id(self) -> int:
+        return self.rng.randint(1, self.shared["products"])
+
+    def product_ids(self, count: int) -> List[int]:
+        return [self.product_id() for _ in range(count)]
+
+    def unique(self, prefix: str) -> str:
+        """Valor único en la ejecución y entre ejecuciones sobre la misma BD"""
+        return f"{prefix}-{self.shared['run_id']}-{next(self.shared['counter'])}"
+
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.shared['access_token']}"}
+
+
+def new_shared(products: int, run_id: str) -> Dict[str, Any]:
+    return {
+        "products": products,
+        "run_id": run_id,
+        "counter": itertools.count(),
+        "access_token": None,
+        # Productos creados por products.create, que products.delete consume
+        "created_products": deque(),
+    }
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Plantilla de la ruta, para el informe
+    path: str
+    # Devuelve los argumentos de httpx: url, params, json, data, files, headers
+    build: Callable[[Context], Dict[str, Any]]
+    on_response: Optional[Callable[[Context, Any], None]] = None
+    # Preparación de cada worker antes de medir (p. ej. su propio login)
+    setup: Optional[Callable[[Any, Context], Awaitable[None]]] = None
+    # Tope de peticiones para los escenarios que recorren todo el catálogo
+    max_requests: Optional[int] = None
+    tags: List[str] = field(default_factory=list)
+
+    @property
+    def router(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+def _login_form() -> Dict[str, str]:
+    return {"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+
+
+async def _login_worker(client, ctx: Context) -> None:
+    response = await client.post(f"{API}/auth/login", data=_login_form())
+    response.raise_for_status()
+    ctx.state["refresh_token"] = response.json()["refresh_token"]
+
+
+def _keep_refresh_token(ctx: Context, response) -> None:
+    if response.status_code == 200:
+        ctx.state["refresh_token"] = response.json()["refresh_token"]
+
+
+def _keep_created_product(ctx: Context, response) -> None:
+    if response.status_code == 200:
+        ctx.shared["created_products"].append(response.json()["id"])
+
+
+def _delete_created_product(ctx: Context) -> Dict[str, Any]:
+    created = ctx.shared["created_products"]
+    product_id = created.popleft() if created else ctx.shared["products"] + 1
+    return {"url": f"{API}/products/{product_id}"}
+
+
+def _product_body(ctx: Context) -> Dict[str, Any]:
+    return {
+        "name": f"Producto {ctx.unique('bench')}",
+        "sku": ctx.unique("BENCH"),
+        "price": round(ctx.rng.uniform(1, 500), 2),
+        "description": "producto de prueba",
+    }
+
+
+def _import_file(ctx: Context) -> Dict[str, Any]:
+    lines = ["name,sku,price,description,quantity"]
+    for _ in range(100):
+        sku = ctx.unique("IMP")
+        lines.append(f"Importado {sku},{sku},{ctx.rng.randint(1, 500)},importado,{ctx.rng.randint(0, 100)}")
+    return {"url": f"{API}/import/products", "files": {"file": ("bench.csv", "\n".join(lines), "text/csv")}}
+
+
+# Profundidad de las páginas profundas: fracción del catálogo ya recorrida
+DEEP_FRACTION = 0.9
+
+
+def _deep_offset(ctx: Context) -> int:
+    return max(1, int(ctx.shared["products"] * DEEP_FRACTION))
+
+
+def _deep_cursor_setup(model: str):
+    """
+    Cursor de la fila anterior a la que abre el offset profundo, para que
+    ambas páginas empiecen a la misma profundidad. Se calcula una vez con
+    una consulta directa (no se mide).
+    """
+    async def setup(client, ctx: Context) -> None:
+        key = f"deep_cursor:{model}"
+        if key not in ctx.shared:
+            from sqlalchemy import select
+
+            from app.core.pagination import encode_cursor
+            from app.db.session import SessionLocal
+            from app.models.inventory import Inventory
+            from app.models.product import Product
+
+            columns = (Product.name, Product.id) if model == "products" else (Inventory.id,)
+            with SessionLocal() as db:
+                row = db.execute(select(*columns).order_by(*columns).offset(_deep_offset(ctx) - 1).limit(1)).one()
+            ctx.shared[key] = encode_cursor(list(row))
+        ctx.state["cursor"] = ctx.shared[key]
+    return setup
+
+
+def _as_of() -> str:
+    return (datetime.utcnow() + timedelta(minutes=1)).isoformat()
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("root.index", "GET", "/", lambda ctx: {"url": "/"}),
+
+    # --- auth (login, token y registro pasan por bcrypt) ---
+    Scenario("auth.health", "GET", "/auth/health", lambda ctx: {"url": f"{API}/auth/health"}),
+    Scenario("auth.login", "POST", "/auth/login", lambda ctx: {"url": f"{API}/auth/login", "data": _login_form()}, tags=["bcrypt"]),
+    Scenario("auth.token", "POST", "/auth/token", lambda ctx: {"url": f"{API}/auth/token", "data": _login_form()}, tags=["bcrypt"]),
+    Scenario("auth.register", "POST", "/auth/register", lambda ctx: {
+        "url": f"{API}/auth/register",
+        "json": {"email": f"{ctx.unique('reg')}@example.com", "password": "secret123"},
+    }, tags=["bcrypt", "write"]),
+    Scenario("auth.me", "GET", "/auth/me", lambda ctx: {"url": f"{API}/auth/me", "headers": ctx.auth()}),
+    Scenario("auth.validate_token", "POST", "/auth/validate-token", lambda ctx: {
+        "url": f"{API}/auth/validate-token", "params": {"token": ctx.shared["access_token"]},
+    }),
+    Scenario("auth.refresh", "POST", "/auth/refresh", lambda ctx: {
+        "url": f"{API}/auth/refresh", "params": {"token": ctx.state["refresh_token"]},
+    }, on_response=_keep_refresh_token, setup=_login_worker, tags=["write"]),
+    Scenario("auth.logout", "POST", "/auth/logout", lambda ctx: {"url": f"{API}/auth/logout"}),
+
+    # --- users ---
+    Scenario("users.create", "POST", "/users/", lambda ctx: {
+        "url": f"{API}/users/",
+        "json": {"email": f"{ctx.unique('user')}@example.com", "password": "secret123"},
+    }, tags=["bcrypt", "write"]),
+    Scenario("users.list", "GET", "/users/", lambda ctx: {"url": f"{API}/users/", "params": {"limit": 100}}),
+    Scenario("users.list_cursor", "GET", "/users/?cursor=", lambda ctx: {"url": f"{API}/users/", "params": {"cursor": "", "limit": 100}}),
+
+    # --- products ---
+    Scenario("products.get", "GET", "/products/{product_id}", lambda ctx: {"url": f"{API}/products/{ctx.product_id()}"}),
+    Scenario("products.list", "GET", "/products/", lambda ctx: {
+        "url": f"{API}/products/", "params": {"skip": ctx.rng.randint(0, max(0, ctx.shared["products"] - 100)), "limit": 100},
+    }),
+    Scenario("products.list_cursor", "GET", "/products/?cursor=", lambda ctx: {"url": f"{API}/products/", "params": {"cursor": "", "limit": 100}}),
+    # Misma profundidad (DEEP_FRACTION del catálogo) con offset y con cursor
+    Scenario("products.list_deep_offset", "GET", "/products/?skip=", lambda ctx: {
+        "url": f"{API}/products/", "params": {"skip": _deep_offset(ctx), "limit": 100},
+    }, tags=["deep"]),
+    Scenario("products.list_deep_cursor", "GET", "/products/?cursor=", lambda ctx: {
+        "url": f"{API}/products/", "params": {"cursor": ctx.state["cursor"], "limit": 100},
+    }, setup=_deep_cursor_setup("products"), tags=["deep"]),
+    Scenario("products.list_ids", "GET", "/products/?ids=", lambda ctx: {
+        "url": f"{API}/products/", "params": {"ids": ",".join(map(str, ctx.product_ids(50)))},
+    }),
+    Scenario("products.batch", "POST", "/products/batch", lambda ctx: {"url": f"{API}/products/batch", "json": {"ids": ctx.product_ids(50)}}),
+    Scenario("products.search", "GET", "/products/search", lambda ctx: {
+        "url": f"{API}/products/search", "params": {"q": ctx.rng.choice(("caja", "lámpara az", "SKU-00012", "mesa madera", "pro"))},
+    }),
+    Scenario("products.cache_stats", "GET", "/products/cache/stats", lambda ctx: {"url": f"{API}/products/cache/stats"}),
+    Scenario("products.create", "POST", "/products/", lambda ctx: {"url": f"{API}/products/", "json": _product_body(ctx)},
+             on_response=_keep_created_product, tags=["write"]),
+    Scenario("products.update", "PUT", "/products/{product_id}", lambda ctx: {
+        "url": f"{API}/products/{ctx.product_id()}", "json": _product_body(ctx),
+    }, tags=["write"]),
+    Scenario("products.delete", "DELETE", "/products/{product_id}", _delete_created_product, tags=["write"]),
+
+    # --- inventory ---
+    Scenario("inventory.get", "GET", "/inventory/{product_id}", lambda ctx: {"url": f"{API}/inventory/{ctx.product_id()}"}),
+    Scenario("inventory.list", "GET", "/inventory/", lambda ctx: {
+        "url": f"{API}/inventory/", "params": {"skip": ctx.rng.randint(0, max(0, ctx.shared["products"] - 100)), "limit": 100},
+    }),
+    Scenario("inventory.list_cursor", "GET", "/inventory/?cursor=", lambda ctx: {"url": f"{API}/inventory/", "params": {"cursor": "", "limit": 100}}),
+    Scenario("inventory.list_deep_offset", "GET", "/inventory/?skip=", lambda ctx: {
+        "url": f"{API}/inventory/", "params": {"skip": _deep_offset(ctx), "limit": 100},
+    }, tags=["deep"]),
+    Scenario("inventory.list_deep_cursor", "GET", "/inventory/?cursor=", lambda ctx: {
+        "url": f"{API}/inventory/", "params": {"cursor": ctx.state["cursor"], "limit": 100},
+    }, setup=_deep_cursor_setup("inventory"), tags=["deep"]),
+    Scenario("inventory.list_product_ids", "GET", "/inventory/?product_ids=", lambda ctx: {
+        "url": f"{API}/inventory/", "params": {"product_ids": ",".join(map(str, ctx.product_ids(50)))},
+    }),
+    Scenario("inventory.low_stock", "GET", "/inventory/low-stock", lambda ctx: {"url": f"{API}/inventory/low-stock"}),
+    Scenario("inventory.low_stock_threshold", "GET", "/inventory/low-stock?threshold=", lambda ctx: {
+        "url": f"{API}/inventory/low-stock", "params": {"threshold": 5},
+    }),
+    Scenario("inventory.adjust", "PATCH", "/inventory/{product_id}", lambda ctx: {
+        "url": f"{API}/inventory/{ctx.product_id()}", "json": {"quantity": ctx.rng.choice((1, 2, 5))},
+    }, tags=["write"]),
+    Scenario("inventory.adjust_hot", "PATCH", "/inventory/{product_id}", lambda ctx: {
+        # Todas las peticiones sobre la misma fila: el caso de las promociones
+        "url": f"{API}/inventory/1", "json": {"quantity": 1},
+    }, tags=["write"]),
+    Scenario("inventory.adjust_detail", "POST", "/inventory/{product_id}/adjust", lambda ctx: {
+        "url": f"{API}/inventory/{ctx.product_id()}/adjust", "json": {"quantity": 1},
+    }, tags=["write"]),
+    Scenario("inventory.adjust_batch", "POST", "/inventory/adjust/batch", lambda ctx: {
+        "url": f"{API}/inventory/adjust/batch",
+        "json": {"items": [{"product_id": pid, "quantity": 1} for pid in ctx.product_ids(20)]},
+    }, tags=["write"]),
+    Scenario("inventory.upsert", "POST", "/inventory/", lambda ctx: {
+        "url": f"{API}/inventory/", "json": {"product_id": ctx.product_id(), "quantity": ctx.rng.randint(10, 1000)},
+    }, tags=["write"]),
+    Scenario("inventory.bulk", "POST", "/inventory/bulk", lambda ctx: {
+        "url": f"{API}/inventory/bulk",
+        "json": {"items": [{"product_id": pid, "quantity": ctx.rng.randint(10, 1000)} for pid in ctx.product_ids(100)]},
+    }, tags=["write"]),
+    Scenario("inventory.threshold", "PUT", "/inventory/{product_id}/threshold", lambda ctx: {
+        "url": f"{API}/inventory/{ctx.product_id()}/threshold", "json": {"low_stock_threshold": ctx.rng.randint(5, 20)},
+    }, tags=["write"]),
+    Scenario("inventory.product_as_of", "GET", "/inventory/{product_id}/as-of", lambda ctx: {
+        "url": f"{API}/inventory/{ctx.product_id()}/as-of", "params": {"at": _as_of()},
+    }),
+    Scenario("inventory.as_of", "GET", "/inventory/as-of", lambda ctx: {
+        "url": f"{API}/inventory/as-of", "params": {"at": _as_of()},
+    }, max_requests=20),
+    Scenario("inventory.snapshot", "POST", "/inventory/snapshots", lambda ctx: {"url": f"{API}/inventory/snapshots"},
+             max_requests=5, tags=["write"]),
+
+    # --- stock ---
+    Scenario("stock.list", "GET", "/stock/", lambda ctx: {"url": f"{API}/stock/", "params": {"cursor": "", "limit": 100}}),
+
+    # --- export / import ---
+    Scenario("export.catalog_ndjson", "GET", "/export/catalog", lambda ctx: {"url": f"{API}/export/catalog"}, max_requests=5),
+    Scenario("export.catalog_csv", "GET", "/export/catalog?format=csv", lambda ctx: {
+        "url": f"{API}/export/catalog", "params": {"format": "csv"},
+    }, max_requests=5),
+    Scenario("import.products", "POST", "/import/products", _import_file, max_requests=20, tags=["write"]),
+
+    # --- metrics ---
+    Scenario("metrics.db_pool", "GET", "/metrics/db-pool", lambda ctx: {"url": f"{API}/metrics/db-pool"}),
+    Scenario("metrics.prometheus", "GET", "/metrics", lambda ctx: {"url": "/metrics"}),
+]
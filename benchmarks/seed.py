@@ -0,0 +1,141 @@
+# benchmarks/seed.py
+"""
+Sembrar una BD de pruebas con un catálogo de tamaño configurable.
+
+El esquema se crea con las migraciones de Alembic (las mismas que en
+producción) y las filas se insertan por lotes con SQL Core.
+
+    python -m benchmarks.seed --products 100000 --database-url sqlite:///benchmarks/.data/catalog.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+# Usuario con el que se autentican los escenarios
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+
+_WORDS = (
+    "acero", "algodón", "azul", "básico", "blanco", "cable", "caja", "cargador",
+    "cuero", "digital", "eléctrico", "grande", "inalámbrico", "lámpara", "madera",
+    "mesa", "mini", "negro", "pack", "portátil", "pro", "rojo", "silla", "soporte",
+    "taza", "teclado", "verde", "vidrio",
+)
+_CHUNK = 20_000
+
+
+def default_database_url(products: int) -> str:
+    """Fichero SQLite propio de cada tamaño de catálogo"""
+    return f"sqlite:///{DATA_DIR / f'catalog-{products}.db'}"
+
+
+def _migrate(url: str, reset: bool) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    # env.py lee la URL de settings, que sale de DATABASE_URL
+    os.environ["DATABASE_URL"] = url
+    config = Config(str(ROOT / "alembic.ini"))
+    if reset:
+        command.downgrade(config, "base")
+    command.upgrade(config, "head")
+
+
+def upgrade_schema(url: str) -> None:
+    """Llevar una BD ya sembrada a la última migración"""
+    _migrate(url, reset=False)
+
+
+def _insert_chunks(conn, table, rows) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _CHUNK:
+            conn.execute(table.insert(), chunk)
+            chunk = []
+    if chunk:
+        conn.execute(table.insert(), chunk)
+
+
+def seed(url: str, products: int, seed_value: int = 42) -> dict:
+    """
+    Crear el esquema desde cero y llenarlo: `products` productos, su
+    inventario (un 5% por debajo del umbral de stock bajo), una foto del
+    inventario para las consultas históricas y el usuario de pruebas.
+
+    Returns:
+        Tiempos y número de filas sembradas
+    """
+    from passlib.context import CryptContext
+    from sqlalchemy import create_engine, literal, select
+
+    from app.models.inventory import Inventory
+    from app.models.inventory_movement import InventorySnapshot
+    from app.models.product import Product
+    from app.models.user import User
+
+    if url.startswith("sqlite:///"):
+        Path(url[len("sqlite:///"):]).parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    _migrate(url, reset=True)
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        _insert_chunks(conn, Product.__table__, (
+            {
+                "id": i,
+                "name": f"{rng.choice(_WORDS).capitalize()} {rng.choice(_WORDS)} {i:07d}",
+                "description": " ".join(rng.choices(_WORDS, k=6)),
+                "sku": f"SKU-{i:07d}",
+                "price": round(rng.uniform(1, 500), 2),
+                "version": 1,
+                "updated_at": now,
+            }
+            for i in range(1, products + 1)
+        ))
+        _insert_chunks(conn, Inventory.__table__, (
+            {
+                "id": i,
+                "product_id": i,
+                "quantity": rng.randint(0, 9) if rng.random() < 0.05 else rng.randint(10, 1000),
+                "updated_at": now,
+            }
+            for i in range(1, products + 1)
+        ))
+        conn.execute(InventorySnapshot.__table__.insert().from_select(
+            ["snapshot_at", "product_id", "quantity"],
+            select(literal(now, type_=InventorySnapshot.snapshot_at.type), Inventory.product_id, Inventory.quantity),
+        ))
+        conn.execute(User.__table__.insert(), {
+            "email": BENCH_EMAIL,
+            "full_name": "Benchmark",
+            "hashed_password": CryptContext(schemes=["bcrypt"]).hash(BENCH_PASSWORD),
+            "is_active": True,
+            "is_superuser": False,
+        })
+    engine.dispose()
+    return {"products": products, "seconds": round(time.perf_counter() - start, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10_000, help="tamaño del catálogo (p. ej. 10000, 100000, 1000000)")
+    parser.add_argument("--database-url", help="BD a sembrar (por defecto un SQLite en benchmarks/.data)")
+    parser.add_argument("--seed", type=int, default=42, help="semilla de los datos aleatorios")
+    args = parser.parse_args()
+    url = args.database_url or default_database_url(args.products)
+    result = seed(url, args.products, args.seed)
+    print(f"{result['products']} productos sembrados en {url} ({result['seconds']} s)")
+
+
+if __name__ == "__main__":
+    main()
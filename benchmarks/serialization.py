@@ -0,0 +1,114 @@
+# benchmarks/serialization.py
+"""
+Coste de serializar los listados por cada 1000 filas: objetos ORM +
+validación pydantic + jsonable_encoder (el camino por defecto de FastAPI)
+frente a tuplas de columnas + pydantic_core.to_json (FAST_JSON_LISTS).
+
+    python -m benchmarks.serialization --products 10000 --rows 1000
+
+Se mide la consulta y la serialización juntas y la serialización sola,
+sobre la misma BD sembrada que usa benchmarks.run.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.seed import default_database_url, seed
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    """Mediana en ms de `repeat` ejecuciones, tras una de calentamiento"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def measure(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    # La app lee DATABASE_URL al importarse: los imports van aquí
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from pydantic_core import to_json
+
+    from app.core.fast_json import rows_json, schema_columns
+    from app.crud import crud_inventory, crud_product
+    from app.db.session import SessionLocal
+    from app.models.inventory import Inventory
+    from app.models.product import Product
+    from app.schemas.inventory import InventoryOut
+    from app.schemas.product import ProductOut
+
+    cases = {
+        "products": (ProductOut, Product, crud_product.get_products, crud_product.get_product_rows),
+        "inventory": (InventoryOut, Inventory, crud_inventory.get_all_inventory, crud_inventory.get_inventory_rows),
+    }
+    scale = 1000 / rows
+    results = {}
+    for name, (schema, model, get_objects, get_rows) in cases.items():
+        adapter = TypeAdapter(List[schema])
+        columns = schema_columns(schema, model)
+
+        def orm_json(objects) -> bytes:
+            return json.dumps(jsonable_encoder(adapter.validate_python(objects, from_attributes=True))).encode()
+
+        def fast_json(tuples) -> bytes:
+            return to_json(rows_json(tuples))
+
+        def with_session(query: Callable, serialize: Callable) -> Callable[[], bytes]:
+            def run() -> bytes:
+                db = SessionLocal()
+                try:
+                    return serialize(query(db))
+                finally:
+                    db.close()
+            return run
+
+        db = SessionLocal()
+        try:
+            objects = get_objects(db, limit=rows)
+            tuples = get_rows(db, columns, limit=rows)
+            # Los dos caminos deben producir el mismo documento
+            if json.loads(orm_json(objects)) != json.loads(fast_json(tuples)):
+                raise SystemExit(f"{name}: las dos serializaciones no coinciden")
+            results[name] = {
+                "orm_total_ms": timeit(with_session(lambda s: get_objects(s, limit=rows), orm_json), repeat) * scale,
+                "fast_total_ms": timeit(with_session(lambda s: get_rows(s, columns, limit=rows), fast_json), repeat) * scale,
+                "orm_serialize_ms": timeit(lambda: orm_json(objects), repeat) * scale,
+                "fast_serialize_ms": timeit(lambda: fast_json(tuples), repeat) * scale,
+            }
+        finally:
+            db.close()
+    return {name: {key: round(value, 2) for key, value in values.items()} for name, values in results.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10_000, help="tamaño del catálogo sembrado")
+    parser.add_argument("--database-url", help="BD de pruebas (por defecto la de benchmarks.run)")
+    parser.add_argument("--rows", type=int, default=1000, help="filas por listado")
+    parser.add_argument("--repeat", type=int, default=30, help="repeticiones por medida")
+    args = parser.parse_args()
+
+    url = args.database_url or default_database_url(args.products)
+    if url.startswith("sqlite:///") and not Path(url[len("sqlite:///"):]).exists():
+        print(f"Sembrando {args.products} productos en {url}...")
+        seed(url, args.products)
+    os.environ["DATABASE_URL"] = url
+
+    for name, values in measure(args.rows, args.repeat).items():
+        print(
+            f"{name:10} por 1k filas  "
+            f"ORM+pydantic {values['orm_total_ms']:>7.2f} ms (serializar {values['orm_serialize_ms']:>6.2f})  "
+            f"tuplas+to_json {values['fast_total_ms']:>7.2f} ms (serializar {values['fast_serialize_ms']:>6.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
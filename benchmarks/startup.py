@@ -0,0 +1,69 @@
+# benchmarks/startup.py
+"""
+Tiempo de arranque: importar app.main, ejecutar el lifespan y atender la
+primera petición, cada medida en un proceso nuevo.
+
+    python -m benchmarks.startup --database-url sqlite:///benchmarks/.data/catalog-10000.db
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _child() -> None:
+    # Proceso hijo: intérprete limpio, sin módulos de la app ya importados
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        status = client.get("/api/v1/products/", params={"limit": 1}).status_code
+        first = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (started - imported) * 1000,
+        "first_request_ms": (first - started) * 1000,
+        "status": status,
+    }))
+
+
+def measure(database_url: str, runs: int = 3) -> Dict[str, float]:
+    """Mediana de `runs` arranques en frío"""
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONWARNINGS="ignore")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in ("import_ms", "startup_ms", "first_request_ms")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return
+    print(json.dumps(measure(args.database_url, args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# tests/conftest.py
+import os
+import tempfile
+import uuid
+
+# La configuración se lee al importar la app: BD de pruebas propia antes de nada
+_DB_DIR = tempfile.mkdtemp(prefix="inventory-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.main import app
+
+Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def unique():
+    """Sufijo único: las pruebas comparten BD y no deben chocar por SKU o email"""
+    return lambda prefix="t": f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def product(client, unique):
+    """Producto nuevo con 10 unidades en inventario"""
+    response = client.post("/api/v1/products/", json={"name": unique("Producto"), "sku": unique("SKU"), "price": 9.5})
+    assert response.status_code == 200
+    created = response.json()
+    assert client.post("/api/v1/inventory/", json={"product_id": created["id"], "quantity": 10}).status_code == 200
+    return created
+
+
+class QueryCounter:
+    """Sentencias SQL ejecutadas por el motor síncrono mientras está activo"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    return QueryCounter
@@ -0,0 +1,65 @@
+# tests/test_auth_tokens.py
+import pytest
+
+from app.core.security import create_access_token, verify_token
+
+PASSWORD = "secreto123"
+
+
+@pytest.fixture
+def tokens(client, unique):
+    """Access y refresh token de un usuario nuevo"""
+    email = f"{unique('user')}@example.com"
+    assert client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD}).status_code == 200
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return dict(response.json(), email=email, user_id=int(verify_token(response.json()["access_token"])["sub"]))
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_verify_token_checks_type(tokens):
+    assert verify_token(tokens["access_token"], expected_type="access")["type"] == "access"
+    assert verify_token(tokens["refresh_token"], expected_type="access") is None
+    assert verify_token(tokens["access_token"], expected_type="refresh") is None
+    assert verify_token(tokens["refresh_token"])["type"] == "refresh"
+
+
+def test_access_token_authenticates(client, tokens):
+    response = client.get("/api/v1/auth/me", headers=_bearer(tokens["access_token"]))
+    assert response.status_code == 200
+    assert response.json()["id"] == tokens["user_id"]
+
+
+def test_refresh_token_is_not_a_bearer_token(client, tokens):
+    response = client.get("/api/v1/auth/me", headers=_bearer(tokens["refresh_token"]))
+    assert response.status_code == 401
+
+
+def test_validate_token_rejects_refresh_token(client, tokens):
+    assert client.post("/api/v1/auth/validate-token", params={"token": tokens["refresh_token"]}).status_code == 401
+    response = client.post("/api/v1/auth/validate-token", params={"token": tokens["access_token"]})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "access"
+
+
+def test_refresh_rejects_access_token(client, tokens):
+    assert client.post("/api/v1/auth/refresh", params={"token": tokens["access_token"]}).status_code == 401
+
+
+def test_refresh_rotates_refresh_token(client, tokens):
+    response = client.post("/api/v1/auth/refresh", params={"token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/api/v1/auth/me", headers=_bearer(body["access_token"])).status_code == 200
+    # El refresh token consumido ya no sirve
+    assert client.post("/api/v1/auth/refresh", params={"token": tokens["refresh_token"]}).status_code == 401
+
+
+@pytest.mark.parametrize("token_type", ["refresh", "reset_password", "verify_email"])
+def test_signed_token_of_other_type_is_rejected(client, tokens, token_type):
+    token = create_access_token(tokens["user_id"], additional_data={"type": token_type})
+    assert client.get("/api/v1/auth/me", headers=_bearer(token)).status_code == 401
@@ -0,0 +1,61 @@
+# tests/test_db_session_scope.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import engine
+from app.main import app
+
+
+class CheckedOutAtResponse:
+    """App ASGI que anota cuántas conexiones hay prestadas al empezar cada respuesta"""
+
+    def __init__(self, app):
+        self.app = app
+        self.samples = []
+
+    async def __call__(self, scope, receive, send):
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                self.samples.append(engine.pool.checkedout())
+            await send(message)
+
+        await self.app(scope, receive, recording_send)
+
+
+@pytest.fixture
+def recorder(client):
+    # `client` ya ejecutó el lifespan de la app
+    return CheckedOutAtResponse(app)
+
+
+def _request(recorder, method, url, expected_status, **kwargs):
+    # Sin `with`: el lifespan ya corre en `client` y no debe repetirse
+    response = TestClient(recorder).request(method, url, **kwargs)
+    assert response.status_code == expected_status, response.text
+    return recorder.samples[-1], engine.pool.checkedout()
+
+
+@pytest.mark.parametrize("method, url, kwargs, expected_status", [
+    # Salen antes de consultar la BD
+    ("GET", "/api/v1/stock/", {"params": {"cursor": "no-es-un-cursor"}}, 400),
+    ("GET", "/api/v1/products/", {"params": {"ids": "a,b"}}, 400),
+    ("GET", "/api/v1/products/", {"params": {"limit": 0}}, 422),
+    # Consultan la BD
+    ("GET", "/api/v1/stock/", {"params": {"limit": 50}}, 200),
+    ("GET", "/api/v1/products/", {"params": {"limit": 50}}, 200),
+    ("GET", "/api/v1/inventory/", {"params": {"limit": 50}}, 200),
+    ("GET", "/api/v1/inventory/999999999", {}, 404),
+    ("GET", "/api/v1/products/search", {"params": {"q": "producto"}}, 200),
+])
+def test_connection_is_returned_before_the_response(recorder, method, url, kwargs, expected_status):
+    at_response, after = _request(recorder, method, url, expected_status, **kwargs)
+    assert at_response == 0
+    assert after == 0
+
+
+def test_write_returns_connection_before_the_response(recorder, product):
+    at_response, after = _request(
+        recorder, "PATCH", f"/api/v1/inventory/{product['id']}", 200, json={"quantity": 1}
+    )
+    assert at_response == 0
+    assert after == 0
@@ -0,0 +1,56 @@
+# tests/test_export.py
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.api_v1.endpoints import export
+from app.models.product import Product
+
+
+@pytest.fixture
+def catalog(client, product, unique, monkeypatch):
+    """Un producto con inventario, otro sin él y bloques de 2 filas para recorrer varios"""
+    response = client.post("/api/v1/products/", json={"name": unique("Sin stock"), "sku": unique("SKU"), "price": 3})
+    assert response.status_code == 200
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    return product, response.json()
+
+
+def _product_count(db):
+    return db.execute(select(func.count()).select_from(Product)).scalar()
+
+
+def test_ndjson_export(client, db, catalog):
+    stocked, unstocked = catalog
+    response = client.get("/api/v1/export/catalog")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == _product_count(db)
+    assert all(list(row) == export.CATALOG_FIELDS for row in rows)
+    by_id = {row["id"]: row for row in rows}
+    assert by_id[stocked["id"]]["quantity"] == 10
+    # Outer join: sin fila de inventario la cantidad es 0
+    assert by_id[unstocked["id"]] == {
+        "id": unstocked["id"], "sku": unstocked["sku"], "name": unstocked["name"],
+        "description": None, "price": 3.0, "quantity": 0,
+    }
+
+
+def test_csv_export(client, db, catalog):
+    stocked, unstocked = catalog
+    response = client.get("/api/v1/export/catalog", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="catalog.csv"'
+
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == export.CATALOG_FIELDS
+    assert len(rows) == _product_count(db)
+    by_id = {int(row[0]): row for row in rows}
+    assert by_id[stocked["id"]][-1] == "10"
+    assert by_id[unstocked["id"]] == [str(unstocked["id"]), unstocked["sku"], unstocked["name"], "", "3.0", "0"]
@@ -0,0 +1,52 @@
+# tests/test_inventory_adjust.py
+from concurrent.futures import ThreadPoolExecutor
+
+from app.crud.crud_inventory import adjust_inventory
+from app.db.session import SessionLocal
+
+
+def _adjust(product_id: int, delta: int, times: int) -> None:
+    db = SessionLocal()
+    try:
+        for _ in range(times):
+            adjust_inventory(db, product_id, delta)
+    finally:
+        db.close()
+
+
+def test_parallel_adjusts_do_not_lose_updates(product):
+    workers, per_worker = 8, 25
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: _adjust(product["id"], 1, per_worker), range(workers)))
+
+    db = SessionLocal()
+    try:
+        inv = adjust_inventory(db, product["id"], 0)
+    finally:
+        db.close()
+    assert inv.quantity == 10 + workers * per_worker
+
+
+def test_parallel_patches_do_not_lose_updates(client, product):
+    workers, per_worker = 8, 10
+
+    def patch(_):
+        for _ in range(per_worker):
+            assert client.patch(f"/api/v1/inventory/{product['id']}", json={"quantity": 1}).status_code == 200
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(patch, range(workers)))
+
+    assert client.get(f"/api/v1/inventory/{product['id']}").json()["quantity"] == 10 + workers * per_worker
+
+
+def test_adjust_clamps_at_zero(db, product):
+    assert adjust_inventory(db, product["id"], -25).quantity == 0
+
+
+def test_adjust_round_trips(db, product, count_queries):
+    with count_queries() as queries:
+        inv = adjust_inventory(db, product["id"], 3)
+    assert inv.quantity == 13
+    # UPDATE con el delta, lectura de la fila resultante y movimiento del libro
+    assert queries.count == 3, queries.statements
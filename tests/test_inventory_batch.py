@@ -0,0 +1,78 @@
+# tests/test_inventory_batch.py
+from sqlalchemy import event, insert
+
+from app.crud.crud_inventory import adjust_inventory_batch
+from app.db.session import SessionLocal, engine
+from app.models.inventory import Inventory
+
+UNKNOWN_ID = 999_999_999
+
+
+def _new_product(client, unique):
+    """Producto sin fila de inventario"""
+    response = client.post("/api/v1/products/", json={"name": unique("Lote"), "sku": unique("SKU"), "price": 1})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _batch(client, *items):
+    response = client.post(
+        "/api/v1/inventory/adjust/batch",
+        json={"items": [{"product_id": pid, "quantity": qty} for pid, qty in items]},
+    )
+    assert response.status_code == 200, response.text
+    return [(r["success"], r["previous_quantity"], r["new_quantity"], r["adjustment"]) for r in response.json()]
+
+
+def _quantity(client, product_id):
+    return client.get(f"/api/v1/inventory/{product_id}").json()["quantity"]
+
+
+def test_existing_new_and_unknown_products(client, product, unique):
+    new_id = _new_product(client, unique)
+    results = _batch(client, (product["id"], 5), (new_id, 7), (UNKNOWN_ID, 1))
+
+    assert results == [(True, 10, 15, 5), (True, 0, 7, 7), (False, 0, 0, 0)]
+    assert _quantity(client, product["id"]) == 15
+    assert _quantity(client, new_id) == 7
+    assert client.get(f"/api/v1/inventory/{UNKNOWN_ID}").status_code == 404
+
+
+def test_clamps_at_zero(client, product, unique):
+    new_id = _new_product(client, unique)
+    results = _batch(client, (product["id"], -25), (new_id, -3))
+
+    assert results == [(True, 10, 0, -10), (True, 0, 0, 0)]
+    assert _quantity(client, product["id"]) == 0
+    assert _quantity(client, new_id) == 0
+
+
+def test_repeated_product_ids_apply_in_order(client, product):
+    results = _batch(client, (product["id"], 5), (product["id"], -20), (product["id"], 3))
+
+    assert results == [(True, 10, 15, 5), (True, 15, 0, -15), (True, 0, 3, 3)]
+    assert _quantity(client, product["id"]) == 3
+
+
+def test_row_created_concurrently_is_adjusted_not_duplicated(client, unique):
+    product_id = _new_product(client, unique)
+    fired = []
+
+    def create_row_first(conn, cursor, statement, parameters, context, executemany):
+        # Otro lote crea la fila entre el bloqueo de las existentes y la escritura de este
+        if statement.startswith("INSERT INTO inventory (") and not fired:
+            fired.append(True)
+            with engine.begin() as other:
+                other.execute(insert(Inventory.__table__).values(product_id=product_id, quantity=4))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", create_row_first)
+    try:
+        results = adjust_inventory_batch(db, [(product_id, 3)])
+    finally:
+        event.remove(engine, "before_cursor_execute", create_row_first)
+        db.close()
+
+    assert fired
+    assert [(r["previous_quantity"], r["new_quantity"]) for r in results] == [(4, 7)]
+    assert _quantity(client, product_id) == 7
@@ -0,0 +1,109 @@
+# tests/test_inventory_buffer.py
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.crud import inventory_buffer as inventory_buffer_module
+from app.crud.crud_inventory import get_inventory_by_product
+from app.crud.inventory_buffer import InventoryDeltaBuffer
+from app.models.inventory_movement import InventoryMovement
+
+
+@pytest.fixture
+def buffer():
+    """Buffer propio que solo escribe al pedirlo (intervalo de un minuto)"""
+    buffer = InventoryDeltaBuffer(interval_ms=60_000, max_ops=1000)
+    yield buffer
+    buffer.stop()
+
+
+def _quantity(db, product_id):
+    db.expire_all()
+    return get_inventory_by_product(db, product_id).quantity
+
+
+def test_deltas_are_written_as_one_net_adjustment(db, buffer, product):
+    for delta in (5, -3, 1):
+        buffer.add(product["id"], delta)
+    assert buffer.pending() == 3
+
+    assert buffer.flush() == 1
+    assert buffer.pending() == 0
+    assert _quantity(db, product["id"]) == 13
+    last = db.execute(
+        select(InventoryMovement.kind, InventoryMovement.delta, InventoryMovement.quantity_after)
+        .where(InventoryMovement.product_id == product["id"])
+        .order_by(InventoryMovement.id.desc())
+        .limit(1)
+    ).one()
+    assert tuple(last) == ("adjust", 3, 13)
+
+
+def test_max_ops_wakes_the_flusher(db, product):
+    buffer = InventoryDeltaBuffer(interval_ms=60_000, max_ops=3)
+    try:
+        for _ in range(3):
+            buffer.add(product["id"], 1)
+        deadline = time.monotonic() + 5
+        while buffer.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # flush() se serializa con el del hilo: al volver ya está escrito
+        buffer.flush()
+        assert buffer.pending() == 0
+        assert _quantity(db, product["id"]) == 13
+    finally:
+        buffer.stop()
+
+
+def test_failed_flush_requeues_the_deltas(db, buffer, product, monkeypatch):
+    apply = inventory_buffer_module.apply_inventory_deltas
+
+    def failing_apply(session, deltas):
+        raise OperationalError("UPDATE inventory", {}, Exception("BD caída"))
+
+    buffer.add(product["id"], 4)
+    buffer.add(product["id"], 2)
+    monkeypatch.setattr(inventory_buffer_module, "apply_inventory_deltas", failing_apply)
+    with pytest.raises(OperationalError):
+        buffer.flush()
+    assert buffer.pending() == 2
+    assert _quantity(db, product["id"]) == 10
+
+    monkeypatch.setattr(inventory_buffer_module, "apply_inventory_deltas", apply)
+    buffer.add(product["id"], 1)
+    assert buffer.flush() == 1
+    assert _quantity(db, product["id"]) == 17
+
+
+def test_stop_writes_what_is_pending(db, product):
+    buffer = InventoryDeltaBuffer(interval_ms=60_000, max_ops=1000)
+    buffer.add(product["id"], 6)
+    buffer.stop()
+
+    assert buffer.pending() == 0
+    assert _quantity(db, product["id"]) == 16
+
+
+@pytest.fixture
+def coalescing(monkeypatch):
+    monkeypatch.setattr(settings, "inventory_coalesce_enabled", True)
+
+
+def test_patch_is_queued_and_wait_returns_the_quantity(client, coalescing, product):
+    url = f"/api/v1/inventory/{product['id']}"
+    queued = client.patch(url, json={"quantity": 2})
+    assert queued.status_code == 202
+    assert queued.json() == {"product_id": product["id"], "adjustment": 2, "pending": True}
+
+    waited = client.patch(url, params={"wait": True}, json={"quantity": 3})
+    assert waited.status_code == 200
+    assert waited.json()["quantity"] == 15
+
+
+def test_patch_for_unknown_product_is_404(client, coalescing):
+    response = client.patch("/api/v1/inventory/999999999", json={"quantity": 1})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Producto no encontrado"
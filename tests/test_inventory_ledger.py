@@ -0,0 +1,100 @@
+# tests/test_inventory_ledger.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.crud.crud_inventory import adjust_inventory
+from app.crud.inventory_ledger import SnapshotScheduler, compact_inventory_ledger, create_inventory_snapshot, get_stock_at, get_stock_levels_at
+from app.db.session import SessionLocal
+from app.models.inventory_movement import InventoryMovement, InventorySnapshot
+
+
+def _movements(db, product_id):
+    return db.execute(
+        select(InventoryMovement.kind, InventoryMovement.delta, InventoryMovement.quantity_after)
+        .where(InventoryMovement.product_id == product_id)
+        .order_by(InventoryMovement.id)
+    ).all()
+
+
+def test_movement_is_written_with_the_adjust(db, product):
+    adjust_inventory(db, product["id"], 5)
+    # Sin cola en memoria: el movimiento ya está en la BD tras el commit
+    assert _movements(db, product["id"])[-2:] == [("set", None, 10), ("adjust", 5, 15)]
+
+
+def test_movement_ids_follow_concurrent_adjusts(product):
+    def adjust(_):
+        db = SessionLocal()
+        try:
+            for _ in range(10):
+                adjust_inventory(db, product["id"], 1)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(adjust, range(4)))
+
+    db = SessionLocal()
+    try:
+        quantities = [quantity for _, _, quantity in _movements(db, product["id"])]
+        assert quantities == list(range(10, 51))
+        assert get_stock_at(db, product["id"], datetime.utcnow() + timedelta(seconds=1)) == 50
+    finally:
+        db.close()
+
+
+def test_stock_at_accepts_aware_datetimes(db, product):
+    adjust_inventory(db, product["id"], 2)
+    now = datetime.now(timezone.utc)
+    # El mismo instante expresado en UTC-5: sin normalizar se compararía como 5 h antes
+    local = now.astimezone(timezone(timedelta(hours=-5))) + timedelta(seconds=1)
+
+    assert get_stock_at(db, product["id"], local) == 12
+    assert get_stock_levels_at(db, local)[product["id"]] == 12
+    assert get_stock_at(db, product["id"], now - timedelta(hours=1)) is None
+
+
+def test_stock_at_endpoint_with_offset(client, product):
+    client.patch(f"/api/v1/inventory/{product['id']}", json={"quantity": 4})
+    at = (datetime.now(timezone.utc) + timedelta(seconds=1)).astimezone(timezone(timedelta(hours=2)))
+    response = client.get(f"/api/v1/inventory/{product['id']}/as-of", params={"at": at.isoformat()})
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 14
+
+
+def test_compacted_ledger_gives_the_same_answers(db, product):
+    pid = product["id"]
+    create_inventory_snapshot(db)
+    adjust_inventory(db, pid, 1)
+    oldest_kept, _ = create_inventory_snapshot(db)
+    instants = [oldest_kept]
+    for delta in (2, -4):
+        instants.append(datetime.utcnow())
+        adjust_inventory(db, pid, delta)
+        instants.append(datetime.utcnow())
+        create_inventory_snapshot(db)
+        instants.append(datetime.utcnow())
+
+    def answers():
+        return [(get_stock_at(db, pid, at), get_stock_levels_at(db, at)) for at in instants]
+
+    before = answers()
+    # Conserva `oldest_kept` y las dos fotos posteriores
+    assert compact_inventory_ledger(db, keep_snapshots=3) > 0
+    assert answers() == before
+    assert [quantity for quantity, _ in before] == [11, 11, 13, 13, 13, 9, 9]
+    assert db.execute(
+        select(func.count()).select_from(InventoryMovement).where(InventoryMovement.created_at <= oldest_kept)
+    ).scalar() == 0
+    assert db.execute(select(func.min(InventorySnapshot.snapshot_at))).scalar() == oldest_kept
+
+
+def test_scheduler_compacts_after_each_snapshot(db, product):
+    scheduler = SnapshotScheduler(keep_snapshots=2)
+    for _ in range(3):
+        assert scheduler.flush() > 0
+
+    snapshots = db.execute(select(func.count(func.distinct(InventorySnapshot.snapshot_at)))).scalar()
+    assert snapshots == 2
@@ -0,0 +1,49 @@
+# tests/test_list_etags.py
+from app.crud.crud_inventory import adjust_inventory, get_inventory_fingerprint
+from app.db.session import SessionLocal
+
+
+def _etag(client, url, **params):
+    response = client.get(url, params=params)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def _revalidate(client, url, etag, **params):
+    return client.get(url, params=params, headers={"If-None-Match": etag}).status_code
+
+
+def test_product_list_etag_changes_within_the_same_second(client, product):
+    url = "/api/v1/products/"
+    etag = _etag(client, url, limit=1000)
+    assert _revalidate(client, url, etag, limit=1000) == 304
+
+    # Sin alta ni baja y en el mismo segundo: solo cambia la versión
+    body = {"name": product["name"], "sku": product["sku"], "price": 99.0}
+    assert client.put(f"/api/v1/products/{product['id']}", json=body).status_code == 200
+    assert _revalidate(client, url, etag, limit=1000) == 200
+
+
+def test_inventory_list_etag_changes_within_the_same_second(client, product):
+    url = "/api/v1/inventory/"
+    client.patch(f"/api/v1/inventory/{product['id']}", json={"quantity": 1})
+    etag = _etag(client, url, limit=1000)
+    assert _revalidate(client, url, etag, limit=1000) == 304
+
+    assert client.patch(f"/api/v1/inventory/{product['id']}", json={"quantity": 1}).status_code == 200
+    assert _revalidate(client, url, etag, limit=1000) == 200
+
+
+def test_every_inventory_write_bumps_the_version(product):
+    db = SessionLocal()
+    try:
+        before, _ = get_inventory_fingerprint(db)
+        # Core UPDATE (sin ORM): la versión sube por el onupdate de la columna
+        adjust_inventory(db, product["id"], 1)
+        after_update, _ = get_inventory_fingerprint(db)
+        adjust_inventory(db, product["id"], 0)
+        after_noop, _ = get_inventory_fingerprint(db)
+    finally:
+        db.close()
+    assert after_update[1] == before[1] + 1
+    assert after_noop[1] == after_update[1] + 1
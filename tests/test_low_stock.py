@@ -0,0 +1,90 @@
+# tests/test_low_stock.py
+import pytest
+
+from app.core.config import settings
+from app.crud.crud_inventory import delete_inventory
+from app.crud.low_stock import low_stock_index
+
+
+def _low_stock(client):
+    """product_id -> (quantity, threshold) según /inventory/low-stock"""
+    response = client.get("/api/v1/inventory/low-stock")
+    assert response.status_code == 200
+    return {item["product_id"]: (item["quantity"], item["threshold"]) for item in response.json()}
+
+
+@pytest.fixture
+def stocked(client, product):
+    """Producto con 10 unidades, umbral 5 y el índice ya cargado en memoria"""
+    response = client.put(f"/api/v1/inventory/{product['id']}/threshold", json={"low_stock_threshold": 5})
+    assert response.status_code == 200
+    assert product["id"] not in _low_stock(client)
+    assert low_stock_index._loaded_at is not None
+    return product["id"]
+
+
+def test_null_threshold_uses_the_default(client, product):
+    default = settings.low_stock_default_threshold
+    assert client.post("/api/v1/inventory/", json={"product_id": product["id"], "quantity": default}).json()["low_stock_threshold"] is None
+    assert _low_stock(client)[product["id"]] == (default, default)
+
+    client.post("/api/v1/inventory/", json={"product_id": product["id"], "quantity": default + 1})
+    assert product["id"] not in _low_stock(client)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/inventory/{id}", "/api/v1/inventory/{id}/adjust"])
+def test_adjust_moves_product_in_and_out(client, stocked, path):
+    method = client.patch if path.endswith("{id}") else client.post
+    url = path.format(id=stocked)
+    assert method(url, json={"quantity": -6}).status_code == 200
+    assert _low_stock(client)[stocked] == (4, 5)
+
+    assert method(url, json={"quantity": 2}).status_code == 200
+    assert stocked not in _low_stock(client)
+
+
+def test_batch_adjust_moves_product_in_and_out(client, stocked):
+    url = "/api/v1/inventory/adjust/batch"
+    assert client.post(url, json={"items": [{"product_id": stocked, "quantity": -5}]}).status_code == 200
+    assert _low_stock(client)[stocked] == (5, 5)
+
+    assert client.post(url, json={"items": [{"product_id": stocked, "quantity": 1}]}).status_code == 200
+    assert stocked not in _low_stock(client)
+
+
+def test_upserts_move_product_in_and_out(client, stocked):
+    assert client.post("/api/v1/inventory/bulk", json={"items": [{"product_id": stocked, "quantity": 3}]}).status_code == 200
+    assert _low_stock(client)[stocked] == (3, 5)
+
+    assert client.post("/api/v1/inventory/", json={"product_id": stocked, "quantity": 8}).status_code == 200
+    assert stocked not in _low_stock(client)
+
+    assert client.post("/api/v1/inventory/", json={"product_id": stocked, "quantity": 0}).status_code == 200
+    assert _low_stock(client)[stocked] == (0, 5)
+
+
+def test_threshold_change_moves_product_in_and_out(client, stocked):
+    url = f"/api/v1/inventory/{stocked}/threshold"
+    assert client.put(url, json={"low_stock_threshold": 10}).status_code == 200
+    assert _low_stock(client)[stocked] == (10, 10)
+
+    assert client.put(url, json={"low_stock_threshold": 9}).status_code == 200
+    assert stocked not in _low_stock(client)
+
+    # null vuelve al umbral por defecto
+    assert client.put(url, json={"low_stock_threshold": None}).status_code == 200
+    default = settings.low_stock_default_threshold
+    assert (stocked in _low_stock(client)) == (10 <= default)
+
+
+def test_delete_removes_product(client, db, stocked):
+    client.post("/api/v1/inventory/", json={"product_id": stocked, "quantity": 1})
+    assert stocked in _low_stock(client)
+
+    assert delete_inventory(db, stocked)
+    assert stocked not in _low_stock(client)
+
+
+def test_unknown_product_threshold_is_404(client):
+    response = client.put("/api/v1/inventory/999999999/threshold", json={"low_stock_threshold": 1})
+    assert response.status_code == 404
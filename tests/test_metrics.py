@@ -0,0 +1,94 @@
+# tests/test_metrics.py
+import re
+
+import pytest
+
+from app.core.metrics import Histogram
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+def _parse(text):
+    """
+    Formato de texto de Prometheus a {nombre: {etiquetas: valor}} y {nombre: tipo}.
+    Falla si alguna línea no cumple el formato.
+    """
+    assert text.endswith("\n")
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+            continue
+        match = _SAMPLE.match(line)
+        assert match, f"línea inválida: {line!r}"
+        name, raw_labels, value = match.groups()
+        labels = _LABEL.findall(raw_labels or "")
+        assert "".join(f'{k}="{v}",' for k, v in labels).rstrip(",") == (raw_labels or "")
+        samples.setdefault(name, {})[frozenset(labels)] = float(value)
+    return samples, types
+
+
+def _scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return _parse(response.text)
+
+
+def _labels(**labels):
+    return frozenset(labels.items())
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(2.65)
+
+
+def test_routes_are_labelled_by_template(client, product):
+    route = "/api/v1/products/{product_id}"
+    before, _ = _scrape(client)
+    responses = before.get("http_responses_total", {})
+    ok = _labels(method="GET", route=route, status="200")
+
+    assert client.get(f"/api/v1/products/{product['id']}").status_code == 200
+    assert client.get("/api/v1/products/999999999").status_code == 404
+    samples, types = _scrape(client)
+
+    assert types["http_request_duration_seconds"] == "histogram"
+    assert types["http_responses_total"] == "counter"
+    assert types["http_requests_in_flight"] == "gauge"
+    counter = samples["http_responses_total"]
+    assert counter[ok] == responses.get(ok, 0) + 1
+    missing = _labels(method="GET", route=route, status="404")
+    assert counter[missing] == responses.get(missing, 0) + 1
+    # Ninguna serie por URL concreta
+    assert not any(dict(labels)["route"] == f"/api/v1/products/{product['id']}" for labels in counter)
+
+    series = _labels(method="GET", route=route)
+    buckets = {dict(labels)["le"]: value for labels, value in samples["http_request_duration_seconds_bucket"].items()
+               if labels - {("le", dict(labels)["le"])} == series}
+    assert list(buckets.values()) == sorted(buckets.values())
+    assert buckets["+Inf"] == samples["http_request_duration_seconds_count"][series]
+    assert samples["http_request_duration_seconds_sum"][series] > 0
+
+
+def test_unmatched_paths_share_one_series(client):
+    before, _ = _scrape(client)
+    unmatched = _labels(method="GET", route="unmatched", status="404")
+    count = before.get("http_responses_total", {}).get(unmatched, 0)
+
+    for path in ("/no-existe", "/otra/ruta/123"):
+        assert client.get(path).status_code == 404
+    samples, _ = _scrape(client)
+
+    counter = samples["http_responses_total"]
+    assert counter[unmatched] == count + 2
+    assert not any(dict(labels)["route"] in ("/no-existe", "/otra/ruta/123") for labels in counter)
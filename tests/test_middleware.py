@@ -0,0 +1,40 @@
+# tests/test_middleware.py
+import re
+
+PREFLIGHT = {
+    "Origin": "http://localhost:5173",
+    "Access-Control-Request-Method": "POST",
+    "Access-Control-Request-Headers": "Authorization, Content-Type",
+}
+
+
+def test_preflight_from_allowed_origin(client):
+    response = client.options("/api/v1/products/", headers=PREFLIGHT)
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    # RequestContextMiddleware envuelve también las respuestas a preflight
+    assert response.headers["x-request-id"]
+
+
+def test_preflight_from_unknown_origin_is_rejected(client):
+    response = client.options("/api/v1/products/", headers={**PREFLIGHT, "Origin": "https://otro.example.com"})
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_client_request_id_is_echoed(client):
+    response = client.get("/", headers={"X-Request-ID": "peticion-123"})
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "peticion-123"
+    assert re.fullmatch(r"app;dur=\d+\.\d{2}", response.headers["server-timing"])
+
+
+def test_request_id_is_generated_when_absent_or_invalid(client):
+    generated = {client.get("/").headers["x-request-id"] for _ in range(2)}
+    assert len(generated) == 2
+    assert all(re.fullmatch(r"[0-9a-f]{32}", request_id) for request_id in generated)
+
+    too_long = client.get("/", headers={"X-Request-ID": "x" * 129}).headers["x-request-id"]
+    assert re.fullmatch(r"[0-9a-f]{32}", too_long)
@@ -0,0 +1,69 @@
+# tests/test_migrations.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+# Todos los modelos en Base.metadata, como en alembic/env.py
+from app.models import inventory, inventory_movement, product, refresh_token, user  # noqa: F401
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _alembic(url, *args):
+    # env.py lee DATABASE_URL al importar la configuración: proceso aparte
+    env = dict(os.environ, DATABASE_URL=url)
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def _skip_fulltext(obj, name, type_, reflected, compare_to):
+    # Solo existe en MySQL, igual que en alembic/env.py
+    return not (type_ == "index" and name == "ix_products_fulltext")
+
+
+@pytest.fixture
+def baseline_db(tmp_path):
+    """BD con el esquema anterior a Alembic (revisión 0001) y filas de inventario duplicadas"""
+    url = f"sqlite:///{tmp_path / 'baseline.db'}"
+    _alembic(url, "upgrade", "0001")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO products (id, name, sku, price) VALUES (1, 'A', 'A-1', 1), (2, 'B', 'B-1', 2)"))
+        conn.execute(text("INSERT INTO inventory (id, product_id, quantity) VALUES (1, 1, 5), (2, 1, 9), (3, 2, 7), (4, 1, 3)"))
+    yield url, engine
+    engine.dispose()
+
+
+def test_upgrade_from_baseline_matches_the_models(baseline_db):
+    url, engine = baseline_db
+    _alembic(url, "upgrade", "head")
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_object": _skip_fulltext})
+        assert compare_metadata(context, Base.metadata) == []
+        # Se conserva la fila que leía la app (id menor) y el resto de datos
+        rows = conn.execute(text("SELECT id, product_id, quantity, version FROM inventory ORDER BY id")).all()
+        products = conn.execute(text("SELECT sku, version, updated_at IS NOT NULL FROM products ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(1, 1, 5, 1), (3, 2, 7, 1)]
+    assert [tuple(row) for row in products] == [("A-1", 1, 1), ("B-1", 1, 1)]
+
+
+def test_downgrade_to_baseline(baseline_db):
+    url, engine = baseline_db
+    _alembic(url, "upgrade", "head")
+    _alembic(url, "downgrade", "0001")
+
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(products)"))]
+        tables = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+    assert columns == ["id", "name", "description", "sku", "price"]
+    assert tables == {"alembic_version", "users", "products", "inventory"}
@@ -0,0 +1,48 @@
+# tests/test_pagination.py
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+LISTS = ["/api/v1/products/", "/api/v1/inventory/", "/api/v1/users/"]
+
+
+@pytest.mark.parametrize("path", LISTS)
+@pytest.mark.parametrize("limit", [0, -1, 1001])
+def test_limit_out_of_range_is_rejected(client, path, limit):
+    assert client.get(path, params={"cursor": "", "limit": limit}).status_code == 422
+    assert client.get(path, params={"limit": limit}).status_code == 422
+
+
+@pytest.mark.parametrize("path", LISTS)
+def test_negative_skip_is_rejected(client, path):
+    assert client.get(path, params={"skip": -1}).status_code == 422
+
+
+@pytest.mark.parametrize("values", [[None], [1.5], [True], [[1]], [{"id": 1}]])
+def test_decode_cursor_rejects_non_scalar_keys(values):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(values), 1)
+
+
+def test_decode_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["Mesa", 7]), 2) == ["Mesa", 7]
+
+
+@pytest.mark.parametrize("path,values", [
+    ("/api/v1/products/", [None, None]),
+    ("/api/v1/inventory/", [{"id": 1}]),
+    ("/api/v1/users/", [[1]]),
+    ("/api/v1/stock/", [1.5]),
+])
+def test_malformed_cursor_returns_400(client, path, values):
+    assert client.get(path, params={"cursor": encode_cursor(values)}).status_code == 400
+
+
+def test_cursor_walk_visits_every_product_once(client, product):
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/api/v1/products/", params={"cursor": cursor, "limit": 3}).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+    assert product["id"] in seen
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,62 @@
+# tests/test_password_hasher.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import PasswordHasher, PasswordHasherBusy, password_hasher
+
+
+def test_run_rejects_beyond_capacity():
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "hecho"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(hasher.run, slow)
+        assert started.wait(5)
+        assert hasher.pending() == 1
+        with pytest.raises(PasswordHasherBusy):
+            hasher.run(str, "otro")
+        release.set()
+        assert first.result(5) == "hecho"
+
+    assert hasher.rejected == 1
+    assert hasher.pending() == 0
+    assert hasher.run(str, 1) == "1"
+
+
+@pytest.fixture
+def email(client, unique):
+    """Usuario registrado: el login solo llega a bcrypt si el email existe"""
+    email = f"{unique('user')}@example.com"
+    assert client.post("/api/v1/auth/register", json={"email": email, "password": "secreto123"}).status_code == 200
+    return email
+
+
+@pytest.fixture
+def saturated():
+    """Ocupar todos los huecos del pool global, como una avalancha de logins"""
+    taken = 0
+    while password_hasher._slots.acquire(blocking=False):
+        taken += 1
+    assert taken == password_hasher.capacity
+    yield
+    for _ in range(taken):
+        password_hasher._slots.release()
+
+
+def test_login_is_503_with_retry_after_when_saturated(client, email, saturated):
+    rejected = password_hasher.rejected
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "secreto123"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(settings.password_hash_retry_after_seconds)
+    assert password_hasher.rejected == rejected + 1
+    metrics = client.get("/metrics").text
+    assert f"password_hash_rejected_total {rejected + 1}" in metrics
@@ -0,0 +1,81 @@
+# tests/test_product_async.py
+import asyncio
+import threading
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import crud_product, crud_product_async
+from app.db.session import DATABASE_URL, async_database_url
+from app.schemas.product import ProductCreate
+
+
+class RecordingChannel:
+    """Canal de invalidación que anota desde qué hilo se lee"""
+
+    def __init__(self):
+        self.poll_threads = []
+
+    def poll(self, namespace):
+        self.poll_threads.append(threading.get_ident())
+        return []
+
+    def publish(self, namespace, keys):
+        pass
+
+
+def _run_async(work):
+    """Ejecutar work(session) en un event loop propio; devuelve (resultado, hilo del loop)"""
+    async def main():
+        engine = create_async_engine(async_database_url(DATABASE_URL))
+        try:
+            async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+                return await work(session), threading.get_ident()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_async_reads_poll_the_invalidation_channel_off_the_event_loop(monkeypatch, product):
+    channel = RecordingChannel()
+    monkeypatch.setattr(crud_product.product_cache, "channel", channel)
+
+    async def read(session):
+        for _ in range(2):
+            # Fuerza un sondeo por lectura
+            crud_product.product_cache._last_poll = 0.0
+            await crud_product_async.get_product(session, product["id"])
+        crud_product.product_cache._last_poll = 0.0
+        items, _ = await crud_product_async.get_products_by_ids(session, [product["id"]])
+        return items
+
+    items, loop_thread = _run_async(read)
+
+    assert [item.id for item in items] == [product["id"]]
+    assert len(channel.poll_threads) == 3
+    assert loop_thread not in channel.poll_threads
+
+
+def test_async_create_runs_side_effects_off_the_event_loop(monkeypatch, db, unique):
+    sku = unique("SKU")
+    # Cachear el SKU como "no existe" antes del alta
+    assert crud_product.get_product_by_sku(db, sku) is None
+
+    calls = []
+    product_written = crud_product.product_written
+
+    def recording_product_written(product, *old_skus):
+        calls.append(threading.get_ident())
+        product_written(product, *old_skus)
+
+    monkeypatch.setattr(crud_product, "product_written", recording_product_written)
+
+    async def create(session):
+        return await crud_product_async.create_product(session, ProductCreate(name="Alta async", sku=sku, price=1))
+
+    product, loop_thread = _run_async(create)
+
+    assert len(calls) == 1
+    assert calls[0] != loop_thread
+    assert crud_product.get_product_by_sku(db, sku).id == product.id
+    assert sku in [p.sku for p in crud_product.search_products(db, sku)[0]]
@@ -0,0 +1,110 @@
+# tests/test_product_cache.py
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import MISSING, LRUTTLCache
+from app.core.config import settings
+from app.crud.crud_product import _id_key, _sku_key, get_product, get_product_by_sku, product_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj monotónico controlado por la prueba"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hits_misses_and_negative_entries():
+    cache = LRUTTLCache("t", maxsize=10)
+    assert cache.get("a") is MISSING
+    cache.set("a", {"id": 1})
+    cache.set("b", None)
+
+    assert cache.get("a") == {"id": 1}
+    # None es "no existe" cacheado, distinto de MISSING
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = LRUTTLCache("t", maxsize=10, ttl_seconds=30)
+    cache.set("a", 1)
+    clock[0] += 29
+    assert cache.get("a") == 1
+    clock[0] += 2
+    assert cache.get("a") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUTTLCache("t", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUTTLCache("t", maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
+
+
+def test_create_replaces_a_cached_miss(client, db, unique):
+    sku = unique("SKU")
+    assert get_product_by_sku(db, sku) is None
+    assert product_cache.get(_sku_key(sku)) is None
+
+    created = client.post("/api/v1/products/", json={"name": "Nuevo", "sku": sku, "price": 1}).json()
+    assert get_product_by_sku(db, sku).id == created["id"]
+
+
+def test_update_invalidates_old_and_new_sku(client, db, product, unique):
+    old_sku, new_sku = product["sku"], unique("SKU")
+    assert get_product_by_sku(db, old_sku).id == product["id"]
+    assert get_product_by_sku(db, new_sku) is None
+    assert get_product(db, product["id"]).name == product["name"]
+
+    body = {"name": "Renombrado", "sku": new_sku, "price": 2}
+    assert client.put(f"/api/v1/products/{product['id']}", json=body).status_code == 200
+
+    assert get_product_by_sku(db, old_sku) is None
+    assert get_product_by_sku(db, new_sku).id == product["id"]
+    assert get_product(db, product["id"]).name == "Renombrado"
+
+
+def test_delete_invalidates_id_and_sku(client, db, unique):
+    created = client.post("/api/v1/products/", json={"name": "Borrable", "sku": unique("SKU"), "price": 1}).json()
+    assert get_product(db, created["id"]) is not None
+    assert get_product_by_sku(db, created["sku"]) is not None
+
+    assert client.delete(f"/api/v1/products/{created['id']}").status_code == 200
+    assert product_cache.get(_id_key(created["id"])) is MISSING
+    assert get_product(db, created["id"]) is None
+    assert get_product_by_sku(db, created["sku"]) is None
+
+
+def test_invalidation_reaches_another_process_after_the_poll_interval(tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(settings, "cache_invalidation_db", str(tmp_path / "invalidations.db"))
+    # Cada caché con su propio canal, como dos workers sobre el mismo fichero
+    worker_a = LRUTTLCache("products", channel=cache_module._build_invalidation_channel(), poll_seconds=5)
+    worker_b = LRUTTLCache("products", channel=cache_module._build_invalidation_channel(), poll_seconds=5)
+    for worker in (worker_a, worker_b):
+        worker.set("sku:A", {"id": 1})
+        # La primera consulta fija el punto de partida del canal
+        assert worker.get("sku:A") == {"id": 1}
+
+    worker_a.invalidate("sku:A")
+    assert worker_a.get("sku:A") is MISSING
+    # Dentro del intervalo B aún no ha leído el canal
+    assert worker_b.get("sku:A") == {"id": 1}
+
+    clock[0] += 6
+    assert worker_b.get("sku:A") is MISSING
+    assert worker_b.stats()["invalidations"] == 1
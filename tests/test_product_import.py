@@ -0,0 +1,79 @@
+# tests/test_product_import.py
+import json
+
+from sqlalchemy import event, insert
+
+from app.crud.crud_product import get_product_by_sku, import_products
+from app.db.session import SessionLocal, engine
+from app.models.product import Product
+
+
+def _import_csv(client, text):
+    response = client.post("/api/v1/import/products", files={"file": ("productos.csv", text.encode(), "text/csv")})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _import_ndjson(client, rows):
+    body = "\n".join(json.dumps(row) for row in rows).encode()
+    response = client.post("/api/v1/import/products", files={"file": ("productos.ndjson", body, "application/x-ndjson")})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_ndjson_numeric_sku_is_reported_as_text(client, unique):
+    report = _import_ndjson(client, [{"name": "Numérico", "sku": 12345, "price": 1}])
+    assert report["created"] == 0
+    assert report["errors"][0]["sku"] == "12345"
+
+
+def test_csv_extra_columns_are_ignored(client, unique):
+    sku_a, sku_b = unique("SKU"), unique("SKU")
+    text = (
+        "name,sku,price,color\n"
+        f"Con columna extra,{sku_a},2.5,rojo\n"
+        # Más celdas que columnas: csv.DictReader las deja bajo la clave None
+        f"Con celdas sobrantes,{sku_b},3,azul,sobra,otra\n"
+    )
+    report = _import_csv(client, text)
+    assert report["errors"] == []
+    assert report["created"] == 2
+
+
+def test_import_creates_stock_and_is_visible_through_the_cache(client, db, unique):
+    sku = unique("SKU")
+    # Cachear el SKU como "no existe" antes de importarlo
+    assert get_product_by_sku(db, sku) is None
+    report = _import_csv(client, f"name,sku,price,quantity\nImportado,{sku},4,7\n")
+    assert report["created"] == 1
+
+    product = get_product_by_sku(db, sku)
+    assert product is not None
+    assert client.get(f"/api/v1/inventory/{product.id}").json()["quantity"] == 7
+    found = client.get("/api/v1/products/search", params={"q": sku}).json()
+    assert [item["sku"] for item in found["items"]] == [sku]
+
+
+def test_concurrent_insert_of_same_sku_is_reported(unique):
+    taken, free = unique("SKU"), unique("SKU")
+    fired = []
+
+    def insert_same_sku_first(conn, cursor, statement, parameters, context, executemany):
+        # Otra escritura crea el SKU entre la comprobación y el INSERT del bloque
+        if statement.startswith("INSERT INTO products") and not fired:
+            fired.append(True)
+            with engine.begin() as other:
+                other.execute(insert(Product.__table__).values(name="Otro proceso", sku=taken, price=1))
+
+    rows = [(2, {"name": "A", "sku": taken, "price": 1}), (3, {"name": "B", "sku": free, "price": 1})]
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", insert_same_sku_first)
+    try:
+        report = import_products(db, rows)
+    finally:
+        event.remove(engine, "before_cursor_execute", insert_same_sku_first)
+        db.close()
+
+    assert fired
+    assert report["created"] == 1
+    assert report["errors"] == [{"row": 2, "sku": taken, "error": "Producto con ese SKU ya existe"}]
@@ -0,0 +1,37 @@
+# tests/test_product_search.py
+from app.crud.product_search import ProductSearchIndex
+
+
+def _create(client, name, sku, description=None):
+    response = client.post("/api/v1/products/", json={"name": name, "sku": sku, "price": 1, "description": description})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_last_term_without_vocabulary_match_returns_nothing(client, db, unique):
+    word = unique("rojo").replace("-", "")
+    product_id = _create(client, f"{word} silla", unique("SKU"))
+    index = ProductSearchIndex()
+
+    assert product_id in index.search(db, f"{word} sil")
+    assert index.search(db, f"{word} zzzzqqq") == []
+    assert index.search(db, "zzzzqqq") == []
+
+
+def test_terms_match_across_name_and_description(client, db, unique):
+    word = unique("mesa").replace("-", "")
+    product_id = _create(client, f"{word} roble", unique("SKU"), description="acabado mate")
+    index = ProductSearchIndex()
+
+    assert index.search(db, f"{word} mat") == [product_id]
+    assert index.search(db, f"{word} brillo") == []
+
+
+def test_search_endpoint_ignores_unmatched_prefix(client, unique):
+    word = unique("lampara").replace("-", "")
+    _create(client, f"{word} pie", unique("SKU"))
+
+    found = client.get("/api/v1/products/search", params={"q": f"{word} pi"}).json()
+    missing = client.get("/api/v1/products/search", params={"q": f"{word} xyzzyq"}).json()
+    assert found["total"] == 1
+    assert missing["total"] == 0
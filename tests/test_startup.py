@@ -0,0 +1,59 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Proceso hijo: intérprete limpio, sin la app ya importada por conftest
+_CHILD = textwrap.dedent("""
+    import json
+    import logging
+
+    from sqlalchemy import event
+    from sqlalchemy.pool import Pool
+
+    connects = []
+    event.listen(Pool, "connect", lambda *args: connects.append(1))
+    warnings = []
+    handler = logging.Handler()
+    handler.emit = lambda record: warnings.append(record.getMessage())
+    logging.getLogger("app.db.session").addHandler(handler)
+
+    from app.main import app
+    connects_on_import = len(connects)
+
+    import os
+    from fastapi.testclient import TestClient
+    from app.db.base import Base
+    from app.db.session import DATABASE_URL, engine
+
+    with TestClient(app) as client:
+        warmup_warnings = list(warnings)
+        # La BD aparece después del arranque
+        os.makedirs(os.path.dirname(DATABASE_URL[len("sqlite:///"):]))
+        Base.metadata.create_all(bind=engine)
+        status = client.get("/api/v1/products/", params={"limit": 1}).status_code
+
+    print(json.dumps({
+        "connects_on_import": connects_on_import,
+        "warmup_warnings": warmup_warnings,
+        "status": status,
+    }))
+""")
+
+
+def test_startup_survives_an_unreachable_database(tmp_path):
+    # El directorio no existe todavía: SQLite no puede abrir el fichero
+    url = f"sqlite:///{tmp_path / 'todavia-no' / 'app.db'}"
+    env = dict(os.environ, DATABASE_URL=url, PYTHONWARNINGS="ignore")
+    result = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["connects_on_import"] == 0
+    assert report["warmup_warnings"] == ["No se pudo calentar el pool de conexiones"]
+    assert report["status"] == 200
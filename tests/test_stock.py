@@ -0,0 +1,35 @@
+# tests/test_stock.py
+import pytest
+
+
+@pytest.fixture
+def catalog(client, unique):
+    """Al menos 15 productos, la mitad con inventario"""
+    for i in range(15):
+        created = client.post("/api/v1/products/", json={"name": unique("Stock"), "sku": unique("SKU"), "price": 1}).json()
+        if i % 2:
+            assert client.post("/api/v1/inventory/", json={"product_id": created["id"], "quantity": i}).status_code == 200
+
+
+def _stock_queries(client, count_queries, **params):
+    with count_queries() as queries:
+        response = client.get("/api/v1/stock/", params=params)
+    assert response.status_code == 200
+    return queries.count, response.json()
+
+
+def test_query_count_does_not_grow_with_page_size(client, catalog, count_queries):
+    small_count, small = _stock_queries(client, count_queries, limit=10)
+    large_count, large = _stock_queries(client, count_queries, limit=500)
+
+    assert len(small["items"]) == 10
+    assert len(large["items"]) > 10
+    assert small_count == large_count == 1
+
+
+def test_next_page_is_a_single_query(client, catalog, count_queries):
+    _, first = _stock_queries(client, count_queries, limit=10)
+    count, second = _stock_queries(client, count_queries, limit=10, cursor=first["next_cursor"])
+
+    assert count == 1
+    assert second["items"][0]["id"] > first["items"][-1]["id"]
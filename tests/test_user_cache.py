@@ -0,0 +1,55 @@
+# tests/test_user_cache.py
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.deps import get_current_superuser
+from app.core.cache import MISSING
+from app.crud.crud_user import _user_key, delete_user, deactivate_user, demote_from_superuser, promote_to_superuser, user_cache
+
+PASSWORD = "secreto123"
+
+# Ninguna ruta de la app exige superusuario todavía: una mínima para la prueba
+admin_app = FastAPI()
+
+
+@admin_app.get("/admin")
+def admin_only(user=Depends(get_current_superuser)):
+    return {"id": user.id}
+
+
+@pytest.fixture
+def user(client, unique):
+    """Usuario nuevo con su access token y ya cacheado por una petición"""
+    email = f"{unique('user')}@example.com"
+    assert client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD}).status_code == 200
+    token = client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me = client.get("/api/v1/auth/me", headers=headers)
+    assert me.status_code == 200
+    user_id = me.json()["id"]
+    assert user_cache.get(_user_key(user_id)) is not MISSING
+    return user_id, headers
+
+
+@pytest.mark.parametrize("disable", [deactivate_user, delete_user])
+def test_disabled_user_is_rejected_on_the_next_request(client, db, user, disable):
+    user_id, headers = user
+    assert disable(db, user_id) is not None
+
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Usuario inactivo"
+
+
+def test_demoted_user_loses_admin_on_the_next_request(db, user):
+    user_id, headers = user
+    admin = TestClient(admin_app)
+    assert admin.get("/admin", headers=headers).status_code == 403
+
+    promote_to_superuser(db, user_id)
+    assert admin.get("/admin", headers=headers).status_code == 200
+    assert user_cache.get(_user_key(user_id))["is_superuser"] is True
+
+    demote_from_superuser(db, user_id)
+    assert admin.get("/admin", headers=headers).status_code == 403